@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+"""
+Render time and output size of ReportGeneratorTool reports.
+
+Builds synthetic reports with growing forecast and incident lists and
+renders each one with the CDN and inline Plotly modes, streaming to a
+temporary file as the tool does. Cold renders bypass the section cache;
+"refresh" renders the same report with only the weather section changed,
+as a storm-time regeneration would.
+
+Usage:
+    python benchmarks/report_render.py [--sizes 8,40,200,1000] [--runs 5]
+"""
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from ai_driven_snow_removal_optimization_for_municipalities_and_contractors.tools.report_renderer import (
+    ReportRenderer,
+    SectionCache,
+    plotly_inline_script,
+    template_environment,
+)
+
+
+def make_report(entries: int, seed: int = 7) -> dict:
+    """Report content with `entries` forecast rows, incidents and route segments."""
+    rng = random.Random(seed)
+    start = datetime(2025, 2, 4)
+    forecast = [
+        {
+            "time": (start + timedelta(hours=3 * i)).strftime('%Y-%m-%d %H:%M'),
+            "expected_snow": f"{rng.uniform(0, 6):.2f} mm",
+            "snow_risk": rng.choice(["High", "Medium", "Low"]),
+            "road_condition": rng.choice(["Snowy", "Icy", "Clear"])
+        }
+        for i in range(entries)
+    ]
+    incidents = [
+        {
+            "type": rng.choice(["Jam", "Accident", "RoadWorks"]),
+            "description": f"Incident {i}",
+            "location": {"latitude": 45.5 + rng.uniform(-0.1, 0.1), "longitude": -73.57 + rng.uniform(-0.1, 0.1)},
+            "start_time": start.isoformat(),
+            "end_time": (start + timedelta(hours=2)).isoformat()
+        }
+        for i in range(entries)
+    ]
+    segments = [
+        {
+            "start": (start + timedelta(minutes=5 * i)).isoformat(),
+            "end": (start + timedelta(minutes=5 * i + 5)).isoformat(),
+            "start_point": {"latitude": 45.5, "longitude": -73.57},
+            "end_point": {"latitude": 45.51, "longitude": -73.58}
+        }
+        for i in range(entries)
+    ]
+    return {
+        "title": "Snow Removal Operations Report",
+        "sections": [
+            {"header": "Weather Dashboard", "content": {
+                "current_conditions": {"temperature": -4.2, "conditions": "Snowy",
+                                       "wind_speed": 5.1, "road_surface_temp": -7.0},
+                "forecast": forecast
+            }},
+            {"header": "Route Optimization", "content": {
+                "traffic_data": {"current_conditions": "Heavy", "traffic_speed": "32 km/h",
+                                 "traffic_incidents": incidents},
+                "optimized_route": {"length": "48 km", "travel_time": "2 h 10 min", "segments": segments}
+            }},
+            {"header": "Resource Inventory", "content": {
+                "inventory_levels": {"Salt": "420 tons", "Diesel": "18000 liters"},
+                "recent_usage": {"Salt": "60 tons/day"},
+                "projected_needs": {"Salt": "300 tons"},
+                "low_inventory_alerts": {"Salt": {"Threshold": "500 tons", "Current Level": "420 tons",
+                                                  "Alert": "Below threshold"}}
+            }},
+            {"header": "Operational Recommendations", "content": {
+                "priority_based_schedules": "Arterials first, then residential streets.",
+                "completion_estimates": "6 hours"
+            }}
+        ]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', default='8,40,200,1000', help="Forecast/incident list lengths")
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    # One-time costs, paid once per process rather than per report
+    started = time.perf_counter()
+    template_environment()
+    compile_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    plotly_inline_script()
+    bundle_ms = (time.perf_counter() - started) * 1000
+    print(f"Template compile: {compile_ms:.1f} ms, Plotly bundle load: {bundle_ms:.1f} ms (once per process)")
+    print(f"{'entries':>8} {'mode':>7} {'cold ms':>10} {'refresh ms':>11} {'size KB':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        target = Path(tmp) / 'report.html'
+        for size in [int(s) for s in args.sizes.split(',')]:
+            content = make_report(size)
+            for mode in ('cdn', 'inline'):
+                cold = time_renders(ReportRenderer(mode, cache=None), [content] * args.runs, target)
+                size_kb = target.stat().st_size / 1024
+                # Prime the cache, then change only the current conditions on each refresh
+                cached = ReportRenderer(mode, cache=SectionCache())
+                cached.render_to(content, target)
+                refresh = time_renders(cached, [with_temperature(content, -4.0 - i) for i in range(args.runs)], target)
+                print(f"{size:>8} {mode:>7} {cold:>10.1f} {refresh:>11.1f} {size_kb:>10.1f}")
+
+
+def with_temperature(content: dict, temperature: float) -> dict:
+    """Copy of `content` whose weather section reports a different temperature."""
+    sections = [dict(section) for section in content['sections']]
+    weather = dict(sections[0]['content'])
+    weather['current_conditions'] = dict(weather['current_conditions'], temperature=temperature)
+    sections[0]['content'] = weather
+    return dict(content, sections=sections)
+
+
+def time_renders(renderer: ReportRenderer, reports: list, target: Path) -> float:
+    """Median milliseconds to stream each report to `target`."""
+    timings = []
+    for content in reports:
+        started = time.perf_counter()
+        renderer.render_to(content, target)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,372 @@
+#!/usr/bin/env python
+"""
+Benchmark suite for the tools and the end-to-end pipeline.
+
+Cases:
+    inventory  LocalInventoryTool._run queries against inventories of 10k items per category
+    weather    Forecast analysis over large forecast sets, and WeatherDataTool._run on the stand-in
+    traffic    TomTomTrafficTool._run against the stand-in server, cold and warm flow cache
+    report     ReportGeneratorTool._run render time and report size for large inputs
+    crew       Crew construction and kickoff with every agent's LLM stubbed out
+
+Everything runs offline against the local stand-in APIs (tools/standin_api.py)
+with scratch databases and report directories in a temporary directory.
+Each run appends a record (time, git commit, Python version, per-case
+metrics) to a JSON history file and is compared with the previous record;
+timings more than --threshold slower are flagged as regressions.
+
+Usage:
+    python benchmarks/suite.py [--cases inventory,traffic] [--runs 5] [--history benchmarks/history.json]
+"""
+import argparse
+import atexit
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = BENCHMARK_DIR.parent
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+# Scratch state for every store the tools touch; set before the tools are imported
+SCRATCH = Path(tempfile.mkdtemp(prefix='olaf-bench-'))
+atexit.register(shutil.rmtree, SCRATCH, ignore_errors=True)
+os.environ.update({
+    'OLAF_INVENTORY_DB': str(SCRATCH / 'inventory.sqlite3'),
+    'OLAF_REPORTS_DIR': str(SCRATCH / 'reports'),
+    'OLAF_ARTIFACT_DIR': str(SCRATCH / 'artifacts'),
+    'OLAF_FLOW_DB': str(SCRATCH / 'flow_state.sqlite3'),
+    'OLAF_LLM_CACHE': '0',
+    # No first-run trace prompt or telemetry from crewai
+    'CREWAI_TESTING': 'true',
+    'CREWAI_DISABLE_TELEMETRY': 'true',
+    'OTEL_SDK_DISABLED': 'true',
+    # ...nor from embedchain and chromadb, which the crew's JSON search tool loads
+    'EC_TELEMETRY': 'false',
+    'ANONYMIZED_TELEMETRY': 'False',
+})
+for name in ('OLAF_WEATHER_CACHE_PATH', 'OLAF_MATRIX_CACHE_DIR', 'OLAF_HTTP_FIXTURES'):
+    os.environ.pop(name, None)
+
+from ai_driven_snow_removal_optimization_for_municipalities_and_contractors.tools.standin_api import (
+    StandInConfig,
+    StandInData,
+    StandInServer,
+)
+
+DEFAULT_HISTORY = BENCHMARK_DIR / 'history.json'
+CASES = ('inventory', 'weather', 'traffic', 'report', 'crew')
+INVENTORY_ROWS = 10_000
+DEPOTS = ('Main Depot', 'East Depot', 'West Depot', 'North Depot')
+FORECAST_SIZES = (40, 1_000, 10_000)
+REPORT_SIZES = (200, 1_000)
+
+
+def measure(fn: Callable[[], object], runs: int, before: Optional[Callable[[], None]] = None) -> Dict[str, float]:
+    """Median and minimum milliseconds of `runs` calls (`before` runs untimed ahead of each)."""
+    timings = []
+    for _ in range(runs):
+        if before:
+            before()
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return {"median_ms": round(statistics.median(timings), 2), "min_ms": round(min(timings), 2)}
+
+
+def checked(output: str) -> str:
+    """A tool's JSON output, raising if the tool reported an error instead of doing the work."""
+    payload = json.loads(output)
+    if isinstance(payload, dict) and (payload.get("error") or payload.get("status") == "error"):
+        raise RuntimeError(f"Benchmarked tool failed: {output[:500]}")
+    return output
+
+
+def flatten(prefix: str, timing: Dict[str, float]) -> Dict[str, float]:
+    return {f"{prefix}_{key}": value for key, value in timing.items()}
+
+
+def write_inventory(directory: Path, rows: int, seed: int = 11) -> None:
+    """salt_inv.json and fuel_inv.json with `rows` items each, shaped like the bundled files."""
+    rng = random.Random(seed)
+    kinds = {
+        'salt': ('salt_inventory', 'tons', 'ton', ('rock_salt', 'treated_salt', 'sand_mix')),
+        'fuel': ('fuel_inventory', 'liters', 'liter', ('diesel', 'gasoline')),
+    }
+    for category, (key, unit, price_unit, types) in kinds.items():
+        items = []
+        for i in range(rows):
+            capacity = rng.choice((300, 500, 1000)) * (40 if category == 'fuel' else 1)
+            items.append({
+                "id": f"{category.upper()}-{i:05d}",
+                # Type and depot vary independently, so every depot stocks every type
+                "type": types[(i // len(DEPOTS)) % len(types)],
+                f"current_quantity_{unit}": round(rng.uniform(0, capacity), 1),
+                f"max_capacity_{unit}": capacity,
+                "storage_location": DEPOTS[i % len(DEPOTS)],
+                "last_refill_date": "2025-01-25",
+                "last_updated": "2025-01-31T12:00:00",
+                "minimum_threshold": capacity * 0.2,
+                f"price_per_{price_unit}": round(rng.uniform(1, 150), 2),
+                "supplier": f"Supplier {i % 17}"
+            })
+        with open(directory / f"{category}_inv.json", 'w') as f:
+            json.dump({key: items, "metadata": {"currency": "CAD"}}, f)
+
+
+def bench_inventory(args) -> Dict[str, float]:
+    from ai_driven_snow_removal_optimization_for_municipalities_and_contractors.tools.inventory_store import InventoryStore
+    from ai_driven_snow_removal_optimization_for_municipalities_and_contractors.tools.local_inventory_tool import LocalInventoryTool
+
+    seed_dir = SCRATCH / 'inventory_seed'
+    seed_dir.mkdir(exist_ok=True)
+    write_inventory(seed_dir, INVENTORY_ROWS)
+    started = time.perf_counter()
+    InventoryStore(os.environ['OLAF_INVENTORY_DB'], seed_dir=seed_dir)
+    results = {"rows_per_category": INVENTORY_ROWS, "import_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+    tool = LocalInventoryTool()
+    started = time.perf_counter()
+    listing = checked(tool._run(search_query="", json_path="salt_inv.json"))
+    results["first_query_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    results["listing_kb"] = round(len(listing) / 1024, 1)
+    queries = {
+        "listing": dict(search_query="", json_path="salt_inv.json"),
+        "text": dict(search_query="rock salt main", json_path="salt_inv.json"),
+        "filtered": dict(search_query="diesel", json_path="fuel_inv.json", location="East Depot", item_type="diesel"),
+        "below_threshold": dict(search_query="", json_path="fuel_inv.json", below_threshold=True),
+    }
+    for name, kwargs in queries.items():
+        results.update(flatten(f"query_{name}", measure(lambda: checked(tool._run(**kwargs)), args.runs)))
+    return results
+
+
+def forecast_entries(count: int, seed: int = 3) -> List[dict]:
+    """OpenWeather-shaped forecast entries from the stand-in's weather model."""
+    data = StandInData(StandInConfig(seed=seed, start=datetime(2025, 2, 4, tzinfo=timezone.utc)))
+    start = datetime(2025, 2, 4)
+    entries = []
+    for step in range(count):
+        at = start + timedelta(hours=3 * step)
+        entries.append({
+            **data._conditions(46.8 + (step % 50) * 0.001, -71.2, step),
+            "sys": {"pod": "d" if 12 <= at.hour < 21 else "n"},
+            "dt_txt": at.strftime('%Y-%m-%d %H:%M:%S')
+        })
+    return entries
+
+
+def bench_weather(args) -> Dict[str, float]:
+    from ai_driven_snow_removal_optimization_for_municipalities_and_contractors.tools.weather_analysis import analyze_entries, columns_to_records
+    from ai_driven_snow_removal_optimization_for_municipalities_and_contractors.tools.weather_data_tool import CONDITION_FIELDS, WeatherDataTool, weather_cache
+
+    results = {}
+    for size in FORECAST_SIZES:
+        entries = forecast_entries(size)
+        results.update(flatten(
+            f"analyze_{size}",
+            measure(lambda: columns_to_records(analyze_entries(entries), CONDITION_FIELDS), args.runs)
+        ))
+
+    with StandInServer(StandInConfig(latency_ms=args.latency_ms)) as server:
+        tool = WeatherDataTool(api_key='benchmark', base_url=server.openweather_url)
+        results.update(flatten("tool_run", measure(
+            lambda: checked(tool._run("Montreal", forecast_days=5)), args.runs, before=weather_cache.clear
+        )))
+        results.update(flatten("tool_grid_run", measure(
+            lambda: checked(tool._run("Montreal", forecast_days=5, grid_resolution_km=6)), args.runs, before=weather_cache.clear
+        )))
+    return results
+
+
+def bench_traffic(args) -> Dict[str, float]:
+    from ai_driven_snow_removal_optimization_for_municipalities_and_contractors.tools.tomtom_traffic_tool import TomTomTrafficTool, flow_cache
+
+    config = StandInConfig(latency_ms=args.latency_ms, route_points_per_leg=500, incidents=200)
+    with StandInServer(config) as server:
+        tool = TomTomTrafficTool(api_key='benchmark', base_url=server.tomtom_url)
+        output = checked(tool._run("Montreal"))
+        results = {"latency_ms_per_request": args.latency_ms, "output_kb": round(len(output) / 1024, 1)}
+        server.reset_stats()
+        results.update(flatten("cold", measure(lambda: checked(tool._run("Montreal")), args.runs, before=flow_cache.clear)))
+        results["requests_per_cold_run"] = sum(server.stats()["requests"].values()) / args.runs
+        results.update(flatten("warm", measure(lambda: checked(tool._run("Montreal")), args.runs)))
+        server.config = StandInConfig(**{**config.__dict__, "error_rate": 0.2})
+        results.update(flatten("cold_20pct_errors", measure(
+            lambda: checked(tool._run("Montreal")), args.runs, before=flow_cache.clear
+        )))
+    return results
+
+
+def bench_report(args) -> Dict[str, float]:
+    from report_render import make_report, with_temperature
+    from ai_driven_snow_removal_optimization_for_municipalities_and_contractors.tools.report_generator_tool import ReportGeneratorTool
+    from ai_driven_snow_removal_optimization_for_municipalities_and_contractors.tools.report_renderer import section_cache
+
+    tool = ReportGeneratorTool()
+    results = {}
+    for size in REPORT_SIZES:
+        content = make_report(size)
+        counter = iter(range(10 ** 6))
+
+        def render(base: dict) -> str:
+            # A different temperature each call so the archive does not deduplicate the report
+            message = tool._run(json.dumps({"region": "Montreal", "content": with_temperature(base, -next(counter))}))
+            if "successfully" not in message:
+                raise RuntimeError(message)
+            return message.rsplit(': ', 1)[1]
+
+        results.update(flatten(f"render_{size}", measure(lambda: render(content), args.runs, before=section_cache.clear)))
+        results.update(flatten(f"refresh_{size}", measure(lambda: render(content), args.runs)))
+        results[f"size_{size}_kb"] = round(Path(render(content)).stat().st_size / 1024, 1)
+    return results
+
+
+def bench_crew(args) -> Dict[str, float]:
+    os.environ.setdefault('OPENAI_API_KEY', 'benchmark-stub')
+    from crewai import LLM
+
+    class StubLLM(LLM):
+        """Answers every prompt at once, so only the framework's own overhead is timed."""
+
+        def __init__(self):
+            super().__init__(model="benchmark-stub")
+
+        def call(self, messages, tools=None, callbacks=None, available_functions=None):
+            return "Thought: I now know the final answer\nFinal Answer: benchmark stub output"
+
+        def supports_function_calling(self) -> bool:
+            return False
+
+    started = time.perf_counter()
+    from ai_driven_snow_removal_optimization_for_municipalities_and_contractors.crew import (
+        AiDrivenSnowRemovalOptimizationForMunicipalitiesAndContractorsCrew as OlafCrew,
+    )
+    results = {"import_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+    crews = []
+
+    def build():
+        crew = OlafCrew().crew()
+        crew.verbose = False
+        for agent in crew.agents:
+            agent.llm = StubLLM()
+            agent.verbose = False
+        crews.append(crew)
+
+    def kickoff():
+        crews.pop().kickoff(inputs={"region": "Quebec"})
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        results.update(flatten("build", measure(build, args.runs)))
+        results.update(flatten("kickoff", measure(kickoff, args.runs, before=build)))
+    return results
+
+
+BENCHMARKS: Dict[str, Callable] = {
+    'inventory': bench_inventory,
+    'weather': bench_weather,
+    'traffic': bench_traffic,
+    'report': bench_report,
+    'crew': bench_crew,
+}
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path: Path) -> List[dict]:
+    if not path.exists():
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+
+def previous_results(history: List[dict], case: str) -> Optional[Dict[str, float]]:
+    for record in reversed(history):
+        if case in record.get("results", {}):
+            return record["results"][case]
+    return None
+
+
+def compare(case: str, current: Dict[str, float], previous: Optional[Dict[str, float]], threshold: float) -> List[str]:
+    """Print a case's metrics next to the previous run; return the metrics that regressed."""
+    regressions = []
+    print(f"\n{case}")
+    for metric, value in current.items():
+        before = (previous or {}).get(metric)
+        line = f"  {metric:<32} {value!s:>12}"
+        if isinstance(value, (int, float)) and isinstance(before, (int, float)) and before:
+            change = (value - before) / before
+            line += f"  {before!s:>12}  {change:+7.1%}"
+            if metric.endswith('_ms') and change > threshold:
+                line += "  REGRESSION"
+                regressions.append(f"{case}.{metric}")
+        print(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--cases', default=','.join(CASES), help=f"Comma-separated subset of {', '.join(CASES)}")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--latency-ms', type=float, default=20.0, help="Stand-in latency per request")
+    parser.add_argument('--history', type=Path, default=DEFAULT_HISTORY)
+    parser.add_argument('--threshold', type=float, default=0.2, help="Slowdown flagged as a regression (0.2 = 20%%)")
+    parser.add_argument('--no-save', action='store_true', help="Compare without appending to the history")
+    parser.add_argument('--fail-on-regression', action='store_true')
+    args = parser.parse_args()
+
+    cases = [c.strip() for c in args.cases.split(',') if c.strip()]
+    unknown = sorted(set(cases) - set(CASES))
+    if unknown:
+        parser.error(f"Unknown case(s): {', '.join(unknown)}")
+
+    history = load_history(args.history)
+    record = {
+        "timestamp": datetime.now().isoformat(timespec='seconds'),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": args.runs,
+        "results": {}
+    }
+    regressions = []
+    for case in cases:
+        started = time.perf_counter()
+        record["results"][case] = BENCHMARKS[case](args)
+        print(f"[{case}] done in {time.perf_counter() - started:.1f} s")
+        regressions += compare(case, record["results"][case], previous_results(history, case), args.threshold)
+
+    if not args.no_save:
+        args.history.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.history, 'w') as f:
+            json.dump(history + [record], f, indent=2)
+        print(f"\nAppended to {args.history} ({len(history) + 1} runs)")
+    if regressions:
+        print(f"Regressions (> {args.threshold:.0%} slower): {', '.join(regressions)}")
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+"""
+Latency comparison for TomTomTrafficTool: sequential vs concurrent endpoint calls.
+
+Starts the local TomTom stand-in (tools/standin_api.py) with a fixed
+artificial delay per endpoint, then times the same requests made one after
+another against the concurrent `_run`: incidents, the route, and one flow
+sample per map tile along the route.
+
+Usage:
+    python benchmarks/traffic_latency.py [--delay-ms 150] [--runs 5]
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from ai_driven_snow_removal_optimization_for_municipalities_and_contractors.tools.standin_api import StandInConfig, StandInServer
+from ai_driven_snow_removal_optimization_for_municipalities_and_contractors.tools.route_geometry import RouteGeometry
+from ai_driven_snow_removal_optimization_for_municipalities_and_contractors.tools.tomtom_traffic_tool import TomTomTrafficTool, flow_cache
+from ai_driven_snow_removal_optimization_for_municipalities_and_contractors.tools.traffic_flow import segment_route, tile_key
+
+
+def run_sequential(tool: TomTomTrafficTool, region: str) -> int:
+    """Make the requests `_run` makes, one after another; returns the number of flow samples."""
+    coordinates = tool.region_coordinates[region]
+    lats = [c[0] for c in coordinates]
+    lons = [c[1] for c in coordinates]
+    bbox = f"{min(lons):.6f},{min(lats):.6f},{max(lons):.6f},{max(lats):.6f}"
+    tool._get_traffic_incidents(bbox)
+    geometry = RouteGeometry.from_tomtom(tool._calculate_route(coordinates, "fastest"))
+    if not len(geometry):
+        geometry = RouteGeometry.from_points(tuple(c) for c in coordinates)
+    samples = {}
+    for segment in segment_route(geometry.coords, tool.flow_sample_spacing_m, tool.max_flow_samples):
+        samples.setdefault(tile_key(segment.latitude, segment.longitude, tool.flow_tile_zoom), segment)
+    for segment in samples.values():
+        tool._fetch_flow_at(segment.latitude, segment.longitude)
+    return len(samples)
+
+
+def run_concurrent(tool: TomTomTrafficTool, region: str) -> None:
+    """Current `_run`, with a cold flow cache so every sample hits the stand-in."""
+    flow_cache.clear()
+    tool._run(region)
+
+
+def time_runs(fn, runs: int) -> list:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--delay-ms', type=float, default=150.0, help="Artificial latency per endpoint")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--region', default='Montreal')
+    args = parser.parse_args()
+
+    with StandInServer(StandInConfig(latency_ms=args.delay_ms)) as server:
+        tool = TomTomTrafficTool(api_key='benchmark', base_url=server.tomtom_url)
+        samples = run_sequential(tool, args.region)
+        sequential = time_runs(lambda: run_sequential(tool, args.region), args.runs)
+        concurrent = time_runs(lambda: run_concurrent(tool, args.region), args.runs)
+        warm = time_runs(lambda: tool._run(args.region), args.runs)
+
+    print(f"Stand-in latency per endpoint: {args.delay_ms:.0f} ms, runs: {args.runs}, flow samples: {samples}")
+    print(f"  sequential  median {statistics.median(sequential):8.1f} ms")
+    print(f"  concurrent  median {statistics.median(concurrent):8.1f} ms")
+    print(f"  concurrent  median {statistics.median(warm):8.1f} ms  (warm flow cache)")
+    print(f"  speedup     {statistics.median(sequential) / statistics.median(concurrent):8.2f}x cold, "
+          f"{statistics.median(sequential) / statistics.median(warm):.2f}x warm")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,44 +1,221 @@
-from crewai.flow.flow import Flow, listen, start
-from pydantic import BaseModel
+"""
+Event-driven snow removal pipeline built on the real OLAF tools.
 
-class SnowRemovalState(BaseModel):
-    weather_data: str = ""
-    traffic_data: str = ""
-    resources: str = ""
-    routes: str = ""
-    notifications: str = ""
+    collect_weather ──> integrate_traffic ──┐
+                                            ├─(and)─> optimize_routes ──> send_notifications
+    monitor_resources ──────────────────────┘
 
+The weather/traffic branch and the inventory branch start together and join
+before route optimization. State is typed and checkpointed to SQLite after
+every step; a step whose output is already in the state is skipped, so a
+failed run resumed with its id only re-runs what did not complete:
+
+    python flow.py Montreal
+    python flow.py --resume <run id>
+    python flow.py --plot
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Literal, Optional
+
+from crewai.flow.flow import Flow, FlowState, and_, listen, start
+from crewai.flow.persistence import SQLiteFlowPersistence, persist
+from dotenv import load_dotenv
+from pydantic import BaseModel, Field
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'src'))
+load_dotenv(Path(__file__).resolve().parent / 'src' / 'ai_driven_snow_removal_optimization_for_municipalities_and_contractors' / '.env')
+
+from ai_driven_snow_removal_optimization_for_municipalities_and_contractors.fast_path import build_report, call_tool
+from ai_driven_snow_removal_optimization_for_municipalities_and_contractors.tools.local_inventory_tool import LocalInventoryTool
+from ai_driven_snow_removal_optimization_for_municipalities_and_contractors.tools.registry import tool_registry
+from ai_driven_snow_removal_optimization_for_municipalities_and_contractors.tools.report_generator_tool import ReportGeneratorTool
+from ai_driven_snow_removal_optimization_for_municipalities_and_contractors.tools.route_optimization_tool import RouteOptimizationTool
+from ai_driven_snow_removal_optimization_for_municipalities_and_contractors.tools.tomtom_traffic_tool import TomTomTrafficTool
+from ai_driven_snow_removal_optimization_for_municipalities_and_contractors.tools.tracing import trace_run
+from ai_driven_snow_removal_optimization_for_municipalities_and_contractors.tools.weather_data_tool import WeatherDataTool
+
+# Checkpoints of every run, keyed by the run (state) id
+FLOW_DB = os.getenv('OLAF_FLOW_DB') or str(Path(__file__).resolve().parent / '.cache' / 'flow_state.sqlite3')
+
+# Steps of the two branches that must succeed before routes are optimized
+BRANCH_STEPS = ('collect_weather', 'integrate_traffic', 'monitor_resources')
+
+
+class StepRecord(BaseModel):
+    """Outcome of one flow step."""
+    status: Literal['done', 'failed', 'skipped']
+    duration_ms: float = 0.0
+    error: Optional[str] = None
+    finished_at: str = Field(default_factory=lambda: datetime.now().isoformat(timespec='seconds'))
+
+
+class Alert(BaseModel):
+    level: Literal['critical', 'warning', 'info']
+    source: str
+    message: str
+
+
+class SnowRemovalState(FlowState):
+    """Tool outputs are kept as the tools return them; None means the step has not succeeded yet."""
+    region: str = "Quebec"
+    use_llm: bool = Field(default_factory=lambda: os.getenv('OLAF_FAST_PATH_LLM', '1') != '0')
+    weather: Optional[Dict[str, Any]] = None
+    traffic: Optional[Dict[str, Any]] = None
+    salt: Optional[Dict[str, Any]] = None
+    fuel: Optional[Dict[str, Any]] = None
+    routes: Optional[Dict[str, Any]] = None
+    alerts: List[Alert] = Field(default_factory=list)
+    report: Optional[str] = None
+    steps: Dict[str, StepRecord] = Field(default_factory=dict)
+
+
+class StepFailed(RuntimeError):
+    """Raised at the join when a branch did not produce its data."""
+
+
+class JSONSQLiteFlowPersistence(SQLiteFlowPersistence):
+    """SQLite checkpoints that dump the state in JSON mode, so nested models (step records, alerts) serialize."""
+
+    def save_state(self, flow_uuid: str, method_name: str, state_data: Any) -> None:
+        if isinstance(state_data, BaseModel):
+            state_data = state_data.model_dump(mode='json')
+        super().save_state(flow_uuid, method_name, state_data)
+
+
+@persist(JSONSQLiteFlowPersistence(FLOW_DB))
 class SnowRemovalFlow(Flow[SnowRemovalState]):
+
+    async def _step(self, name: str, done: Callable[[], bool], fetch: Callable[[], None]) -> None:
+        """
+        Run `fetch` in a worker thread unless `done()` says the state already holds its output.
+
+        Failures are recorded in `state.steps` rather than raised, so the other branch
+        still finishes and is checkpointed; the join decides whether the run can go on.
+        """
+        if done():
+            self.state.steps[name] = StepRecord(status='skipped')
+            print(f"[{self.state.region}] {name}: already in state, skipped")
+            return
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(fetch)
+            self.state.steps[name] = StepRecord(status='done', duration_ms=round((time.perf_counter() - started) * 1000, 1))
+        except Exception as e:
+            self.state.steps[name] = StepRecord(
+                status='failed', duration_ms=round((time.perf_counter() - started) * 1000, 1), error=str(e)
+            )
+        print(f"[{self.state.region}] {name}: {self.state.steps[name].status}")
+
     @start()
-    def collect_weather_data(self):
-        print("Collecting weather data")
-        self.state.weather_data = "Weather data collected"
-        return self.state.weather_data
-
-    @listen(collect_weather_data)
-    def integrate_traffic_data(self, weather_data):
-        print("Integrating traffic data")
-        self.state.traffic_data = "Traffic data integrated"
-        return self.state.traffic_data
-
-    @listen(integrate_traffic_data)
-    def monitor_resources(self, traffic_data):
-        print("Monitoring resources")
-        self.state.resources = "Resources monitored"
-        return self.state.resources
-
-    @listen(monitor_resources)
-    def optimize_routes(self, resources):
-        print("Optimizing routes")
-        self.state.routes = "Routes optimized"
-        return self.state.routes
+    async def collect_weather(self):
+        def fetch():
+            self.state.weather = call_tool(tool_registry.get(WeatherDataTool), region=self.state.region)
+        await self._step('collect_weather', lambda: self.state.weather is not None, fetch)
+
+    @listen(collect_weather)
+    async def integrate_traffic(self):
+        def fetch():
+            self.state.traffic = call_tool(tool_registry.get(TomTomTrafficTool), region=self.state.region)
+        await self._step('integrate_traffic', lambda: self.state.traffic is not None, fetch)
+
+    @start()
+    async def monitor_resources(self):
+        def fetch():
+            tool = tool_registry.get(LocalInventoryTool)
+            self.state.salt = call_tool(tool, search_query="", json_path="salt_inv.json")
+            self.state.fuel = call_tool(tool, search_query="", json_path="fuel_inv.json")
+        await self._step('monitor_resources', lambda: self.state.salt is not None and self.state.fuel is not None, fetch)
+
+    @listen(and_(integrate_traffic, monitor_resources))
+    async def optimize_routes(self):
+        failed = {
+            name: self.state.steps[name].error for name in BRANCH_STEPS
+            if name in self.state.steps and self.state.steps[name].status == 'failed'
+        }
+        if failed:
+            raise StepFailed(f"Steps failed: {failed}. Resume with --resume {self.state.id}")
+
+        def fetch():
+            self.state.routes = call_tool(tool_registry.get(RouteOptimizationTool), region=self.state.region)
+        await self._step('optimize_routes', lambda: self.state.routes is not None, fetch)
+        if self.state.steps['optimize_routes'].status == 'failed':
+            raise StepFailed(f"Route optimization failed: {self.state.steps['optimize_routes'].error}")
 
     @listen(optimize_routes)
-    def send_notifications(self, routes):
-        print("Sending notifications")
-        self.state.notifications = "Notifications sent"
-        return self.state.notifications
+    async def send_notifications(self):
+        def fetch():
+            data = {key: getattr(self.state, key) for key in ("weather", "traffic", "salt", "fuel", "routes")}
+            report = build_report(self.state.region, data, use_llm=self.state.use_llm)
+            self.state.alerts = [Alert(**alert) for alert in report["alerts"]]
+            self.state.report = tool_registry.get(ReportGeneratorTool)._run(
+                json.dumps({"region": self.state.region, "content": report["content"]})
+            )
+        await self._step('send_notifications', lambda: self.state.report is not None, fetch)
+        return self.state.report
 
-if __name__ == "__main__":
+
+def run(region: Optional[str] = None, resume: Optional[str] = None) -> SnowRemovalState:
+    """
+    Run (or resume) the flow for a region.
+
+    Args:
+        region: Region known to the weather and traffic tools; defaults to the
+            resumed run's region, or the state default for a new run
+        resume: Id of an earlier run whose checkpoint to continue from
+
+    Returns:
+        The final flow state
+
+    Raises:
+        ValueError: If `resume` has no checkpoint, or `region` differs from the resumed run's
+    """
+    inputs: Dict[str, Any] = {}
+    if resume:
+        saved = JSONSQLiteFlowPersistence(FLOW_DB).load_state(resume)
+        if saved is None:
+            raise ValueError(f"No checkpoint for run {resume} in {FLOW_DB}")
+        if region and region != saved.get("region"):
+            raise ValueError(f"Run {resume} is for {saved.get('region')}, not {region}")
+        # The restored state already has the region; passing it again would override it
+        inputs["id"] = resume
+    elif region:
+        inputs["region"] = region
     flow = SnowRemovalFlow()
-    flow.plot()
+    label = region or (saved.get("region") if resume else flow.state.region)
+    print(f"[{label}] flow run {resume or flow.state.id}")
+    with trace_run(f"flow-{label}"):
+        try:
+            flow.kickoff(inputs=inputs)
+        except StepFailed as e:
+            print(f"[{label}] {e}")
+    return flow.state
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if "--plot" in args:
+        SnowRemovalFlow().plot()
+        sys.exit(0)
+    resume = None
+    if "--resume" in args:
+        position = args.index("--resume")
+        if position + 1 >= len(args):
+            print("Usage: flow.py [<region>] [--resume <run id>] [--plot]")
+            sys.exit(1)
+        resume = args.pop(position + 1)
+        args.pop(position)
+    try:
+        state = run(args[0] if args else None, resume)
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
+    for name, step in state.steps.items():
+        print(f"  {name:<20} {step.status:<8} {step.duration_ms:>8.1f} ms {step.error or ''}")
+    if state.report:
+        print(state.report)
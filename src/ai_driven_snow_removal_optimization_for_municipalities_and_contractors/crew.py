@@ -1,10 +1,16 @@
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 from crewai_tools import JSONSearchTool, ScrapeWebsiteTool
+from .tools.artifact_tool import ArtifactRetrievalTool
 from .tools.local_inventory_tool import LocalInventoryTool
 from .tools.report_generator_tool import ReportGeneratorTool
 from .tools.tomtom_traffic_tool import TomTomTrafficTool
 from .tools.weather_data_tool import WeatherDataTool
+from .tools.route_optimization_tool import RouteOptimizationTool
+from .tools.registry import tool_registry
+from .tools.tracing import instrument_crew, trace_enabled
+from .scheduling import schedule_tasks
+from .llm_cache import agent_llm, cache_enabled, get_completion_cache
 from pathlib import Path
 import os
 from datetime import datetime
@@ -17,8 +23,9 @@ class AiDrivenSnowRemovalOptimizationForMunicipalitiesAndContractorsCrew():
     def global_planification(self) -> Agent:
         return Agent(
             config=self.agents_config['global_planification'],
+            **agent_llm(self.agents_config['global_planification']),
             tools=[
-                ScrapeWebsiteTool()
+                tool_registry.get(ScrapeWebsiteTool)
             ],
         )
 
@@ -26,9 +33,11 @@ class AiDrivenSnowRemovalOptimizationForMunicipalitiesAndContractorsCrew():
     def weather_monitor(self) -> Agent:
         return Agent(
             config=self.agents_config['weather_monitor'],
+            **agent_llm(self.agents_config['weather_monitor']),
             tools=[
-                WeatherDataTool(),
-                ScrapeWebsiteTool()  # Keep as backup for additional weather sources
+                tool_registry.get(WeatherDataTool),
+                tool_registry.get(ArtifactRetrievalTool),
+                tool_registry.get(ScrapeWebsiteTool)  # Keep as backup for additional weather sources
             ],
         )
 
@@ -36,9 +45,10 @@ class AiDrivenSnowRemovalOptimizationForMunicipalitiesAndContractorsCrew():
     def stock_resources_manager(self) -> Agent:
         return Agent(
             config=self.agents_config['stock_resources_manager'],
+            **agent_llm(self.agents_config['stock_resources_manager']),
             tools=[
-                ScrapeWebsiteTool(),
-                LocalInventoryTool()
+                tool_registry.get(ScrapeWebsiteTool),
+                tool_registry.get(LocalInventoryTool)
             ],
         )
 
@@ -46,9 +56,12 @@ class AiDrivenSnowRemovalOptimizationForMunicipalitiesAndContractorsCrew():
     def route_optimizer(self) -> Agent:
         return Agent(
             config=self.agents_config['route_optimizer'],
+            **agent_llm(self.agents_config['route_optimizer']),
             tools=[
-                TomTomTrafficTool(),
-                ScrapeWebsiteTool()
+                tool_registry.get(TomTomTrafficTool),
+                tool_registry.get(RouteOptimizationTool),
+                tool_registry.get(ArtifactRetrievalTool),
+                tool_registry.get(ScrapeWebsiteTool)
             ],
         )
 
@@ -56,9 +69,11 @@ class AiDrivenSnowRemovalOptimizationForMunicipalitiesAndContractorsCrew():
     def notifications_alerts_manager(self) -> Agent:
         return Agent(
             config=self.agents_config['notifications_alerts_manager'],
+            **agent_llm(self.agents_config['notifications_alerts_manager']),
             tools=[
-                JSONSearchTool(),
-                ReportGeneratorTool()
+                tool_registry.get(JSONSearchTool),
+                tool_registry.get(ReportGeneratorTool),
+                tool_registry.get(ArtifactRetrievalTool)
             ],
         )
 
@@ -67,7 +82,7 @@ class AiDrivenSnowRemovalOptimizationForMunicipalitiesAndContractorsCrew():
         return Task(
             config=self.tasks_config['global_planning'],
             tools=[
-                JSONSearchTool()
+                tool_registry.get(JSONSearchTool)
             ],
         )
 
@@ -76,8 +91,9 @@ class AiDrivenSnowRemovalOptimizationForMunicipalitiesAndContractorsCrew():
         return Task(
             config=self.tasks_config['weather_data_collection'],
             tools=[
-                WeatherDataTool(),
-                ScrapeWebsiteTool()  # Keep as backup for additional weather sources
+                tool_registry.get(WeatherDataTool),
+                tool_registry.get(ArtifactRetrievalTool),
+                tool_registry.get(ScrapeWebsiteTool)  # Keep as backup for additional weather sources
             ],
         )
 
@@ -86,8 +102,9 @@ class AiDrivenSnowRemovalOptimizationForMunicipalitiesAndContractorsCrew():
         return Task(
             config=self.tasks_config['traffic_data_integration'],
             tools=[
-                ScrapeWebsiteTool(),
-                TomTomTrafficTool()
+                tool_registry.get(ScrapeWebsiteTool),
+                tool_registry.get(TomTomTrafficTool),
+                tool_registry.get(ArtifactRetrievalTool)
             ],
         )
 
@@ -95,7 +112,7 @@ class AiDrivenSnowRemovalOptimizationForMunicipalitiesAndContractorsCrew():
     def resource_monitoring(self) -> Task:
         return Task(
             config=self.tasks_config['resource_monitoring'],
-            tools=[JSONSearchTool()],
+            tools=[tool_registry.get(JSONSearchTool)],
         )
 
     @task
@@ -103,8 +120,10 @@ class AiDrivenSnowRemovalOptimizationForMunicipalitiesAndContractorsCrew():
         return Task(
             config=self.tasks_config['route_optimization'],
             tools=[
-                ScrapeWebsiteTool(),
-                TomTomTrafficTool()
+                tool_registry.get(ScrapeWebsiteTool),
+                tool_registry.get(TomTomTrafficTool),
+                tool_registry.get(RouteOptimizationTool),
+                tool_registry.get(ArtifactRetrievalTool)
             ],
         )
 
@@ -113,18 +132,27 @@ class AiDrivenSnowRemovalOptimizationForMunicipalitiesAndContractorsCrew():
         return Task(
             config=self.tasks_config['stakeholder_communication'],
             tools=[
-                JSONSearchTool(),
-                ReportGeneratorTool()
+                tool_registry.get(JSONSearchTool),
+                tool_registry.get(ReportGeneratorTool),
+                tool_registry.get(ArtifactRetrievalTool)
             ]
         )
 
     @crew
     def crew(self) -> Crew:
         """Creates the AiDrivenSnowRemovalOptimizationForMunicipalitiesAndContractors crew"""
+        print(f"Tools ready: {tool_registry.summary()}")
+        if cache_enabled():
+            print(f"LLM completion cache: {get_completion_cache().db_path}")
+        if trace_enabled():
+            # Task and LLM call spans (tool and HTTP spans are recorded by the tools)
+            instrument_crew()
         print("OLAF initialized, kicking off tasks...")
         return Crew(
             agents=self.agents,  # Automatically created by the @agent decorator
-            tasks=self.tasks,    # Automatically created by the @task decorator
+            # Tasks created by the @task decorator, reordered so that tasks whose
+            # context dependencies are met run concurrently
+            tasks=schedule_tasks(self.tasks),
             process=Process.sequential,
             verbose=True,
         )
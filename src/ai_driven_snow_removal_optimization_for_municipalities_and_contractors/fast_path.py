@@ -0,0 +1,594 @@
+"""
+Deterministic fast path from tool outputs to the HTML report.
+
+WeatherDataTool, TomTomTrafficTool and LocalInventoryTool already return
+structured JSON, so instead of asking agents to reshape it, this module maps
+their outputs straight into ReportGeneratorTool sections and derives alerts
+and projected needs with fixed rules. The only LLM call is the one that
+writes the operational recommendations; with the LLM disabled (or failing)
+rule-based recommendations are used, so a refresh needs no tokens at all.
+"""
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import yaml
+
+from .tools.artifact_store import resolve_payload
+from .tools.inventory_store import get_store
+from .tools.local_inventory_tool import LocalInventoryTool
+from .tools.registry import tool_registry
+from .tools.report_generator_tool import ReportGeneratorTool
+from .tools.route_geometry import result_geometry
+from .tools.spatial_index import INCIDENT_CATEGORIES, incident_points
+from .tools.tomtom_traffic_tool import TomTomTrafficTool
+from .tools.vrp_solver import Vehicle
+from .tools.weather_data_tool import WeatherDataTool
+
+CONFIG_DIR = Path(__file__).resolve().parent / 'config'
+
+# Salt spread per km of route for one treatment pass, and truck fuel use per km
+SALT_TONS_PER_KM = 0.15
+FUEL_LITERS_PER_KM = Vehicle.fuel_liters_per_km
+# Route network length assumed when the traffic tool returned no route
+DEFAULT_ROUTE_KM = 50.0
+# Material types that treatment passes draw from
+PROJECTED_MATERIALS = {'salt': 'rock_salt', 'fuel': 'diesel'}
+# Days of consumption log used for usage rates
+USAGE_DAYS = 7.0
+# Route delay (minutes) worth an alert
+DELAY_ALERT_MINUTES = 10.0
+# Incidents shown on the report map (on-route incidents first)
+MAX_REPORT_INCIDENTS = 50
+# Route points drawn on the report map
+MAX_REPORT_ROUTE_POINTS = 500
+
+ALERT_LEVELS = ('critical', 'warning', 'info')
+TREATMENT_RISKS = {'high', 'medium'}
+ICY_CONDITIONS = {'icy', 'potential ice'}
+
+
+def _label(value: str) -> str:
+    """'rock_salt' -> 'Rock Salt'."""
+    return str(value).replace('_', ' ').title()
+
+
+class ToolCallError(RuntimeError):
+    """Raised by `call_tool` when a tool returns one of the tools' error payloads."""
+
+
+def call_tool(tool: Any, **kwargs) -> dict:
+    """
+    Run a tool and parse its JSON output.
+
+    Compact outputs are swapped for the full payload behind their artifact handle.
+
+    Raises:
+        ToolCallError: The tool returned an {"error", "details"} or {"status": "error"} payload
+    """
+    output = json.loads(tool._run(**kwargs))
+    if "error" in output or output.get("status") == "error":
+        raise ToolCallError(f"{output.get('error') or 'Error'}: {output.get('details') or output.get('message')}")
+    return resolve_payload(output)
+
+
+def _call_tool(factory: Callable[[], Any], **kwargs) -> dict:
+    """`call_tool` on the tool built by `factory`; construction and call failures become error dicts."""
+    try:
+        return call_tool(factory(), **kwargs)
+    except Exception as e:
+        return {"error": "Tool call failed", "details": str(e)}
+
+
+def collect(region: str) -> Dict[str, dict]:
+    """
+    Fetch weather, traffic and inventory data for a region concurrently.
+
+    Args:
+        region: Region known to the weather and traffic tools
+
+    Returns:
+        Dict with the parsed "weather", "traffic", "salt" and "fuel" tool
+        outputs (an {"error", "details"} dict for a failed tool) and per-tool
+        "timings_ms"
+    """
+    calls = {
+        "weather": (lambda: tool_registry.get(WeatherDataTool), {"region": region}),
+        "traffic": (lambda: tool_registry.get(TomTomTrafficTool), {"region": region}),
+        "salt": (lambda: tool_registry.get(LocalInventoryTool), {"search_query": "", "json_path": "salt_inv.json"}),
+        "fuel": (lambda: tool_registry.get(LocalInventoryTool), {"search_query": "", "json_path": "fuel_inv.json"}),
+    }
+    timings: Dict[str, float] = {}
+
+    def timed(key: str, factory: Callable[[], Any], kwargs: dict) -> dict:
+        started = time.perf_counter()
+        try:
+            return _call_tool(factory, **kwargs)
+        finally:
+            timings[key] = round((time.perf_counter() - started) * 1000, 1)
+
+    with ThreadPoolExecutor(max_workers=len(calls), thread_name_prefix="olaf-fast") as executor:
+        futures = {key: executor.submit(timed, key, factory, kwargs) for key, (factory, kwargs) in calls.items()}
+        data = {key: future.result() for key, future in futures.items()}
+    data["timings_ms"] = timings
+    return data
+
+
+def _failed(output: Optional[dict]) -> bool:
+    return not output or "error" in output or output.get("status") == "error"
+
+
+def weather_section(weather: dict) -> Optional[dict]:
+    """Weather Dashboard section from a WeatherDataTool result, or None if it failed."""
+    if _failed(weather):
+        return None
+    current = weather.get("current_conditions") or {}
+    return {
+        "header": "Weather Dashboard",
+        "content": {
+            "current_conditions": {
+                "temperature": current.get("temperature"),
+                "conditions": "Snowy" if current.get("has_snow") else _label(current.get("road_condition", "N/A")),
+                "wind_speed": current.get("wind_speed"),
+                "road_surface_temp": current.get("road_surface_temp")
+            },
+            "forecast": [
+                {
+                    "time": f.get("timestamp", "")[:16],
+                    "expected_snow": f"{f.get('snow_amount_mm', 0):.2f} mm",
+                    "snow_risk": _label(f.get("snow_risk", "")),
+                    "road_condition": _label(f.get("road_condition", ""))
+                }
+                for f in weather.get("forecast") or []
+            ]
+        }
+    }
+
+
+def _first_route(traffic: dict) -> dict:
+    routes = (traffic.get("optimized_route") or {}).get("routes") or []
+    return routes[0] if routes else {}
+
+
+def _report_incidents(traffic: dict) -> List[dict]:
+    """Incidents for the report map, on-route ones first and described by the segment they affect."""
+    incidents = (traffic.get("traffic_incidents") or {}).get("incidents") or []
+    on_route: Dict[int, str] = {}
+    for segment in (traffic.get("route_incidents") or {}).get("segments", []):
+        for match in segment["incidents"]:
+            on_route.setdefault(
+                int(match["incident"]),
+                f"on route km {segment['from_km']}-{segment['to_km']}, {match['distance_m']:.0f} m away"
+            )
+    order = sorted(range(len(incidents)), key=lambda i: (i not in on_route, i))
+    report = []
+    for i in order[:MAX_REPORT_INCIDENTS]:
+        points = incident_points(incidents[i])
+        if not points:
+            continue
+        properties = incidents[i].get("properties") or {}
+        category = INCIDENT_CATEGORIES.get(properties.get("iconCategory"), "Incident")
+        length = properties.get("length")
+        report.append({
+            "type": category,
+            "description": on_route.get(i) or (f"{length:.0f} m affected" if length else "off route"),
+            "location": {"latitude": points[0][0], "longitude": points[0][1]},
+            "start_time": properties.get("startTime"),
+            "end_time": properties.get("endTime")
+        })
+    return report
+
+
+def traffic_conditions(traffic: dict) -> Dict[str, Any]:
+    """Overall status and average speed along the route from the flow profile, else the route summary."""
+    summary = (traffic.get("traffic_flow") or {}).get("summary") or {}
+    speeds = [s["current_speed"] for s in (traffic.get("traffic_flow") or {}).get("segments", [])
+              if s.get("current_speed") is not None]
+    route = _first_route(traffic).get("summary") or {}
+    if summary.get("closed_segments"):
+        status = "Road closures on route"
+    elif summary.get("free_flow_minutes"):
+        ratio = summary["estimated_minutes"] / summary["free_flow_minutes"]
+        status = "Free flowing" if ratio <= 1.1 else "Moderate" if ratio <= 1.5 else "Heavy"
+    else:
+        status = "Unknown"
+    if speeds:
+        speed = sum(speeds) / len(speeds)
+    elif route.get("travelTimeInSeconds"):
+        speed = route["lengthInMeters"] / route["travelTimeInSeconds"] * 3.6
+    else:
+        speed = None
+    return {"status": status, "speed_kmh": round(speed, 1) if speed is not None else None}
+
+
+def traffic_section(traffic: dict) -> Optional[dict]:
+    """Route Optimization section from a TomTomTrafficTool result, or None if it failed."""
+    if _failed(traffic):
+        return None
+    route = _first_route(traffic)
+    summary = route.get("summary") or {}
+    conditions = traffic_conditions(traffic)
+    geometry = result_geometry(traffic)
+    segments = []
+    for index, leg in enumerate((route.get("legs") or [])[:geometry.legs]):
+        points = geometry.leg(index)
+        if not len(points):
+            continue
+        leg_summary = leg.get("summary") or {}
+        segments.append({
+            "start": leg_summary.get("departureTime"),
+            "end": leg_summary.get("arrivalTime"),
+            "start_point": {"latitude": float(points[0][0]), "longitude": float(points[0][1])},
+            "end_point": {"latitude": float(points[-1][0]), "longitude": float(points[-1][1])}
+        })
+    travel_s = summary.get("travelTimeInSeconds")
+    return {
+        "header": "Route Optimization",
+        "content": {
+            "traffic_data": {
+                "current_conditions": conditions["status"],
+                "traffic_speed": f"{conditions['speed_kmh']:.0f} km/h" if conditions["speed_kmh"] is not None else "N/A",
+                "traffic_incidents": _report_incidents(traffic)
+            },
+            "optimized_route": {
+                "length": f"{summary['lengthInMeters'] / 1000:.1f} km" if "lengthInMeters" in summary else "N/A",
+                "travel_time": f"{travel_s // 3600} h {travel_s % 3600 // 60} min" if travel_s is not None else "N/A",
+                "segments": segments,
+                "route_shape": geometry.downsample(MAX_REPORT_ROUTE_POINTS).to_dict() if len(geometry) else None
+            }
+        }
+    }
+
+
+def routes_section(routes: Optional[dict]) -> Optional[dict]:
+    """Vehicle Routes section from a RouteOptimizationTool result, or None if there is none."""
+    if _failed(routes):
+        return None
+    plan = routes.get("routes") or {}
+    return {
+        "header": "Vehicle Routes",
+        "content": {
+            "vehicles": [
+                {
+                    "vehicle_id": vehicle["vehicle_id"],
+                    "depot": vehicle["depot"],
+                    "trips": len(vehicle["trips"]),
+                    "stops": [stop for trip in vehicle["trips"] for stop in trip["stops"]],
+                    "distance_km": vehicle["distance_km"],
+                    "duration_minutes": vehicle["duration_minutes"],
+                    "salt_tons": round(sum(trip["salt_tons"] for trip in vehicle["trips"]), 2)
+                }
+                for vehicle in plan.get("vehicles", [])
+            ],
+            "total_distance_km": plan.get("total_distance_km"),
+            "makespan_minutes": plan.get("makespan_minutes"),
+            "unassigned_stops": plan.get("unassigned_stops", [])
+        }
+    }
+
+
+def route_km(traffic: dict) -> float:
+    """Length of the planned route in km, or DEFAULT_ROUTE_KM without one."""
+    summary = {} if _failed(traffic) else _first_route(traffic).get("summary") or {}
+    return summary["lengthInMeters"] / 1000 if summary.get("lengthInMeters") else DEFAULT_ROUTE_KM
+
+
+def treatment_passes(weather: dict) -> int:
+    """Forecast periods that call for a salting pass: medium/high snow risk or possible ice."""
+    if _failed(weather):
+        return 0
+    return sum(
+        1 for f in weather.get("forecast") or []
+        if f.get("snow_risk") in TREATMENT_RISKS or f.get("road_condition") in ICY_CONDITIONS
+    )
+
+
+def inventory_section(salt: dict, fuel: dict, weather: dict, traffic: dict) -> Optional[dict]:
+    """
+    Resource Inventory section from the LocalInventoryTool results.
+
+    Projected needs assume one pass over the route per forecast period that
+    needs treatment (see `treatment_passes`), drawn from PROJECTED_MATERIALS.
+    """
+    outputs = {"salt": salt, "fuel": fuel}
+    if all(_failed(output) for output in outputs.values()):
+        return None
+    passes = treatment_passes(weather)
+    km = route_km(traffic)
+    projected = {"salt": passes * km * SALT_TONS_PER_KM, "fuel": passes * km * FUEL_LITERS_PER_KM}
+    store = get_store()
+
+    levels, usage, needs, alerts = {}, {}, {}, {}
+    for category, output in outputs.items():
+        if _failed(output):
+            continue
+        totals: Dict[str, float] = {}
+        unit = ""
+        for item in output.get("data") or []:
+            quantity_key = next(k for k in item if k.startswith("current_quantity_"))
+            unit = quantity_key[len("current_quantity_"):]
+            totals[item["type"]] = totals.get(item["type"], 0) + item[quantity_key]
+            threshold = item.get("minimum_threshold")
+            if threshold is not None and item[quantity_key] < threshold:
+                alerts[f"{_label(item['type'])} ({item['storage_location']})"] = {
+                    "Threshold": f"{threshold:g} {unit}",
+                    "Current Level": f"{item[quantity_key]:g} {unit}",
+                    "Alert": "Below minimum threshold"
+                }
+        consumed = store.usage(category, USAGE_DAYS)
+        for material, total in totals.items():
+            levels[_label(material)] = f"{total:g} {unit}"
+            usage[_label(material)] = f"{consumed.get(material, 0) / USAGE_DAYS:.1f} {unit}/day"
+        material = PROJECTED_MATERIALS[category]
+        if material in totals:
+            need = round(projected[category], 1)
+            needs[_label(material)] = f"{need:g} {unit}"
+            if need > totals[material]:
+                alerts[_label(material)] = {
+                    "Threshold": f"{need:g} {unit}",
+                    "Current Level": f"{totals[material]:g} {unit}",
+                    "Alert": "Projected need exceeds stock"
+                }
+    return {
+        "header": "Resource Inventory",
+        "content": {
+            "inventory_levels": levels,
+            "recent_usage": usage,
+            "projected_needs": needs,
+            "low_inventory_alerts": alerts
+        }
+    }
+
+
+def compute_alerts(data: Dict[str, dict], inventory: Optional[dict]) -> List[dict]:
+    """
+    Alerts derived from the tool outputs with fixed rules, most severe first.
+
+    Args:
+        data: Tool outputs as returned by `collect`
+        inventory: Resource Inventory section (see `inventory_section`)
+
+    Returns:
+        List of {"level", "source", "message"} dicts
+    """
+    alerts: List[dict] = []
+
+    def add(level: str, source: str, message: str) -> None:
+        alerts.append({"level": level, "source": source, "message": message})
+
+    weather = data.get("weather")
+    if _failed(weather):
+        add("warning", "weather", f"Weather data unavailable: {(weather or {}).get('details', 'no data')}")
+    else:
+        current = weather.get("current_conditions") or {}
+        forecast = weather.get("forecast") or []
+        if current.get("road_condition") == "icy":
+            add("critical", "weather", f"Icy roads now (surface {current.get('road_surface_temp')}°C)")
+        high = [f for f in forecast if f.get("snow_risk") == "high"]
+        if high:
+            add("critical", "weather",
+                f"High snow risk from {high[0]['timestamp'][:16]} ({len(high)} of {len(forecast)} forecast periods)")
+        snowy = [f for f in forecast if f.get("has_snow")]
+        if snowy:
+            total = sum(f.get("snow_amount_mm", 0) for f in snowy)
+            add("warning", "weather", f"{total:.1f} mm of snow expected, starting {snowy[0]['timestamp'][:16]}")
+        icy = [f for f in forecast if f.get("road_condition") in ICY_CONDITIONS]
+        if icy and current.get("road_condition") != "icy":
+            add("warning", "weather", f"Ice risk on roads from {icy[0]['timestamp'][:16]}")
+
+    traffic = data.get("traffic")
+    if _failed(traffic):
+        add("warning", "traffic", f"Traffic data unavailable: {(traffic or {}).get('details', 'no data')}")
+    else:
+        summary = (traffic.get("traffic_flow") or {}).get("summary") or {}
+        if summary.get("closed_segments"):
+            add("critical", "traffic", f"{summary['closed_segments']} closed segment(s) on the route")
+        matched = traffic.get("route_incidents") or {}
+        if matched.get("incidents"):
+            add("warning", "traffic",
+                f"{len(matched['incidents'])} incident(s) within {matched['radius_m']:g} m of the route")
+        if summary.get("delay_minutes", 0) >= DELAY_ALERT_MINUTES:
+            add("warning", "traffic", f"Route delayed by {summary['delay_minutes']:.0f} min over free flow")
+        if traffic.get("errors"):
+            add("info", "traffic", f"Partial traffic data, failed: {', '.join(sorted(traffic['errors']))}")
+
+    for category in ("salt", "fuel"):
+        if _failed(data.get(category)):
+            add("warning", "inventory", f"{_label(category)} inventory unavailable")
+    for resource, alert in ((inventory or {}).get("content", {}).get("low_inventory_alerts") or {}).items():
+        level = "critical" if alert["Alert"] == "Projected need exceeds stock" else "warning"
+        add(level, "inventory",
+            f"{resource}: {alert['Alert'].lower()} ({alert['Current Level']} vs {alert['Threshold']})")
+
+    return sorted(alerts, key=lambda alert: ALERT_LEVELS.index(alert["level"]))
+
+
+def situation_summary(region: str, data: Dict[str, dict], sections: Dict[str, dict], alerts: List[dict]) -> dict:
+    """Compact facts the recommendations are written from."""
+    weather = data.get("weather") or {}
+    traffic = data.get("traffic") or {}
+    inventory = (sections.get("Resource Inventory") or {}).get("content") or {}
+    fleet = (sections.get("Vehicle Routes") or {}).get("content")
+    route = (sections.get("Route Optimization") or {}).get("content", {}).get("optimized_route") or {}
+    return {
+        "region": region,
+        "current_conditions": (sections.get("Weather Dashboard") or {}).get("content", {}).get("current_conditions"),
+        "snow_expected_mm": round(sum(f.get("snow_amount_mm", 0) for f in weather.get("forecast") or []), 1),
+        "treatment_passes": treatment_passes(weather),
+        "route": {"length": route.get("length"), "travel_time": route.get("travel_time")},
+        "traffic": None if _failed(traffic) else traffic_conditions(traffic),
+        "delay_minutes": ((traffic.get("traffic_flow") or {}).get("summary") or {}).get("delay_minutes"),
+        "inventory_levels": inventory.get("inventory_levels"),
+        "projected_needs": inventory.get("projected_needs"),
+        "fleet": {
+            "vehicles": len(fleet["vehicles"]),
+            "total_distance_km": fleet["total_distance_km"],
+            "makespan_minutes": fleet["makespan_minutes"],
+            "unassigned_stops": len(fleet["unassigned_stops"])
+        } if fleet else None,
+        "alerts": [f"[{a['level']}] {a['message']}" for a in alerts]
+    }
+
+
+def rule_recommendations(summary: dict) -> dict:
+    """Recommendations from fixed rules, used when no LLM is available."""
+    critical = [a for a in summary["alerts"] if a.startswith("[critical]")]
+    passes = summary["treatment_passes"]
+    if passes:
+        schedule = (f"Plan {passes} treatment pass(es) over the route in {summary['region']}: arterials and "
+                    f"bridges first, then collectors, then residential streets.")
+    else:
+        schedule = f"No treatment needed in {summary['region']} for the forecast period; keep crews on standby."
+    if critical:
+        schedule += " Address first: " + "; ".join(a[len("[critical] "):] for a in critical) + "."
+    travel = summary["route"].get("travel_time")
+    if travel and travel != "N/A":
+        estimate = f"Each pass takes about {travel} at current traffic"
+        if summary.get("delay_minutes"):
+            estimate += f", including {summary['delay_minutes']:.0f} min of delay"
+        estimate += "."
+    else:
+        estimate = "Completion time unavailable without route data."
+    fleet = summary.get("fleet")
+    if fleet:
+        estimate += (f" The fleet plan uses {fleet['vehicles']} vehicle(s) over {fleet['total_distance_km']} km "
+                     f"and finishes in about {fleet['makespan_minutes']:.0f} min")
+        estimate += f", with {fleet['unassigned_stops']} stop(s) unassigned." if fleet["unassigned_stops"] else "."
+    return {"priority_based_schedules": schedule, "completion_estimates": estimate}
+
+
+def _default_model() -> str:
+    """LLM of the agent that writes reports in the crew, overridable with OLAF_FAST_PATH_MODEL."""
+    model = os.getenv('OLAF_FAST_PATH_MODEL')
+    if model:
+        return model
+    with open(CONFIG_DIR / 'agents.yaml', 'r') as f:
+        return yaml.safe_load(f)['notifications_alerts_manager'].get('llm', 'openai/gpt-4o')
+
+
+def llm_recommendations(summary: dict, model: Optional[str] = None) -> dict:
+    """
+    Ask the LLM for the narrative recommendations (one completion).
+
+    Args:
+        summary: Facts from `situation_summary`
+        model: LLM model name; defaults to the report agent's model
+
+    Returns:
+        {"priority_based_schedules", "completion_estimates"} strings
+    """
+    from crewai import LLM
+
+    from .llm_cache import cache_enabled, cached_llm
+
+    prompt = (
+        "You coordinate municipal snow removal. From the situation below, write operational "
+        "recommendations as a JSON object with two string fields: \"priority_based_schedules\" "
+        "(which roads and resources to deploy, in order) and \"completion_estimates\" (expected "
+        "completion times). Use only the facts given.\n\n" + json.dumps(summary, indent=2)
+    )
+    model = model or _default_model()
+    llm = cached_llm(model) if cache_enabled() else LLM(model=model)
+    answer = llm.call([{"role": "user", "content": prompt}])
+    text = str(answer).strip()
+    if text.startswith("```"):
+        text = text.strip("`").removeprefix("json").strip()
+    try:
+        parsed = json.loads(text)
+        return {
+            "priority_based_schedules": str(parsed.get("priority_based_schedules", "")),
+            "completion_estimates": str(parsed.get("completion_estimates", ""))
+        }
+    except (json.JSONDecodeError, AttributeError):
+        return {"priority_based_schedules": text, "completion_estimates": ""}
+
+
+def build_report(region: str, data: Dict[str, dict], use_llm: bool = True, model: Optional[str] = None) -> dict:
+    """
+    Map collected tool outputs to ReportGeneratorTool content.
+
+    Args:
+        region: Region the data is for
+        data: Tool outputs as returned by `collect`, plus an optional RouteOptimizationTool
+            result under "routes" (rendered as a Vehicle Routes section)
+        use_llm: Write the recommendations with the LLM (rule-based otherwise or on failure)
+        model: LLM model name override
+
+    Returns:
+        Dict with the report "content", the "alerts" and "recommendations_source" ('llm' or 'rules')
+    """
+    sections = {
+        section["header"]: section
+        for section in (
+            weather_section(data.get("weather")),
+            traffic_section(data.get("traffic")),
+            routes_section(data.get("routes")),
+            inventory_section(data.get("salt"), data.get("fuel"), data.get("weather"), data.get("traffic"))
+        )
+        if section
+    }
+    alerts = compute_alerts(data, sections.get("Resource Inventory"))
+    summary = situation_summary(region, data, sections, alerts)
+    source = "rules"
+    recommendations = None
+    if use_llm:
+        try:
+            recommendations = llm_recommendations(summary, model)
+            source = "llm"
+        except Exception as e:
+            print(f"[{region}] LLM recommendations failed, using rules: {e}")
+    if recommendations is None:
+        recommendations = rule_recommendations(summary)
+
+    return {
+        "content": {
+            "title": f"Snow Removal Operations Report - {region}",
+            "sections": [
+                {"header": "Alerts", "content": {"alerts": alerts}},
+                *sections.values(),
+                {"header": "Operational Recommendations", "content": recommendations}
+            ]
+        },
+        "alerts": alerts,
+        "recommendations_source": source
+    }
+
+
+def run_fast_path(region: str, use_llm: bool = True, model: Optional[str] = None) -> dict:
+    """
+    Collect data, build and render the report for one region without running the crew.
+
+    Args:
+        region: Region known to the weather and traffic tools
+        use_llm: Write the recommendations with the LLM
+        model: LLM model name override
+
+    Returns:
+        Dict with the ReportGeneratorTool message, the alerts, the recommendations
+        source and per-stage "timings_ms"
+    """
+    started = time.perf_counter()
+    data = collect(region)
+    collected = time.perf_counter()
+    report = build_report(region, data, use_llm=use_llm, model=model)
+    built = time.perf_counter()
+    message = tool_registry.get(ReportGeneratorTool)._run(
+        json.dumps({"region": region, "content": report["content"]})
+    )
+    finished = time.perf_counter()
+    return {
+        "region": region,
+        "report": message,
+        "alerts": report["alerts"],
+        "recommendations_source": report["recommendations_source"],
+        "timings_ms": {
+            "tools": data["timings_ms"],
+            "collect": round((collected - started) * 1000, 1),
+            "build": round((built - collected) * 1000, 1),
+            "render": round((finished - built) * 1000, 1),
+            "total": round((finished - started) * 1000, 1)
+        }
+    }
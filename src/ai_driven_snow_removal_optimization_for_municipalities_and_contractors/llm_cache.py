@@ -0,0 +1,300 @@
+"""
+Opt-in completion cache for the crew's agents.
+
+train, test and replay re-run the same agents on the same inputs, paying for
+the same completions every time. With OLAF_LLM_CACHE=1 the agents get a
+CachedLLM that looks completions up in a local SQLite file first.
+
+The key is the model, its sampling settings, the prompt and a digest of the
+tool outputs in it. Tool outputs ("Observation: ..." in the agent transcript,
+or tool-role messages) are taken out of the prompt and digested separately
+without their top-level fetch time and timings, so two runs that saw the
+same data share entries even though the tools stamp every response with the
+current time. Everything else, including nested times such as forecast
+periods, is part of the digest.
+
+The file is bounded by total response size; least recently used entries are
+evicted first.
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from crewai import LLM
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+# Top-level tool output fields that change on every call without the data changing
+VOLATILE_KEYS = frozenset(('timestamp', 'timings_ms'))
+
+OBSERVATION = re.compile(r'Observation:(.*?)(?=\nThought:|\Z)', re.DOTALL)
+TOOL_OUTPUT_PLACEHOLDER = 'Observation: <tool output>'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS completions (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used_at REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS completions_lru ON completions(last_used_at);
+"""
+
+
+def cache_enabled() -> bool:
+    return os.getenv('OLAF_LLM_CACHE', '0') == '1'
+
+
+def _strip_volatile(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: v for k, v in value.items() if k not in VOLATILE_KEYS}
+    return value
+
+
+def normalize_tool_output(text: str) -> str:
+    """Canonical form of a tool output: JSON without its top-level volatile fields, other text stripped."""
+    text = text.strip()
+    try:
+        return json.dumps(_strip_volatile(json.loads(text)), sort_keys=True, separators=(',', ':'))
+    except (json.JSONDecodeError, TypeError):
+        return text
+
+
+def split_tool_outputs(messages: Union[str, List[Dict[str, Any]]]) -> Tuple[List[Dict[str, str]], List[str]]:
+    """
+    Separate tool outputs from the rest of the prompt.
+
+    Returns:
+        (messages with tool outputs replaced by a placeholder, normalized tool outputs in order)
+    """
+    if isinstance(messages, str):
+        messages = [{"role": "user", "content": messages}]
+    prompt: List[Dict[str, str]] = []
+    outputs: List[str] = []
+    for message in messages:
+        content = str(message.get('content') or '')
+        if message.get('role') == 'tool':
+            outputs.append(normalize_tool_output(content))
+            content = TOOL_OUTPUT_PLACEHOLDER
+        else:
+            def replace(match: 're.Match') -> str:
+                outputs.append(normalize_tool_output(match.group(1)))
+                return TOOL_OUTPUT_PLACEHOLDER
+            content = OBSERVATION.sub(replace, content)
+        prompt.append({"role": str(message.get('role')), "content": content})
+    return prompt, outputs
+
+
+def completion_key(model: str, messages: Union[str, List[Dict[str, Any]]],
+                   tools: Optional[List[dict]] = None, **settings) -> str:
+    """Cache key for a completion: model, settings, prompt and a digest of the tool outputs."""
+    prompt, outputs = split_tool_outputs(messages)
+    tool_digest = hashlib.sha256('\x1e'.join(outputs).encode()).hexdigest()
+    payload = {
+        "model": model,
+        "settings": {k: v for k, v in sorted(settings.items()) if v is not None},
+        "prompt": prompt,
+        "tools": tools,
+        "tool_outputs": tool_digest,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class CompletionCache:
+    """SQLite completion store bounded by total response size, with per-process hit/miss counters."""
+
+    def __init__(self, db_path: Union[str, Path], max_bytes: int = 64 * 1024 * 1024):
+        self.db_path = Path(db_path)
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached response for `key`, or None (counted as a miss)."""
+        conn = self._connection()
+        row = conn.execute("SELECT response FROM completions WHERE key = ?", (key,)).fetchone()
+        with self._lock:
+            if row is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+        conn.execute(
+            "UPDATE completions SET last_used_at = ?, hits = hits + 1 WHERE key = ?",
+            (time.time(), key)
+        )
+        return row[0]
+
+    def set(self, key: str, model: str, response: str) -> None:
+        """Store a response, then evict least recently used entries beyond `max_bytes`."""
+        size = len(response.encode())
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO completions (key, model, response, size, created_at, last_used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, response, size, now, now)
+            )
+            excess = conn.execute("SELECT COALESCE(SUM(size), 0) FROM completions").fetchone()[0] - self.max_bytes
+            if excess > 0:
+                evict = []
+                for old_key, old_size in conn.execute(
+                    "SELECT key, size FROM completions WHERE key != ? ORDER BY last_used_at", (key,)
+                ):
+                    if excess <= 0:
+                        break
+                    evict.append((old_key,))
+                    excess -= old_size
+                conn.executemany("DELETE FROM completions WHERE key = ?", evict)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM completions")
+        with self._lock:
+            self._hits = self._misses = 0
+
+    def stats(self) -> dict:
+        entries, size, lifetime_hits = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(hits), 0) FROM completions"
+        ).fetchone()
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+                "entries": entries,
+                "size_bytes": size,
+                "max_bytes": self.max_bytes,
+                "lifetime_hits": lifetime_hits,
+                "path": str(self.db_path),
+            }
+
+    def summary(self) -> str:
+        stats = self.stats()
+        lookups = stats["hits"] + stats["misses"]
+        return (f"{stats['hits']}/{lookups} completion(s) from cache ({stats['hit_rate']:.0%}), "
+                f"{stats['entries']} entries, {stats['size_bytes'] / 1024:.0f} KB of "
+                f"{stats['max_bytes'] / 1024 / 1024:.0f} MB")
+
+
+_caches: Dict[Path, CompletionCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_completion_cache(db_path: Optional[Union[str, Path]] = None) -> CompletionCache:
+    """
+    Return the process-wide completion cache for `db_path`.
+
+    Defaults to OLAF_LLM_CACHE_PATH, or .cache/llm_cache.sqlite3 in the project root,
+    bounded by OLAF_LLM_CACHE_MB (default 64).
+    """
+    path = Path(db_path or os.getenv('OLAF_LLM_CACHE_PATH') or PROJECT_ROOT / '.cache' / 'llm_cache.sqlite3').resolve()
+    with _caches_lock:
+        if path not in _caches:
+            max_bytes = int(float(os.getenv('OLAF_LLM_CACHE_MB', '64')) * 1024 * 1024)
+            _caches[path] = CompletionCache(path, max_bytes=max_bytes)
+        return _caches[path]
+
+
+class CachedLLM(LLM):
+    """
+    LLM whose text completions are served from the completion cache when the same request was seen before.
+
+    Written against the crewai 0.x LLM pinned in pyproject.toml: a plain class whose
+    `call` takes (messages, tools, callbacks, available_functions). Agents keep a
+    subclass as is, while any other object is rebuilt into a plain LLM.
+    """
+
+    def __init__(self, *args, cache: Optional[CompletionCache] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache = cache or get_completion_cache()
+
+    def call(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+    ) -> Union[str, Any]:
+        key = completion_key(
+            self.model, messages, tools,
+            temperature=self.temperature, top_p=self.top_p, max_tokens=self.max_tokens,
+            stop=self.stop, response_format=str(self.response_format) if self.response_format else None
+        )
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        response = super().call(messages, tools, callbacks, available_functions)
+        # Function-call results are not text and depend on live tools; only cache text
+        if isinstance(response, str) and response:
+            self.cache.set(key, self.model, response)
+        return response
+
+
+def cached_llm(model: str) -> CachedLLM:
+    """
+    CachedLLM for `model`.
+
+    Raises:
+        RuntimeError: If the installed crewai hands back another class for LLM(...)
+            (crewai 1.x returns native provider objects), which would bypass the cache
+    """
+    llm = CachedLLM(model=model)
+    if not isinstance(llm, CachedLLM) or not hasattr(llm, 'cache'):
+        raise RuntimeError(
+            f"crewai returned {type(llm).__name__} for CachedLLM; the completion cache "
+            "needs the crewai 0.x LLM pinned in pyproject.toml"
+        )
+    return llm
+
+
+def agent_llm(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Agent keyword arguments that swap in a CachedLLM for the agent's configured model.
+
+    Empty (the configured model is used as is) unless OLAF_LLM_CACHE=1.
+    """
+    llm = config.get('llm')
+    if not cache_enabled() or not llm:
+        return {}
+    return {"llm": cached_llm(llm if isinstance(llm, str) else llm.model)}
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2 or sys.argv[1] not in ('stats', 'clear'):
+        print("Usage: llm_cache.py stats|clear")
+        sys.exit(1)
+    cache = get_completion_cache()
+    if sys.argv[1] == 'clear':
+        cache.clear()
+        print(f"Cleared {cache.db_path}")
+    else:
+        print(json.dumps(cache.stats(), indent=2))
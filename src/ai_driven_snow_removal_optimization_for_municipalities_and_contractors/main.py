@@ -1,6 +1,8 @@
 #!/usr/bin/env python
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -8,6 +10,24 @@ from pathlib import Path
 env_path = Path(__file__).parent / '.env'
 load_dotenv(env_path)
 from ai_driven_snow_removal_optimization_for_municipalities_and_contractors.crew import AiDrivenSnowRemovalOptimizationForMunicipalitiesAndContractorsCrew
+from ai_driven_snow_removal_optimization_for_municipalities_and_contractors.tools.tomtom_traffic_tool import TomTomTrafficTool
+from ai_driven_snow_removal_optimization_for_municipalities_and_contractors.tools.weather_data_tool import WeatherDataTool
+from ai_driven_snow_removal_optimization_for_municipalities_and_contractors.tools.tracing import trace_run
+
+def known_regions() -> List[str]:
+    """
+    Regions that both the weather and traffic tools have coordinates for.
+    """
+    return [
+        region for region in WeatherDataTool.region_coordinates
+        if region in TomTomTrafficTool.region_coordinates
+    ]
+
+def report_llm_cache() -> None:
+    """Print the completion cache hit rate when OLAF_LLM_CACHE=1."""
+    from ai_driven_snow_removal_optimization_for_municipalities_and_contractors.llm_cache import cache_enabled, get_completion_cache
+    if cache_enabled():
+        print(f"LLM cache: {get_completion_cache().summary()}")
 
 def run():
     """
@@ -17,7 +37,93 @@ def run():
     inputs = {
         'region': 'Quebec'
     }
-    AiDrivenSnowRemovalOptimizationForMunicipalitiesAndContractorsCrew().crew().kickoff(inputs=inputs)
+    with trace_run(f"run-{inputs['region']}"):
+        AiDrivenSnowRemovalOptimizationForMunicipalitiesAndContractorsCrew().crew().kickoff(inputs=inputs)
+    report_llm_cache()
+
+def _kickoff_region(region: str):
+    return AiDrivenSnowRemovalOptimizationForMunicipalitiesAndContractorsCrew().crew().kickoff(inputs={'region': region})
+
+def run_batch(regions: Optional[List[str]] = None, max_workers: Optional[int] = None) -> Dict[str, object]:
+    """
+    Run one crew per region concurrently and collect one result per region.
+
+    Args:
+        regions: Regions to plan for; None or ["all"] means every known region
+            (read from the command line when not given)
+        max_workers: Crews running at the same time (default: OLAF_BATCH_WORKERS or 3)
+
+    Returns:
+        Dict mapping each region to its crew output, or to the exception it raised
+    """
+    if regions is None:
+        regions = sys.argv[2:] if len(sys.argv) > 1 and sys.argv[1] == "run_batch" else sys.argv[1:]
+    if not regions or [r.lower() for r in regions] == ["all"]:
+        regions = known_regions()
+    regions = list(dict.fromkeys(regions))
+    unknown = [r for r in regions if r not in known_regions()]
+    if unknown:
+        raise ValueError(f"Unknown region(s): {unknown}. Available regions: {known_regions()}")
+    max_workers = max_workers or int(os.getenv('OLAF_BATCH_WORKERS', '3'))
+
+    print(f"Starting OLAF agents execution for {len(regions)} region(s): {', '.join(regions)}")
+    results: Dict[str, object] = {}
+    with trace_run("run_batch-" + '-'.join(regions)), \
+            ThreadPoolExecutor(max_workers=min(max_workers, len(regions)), thread_name_prefix="olaf-crew") as executor:
+        # Each region gets its own crew instance: crews hold per-run state
+        futures = {
+            executor.submit(_kickoff_region, region): region
+            for region in regions
+        }
+        for future in as_completed(futures):
+            region = futures[future]
+            try:
+                results[region] = future.result()
+                print(f"[{region}] completed")
+            except Exception as e:
+                results[region] = e
+                print(f"[{region}] failed: {e}")
+
+    report_llm_cache()
+    return {region: results[region] for region in regions}
+
+def run_fast(regions: Optional[List[str]] = None, use_llm: Optional[bool] = None) -> Dict[str, dict]:
+    """
+    Refresh reports without running the crew: tool outputs are mapped straight into
+    the report and only the recommendations are written by the LLM.
+
+    Args:
+        regions: Regions to report on; None or ["all"] means every known region
+            (read from the command line when not given)
+        use_llm: Write recommendations with the LLM; False uses rule-based ones
+            (default: off when --no-llm is on the command line or OLAF_FAST_PATH_LLM=0)
+
+    Returns:
+        Dict mapping each region to its fast-path result (see fast_path.run_fast_path)
+    """
+    from ai_driven_snow_removal_optimization_for_municipalities_and_contractors.fast_path import run_fast_path
+
+    args = sys.argv[2:] if len(sys.argv) > 1 and sys.argv[1] == "run_fast" else sys.argv[1:]
+    if use_llm is None:
+        use_llm = '--no-llm' not in args and os.getenv('OLAF_FAST_PATH_LLM', '1') != '0'
+    if regions is None:
+        regions = [a for a in args if not a.startswith('--')]
+    if not regions or [r.lower() for r in regions] == ["all"]:
+        regions = known_regions()
+    regions = list(dict.fromkeys(regions))
+    unknown = [r for r in regions if r not in known_regions()]
+    if unknown:
+        raise ValueError(f"Unknown region(s): {unknown}. Available regions: {known_regions()}")
+
+    results: Dict[str, dict] = {}
+    for region in regions:
+        with trace_run(f"run_fast-{region}"):
+            result = run_fast_path(region, use_llm=use_llm)
+        critical = sum(1 for alert in result["alerts"] if alert["level"] == "critical")
+        print(f"[{region}] {result['report']} ({len(result['alerts'])} alert(s), {critical} critical; "
+              f"recommendations from {result['recommendations_source']}; {result['timings_ms']['total']:.0f} ms)")
+        results[region] = result
+    return results
 
 def train():
     """
@@ -27,7 +133,9 @@ def train():
         'region': 'Quebec'
     }
     try:
-        AiDrivenSnowRemovalOptimizationForMunicipalitiesAndContractorsCrew().crew().train(n_iterations=int(sys.argv[1]), filename=sys.argv[2], inputs=inputs)
+        with trace_run("train"):
+            AiDrivenSnowRemovalOptimizationForMunicipalitiesAndContractorsCrew().crew().train(n_iterations=int(sys.argv[1]), filename=sys.argv[2], inputs=inputs)
+        report_llm_cache()
     except Exception as e:
         raise Exception(f"An error occurred while training the crew: {e}")
 
@@ -36,7 +144,9 @@ def replay():
     Replay the crew execution from a specific task.
     """
     try:
-        AiDrivenSnowRemovalOptimizationForMunicipalitiesAndContractorsCrew().crew().replay(task_id=sys.argv[1])
+        with trace_run("replay"):
+            AiDrivenSnowRemovalOptimizationForMunicipalitiesAndContractorsCrew().crew().replay(task_id=sys.argv[1])
+        report_llm_cache()
     except Exception as e:
         raise Exception(f"An error occurred while replaying the crew: {e}")
 
@@ -48,7 +158,9 @@ def test():
         'region': 'Quebec'
     }
     try:
-        AiDrivenSnowRemovalOptimizationForMunicipalitiesAndContractorsCrew().crew().test(n_iterations=int(sys.argv[1]), openai_model_name=sys.argv[2], inputs=inputs)
+        with trace_run("test"):
+            AiDrivenSnowRemovalOptimizationForMunicipalitiesAndContractorsCrew().crew().test(n_iterations=int(sys.argv[1]), openai_model_name=sys.argv[2], inputs=inputs)
+        report_llm_cache()
     except Exception as e:
         raise Exception(f"An error occurred while testing the crew: {e}")
 
@@ -60,6 +172,10 @@ if __name__ == "__main__":
     command = sys.argv[1]
     if command == "run":
         run()
+    elif command == "run_batch":
+        run_batch()
+    elif command == "run_fast":
+        run_fast()
     elif command == "train":
         train()
     elif command == "replay":
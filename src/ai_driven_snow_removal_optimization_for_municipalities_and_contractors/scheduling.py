@@ -0,0 +1,169 @@
+"""
+Dependency-aware task scheduling for the crew.
+
+CrewAI's sequential process runs tasks in list order and joins every pending
+`async_execution` task at the next synchronous one, so async flags alone can
+only overlap a task with its immediate neighbours. This module derives a DAG
+from each task's `context` list and schedules every task by its own
+dependencies instead: a task that none of the tasks right after it need
+(e.g. resource monitoring) is started in the background as soon as its own
+context is complete, and only the first task whose context includes it waits
+for its output. Everything else runs in declaration order as before, so the
+weather -> traffic -> routing chain proceeds while inventory is checked.
+"""
+import os
+import threading
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+
+from crewai import Task
+from crewai.utilities.formatter import aggregate_raw_outputs_from_tasks
+
+
+def _dependencies(tasks: List[Task]) -> Dict[int, List[int]]:
+    """
+    Map each task index to the indices of the tasks it depends on.
+
+    A task without a context list (or with an empty one) receives the previous
+    outputs in sequential mode, so it is treated as depending on every task
+    declared before it.
+    """
+    index_of = {id(task): i for i, task in enumerate(tasks)}
+    deps: Dict[int, List[int]] = {}
+    for i, task in enumerate(tasks):
+        if isinstance(task.context, list) and task.context:
+            deps[i] = [index_of[id(t)] for t in task.context if id(t) in index_of]
+            if any(d >= i for d in deps[i]):
+                raise ValueError(f"Task context refers to a later task: {task.description}")
+        else:
+            deps[i] = list(range(i))
+    return deps
+
+
+def plan_background_tasks(tasks: List[Task]) -> Dict[int, int]:
+    """
+    Pick the tasks that can run in the background.
+
+    A task runs in the background when its own dependencies are not background
+    tasks, it has a dependent, and at least one task between the point where its
+    context is complete and its first dependent does not need it. It must not
+    share an agent with any task it would overlap, since an agent executes one
+    task at a time.
+
+    Args:
+        tasks: Tasks in declaration order
+
+    Returns:
+        {background task index: index of the first task whose context includes it}
+    """
+    deps = _dependencies(tasks)
+    background: Dict[int, int] = {}
+    for b in range(len(tasks)):
+        join = next((j for j in range(b + 1, len(tasks)) if b in deps[j]), None)
+        if join is None or any(d in background for d in deps[b]):
+            continue
+        start = max(deps[b], default=-1) + 1
+        overlapped = [k for k in range(start, join) if k != b]
+        overlapped += [k for k, k_join in background.items() if k_join > start and k < join]
+        if not overlapped or any(tasks[k].agent is tasks[b].agent for k in overlapped):
+            continue
+        background[b] = join
+    # A task needs a foreground task to start it before its dependent runs; drop the
+    # ones left with only other background tasks to overlap
+    while True:
+        stranded = [b for b, join in background.items() if _starter(b, deps, background) >= join]
+        if not stranded:
+            return background
+        del background[stranded[0]]
+
+
+def _starter(b: int, deps: Dict[int, List[int]], background: Dict[int, int]) -> int:
+    """Index of the first foreground task that runs once background task `b`'s context is complete."""
+    start = max(deps[b], default=-1) + 1
+    return next(k for k in range(start, len(deps)) if k not in background)
+
+
+def _start_before(task: Task, starts: List[Task]) -> None:
+    """Make `task` start the background tasks in `starts` right before it runs."""
+    execute_sync = task.execute_sync
+
+    def start_then_execute(*args, **kwargs):
+        for background_task in starts:
+            _start_in_background(background_task)
+        return execute_sync(*args, **kwargs)
+
+    # Tasks are pydantic models; set the wrapper on the instance without validation
+    object.__setattr__(task, 'execute_sync', start_then_execute)
+
+
+def _start_in_background(task: Task) -> None:
+    if getattr(task, '_olaf_future', None) is not None:
+        return
+    future: Future = Future()
+
+    def execute() -> None:
+        # Task.execute_async never resolves its future when the task raises; this one does
+        try:
+            # The class attribute, not the instance's join wrapper
+            future.set_result(Task.execute_sync(
+                task,
+                agent=task.agent,
+                context=aggregate_raw_outputs_from_tasks(task.context),
+                tools=task.tools or task.agent.tools,
+            ))
+        except BaseException as e:
+            future.set_exception(e)
+
+    object.__setattr__(task, '_olaf_future', future)
+    threading.Thread(target=execute, daemon=True).start()
+
+
+def _join_in_place(task: Task) -> None:
+    """Make the crew's call to `task` return its background output (or run it if it never started)."""
+    execute_sync = task.execute_sync
+
+    def join_or_execute(*args, **kwargs):
+        future: Optional[Future] = getattr(task, '_olaf_future', None)
+        if future is None:
+            return execute_sync(*args, **kwargs)
+        object.__setattr__(task, '_olaf_future', None)
+        return future.result()
+
+    object.__setattr__(task, 'execute_sync', join_or_execute)
+
+
+def schedule_tasks(tasks: List[Task]) -> List[Task]:
+    """
+    Order the tasks for the sequential process and wire up background tasks.
+
+    Each background task is moved to just before its first dependent, where the
+    crew records its output, and is started by the first other task that runs
+    once its own context is complete. The remaining tasks keep their order.
+    Set OLAF_PARALLEL_TASKS=0 to keep strictly sequential execution.
+
+    Args:
+        tasks: Tasks in declaration order
+
+    Returns:
+        The tasks in execution order
+    """
+    if os.getenv('OLAF_PARALLEL_TASKS', '1') == '0':
+        return tasks
+
+    deps = _dependencies(tasks)
+    background = plan_background_tasks(tasks)
+    starts: Dict[int, List[Task]] = {}
+    for b in background:
+        starts.setdefault(_starter(b, deps, background), []).append(tasks[b])
+
+    ordered: List[Task] = []
+    for i, task in enumerate(tasks):
+        task.async_execution = False
+        if i in background:
+            _join_in_place(task)
+            continue
+        if i in starts:
+            _start_before(task, starts[i])
+        ordered.extend(tasks[b] for b, join in background.items() if join == i)
+        ordered.append(task)
+    return ordered
@@ -6,5 +6,7 @@ Contains custom tools used by the crew agents.
 from .local_inventory_tool import LocalInventoryTool
 from .tomtom_traffic_tool import TomTomTrafficTool
 from .report_generator_tool import ReportGeneratorTool
+from .route_optimization_tool import RouteOptimizationTool
+from .registry import ToolRegistry, tool_registry
 
-__all__ = ['LocalInventoryTool', 'TomTomTrafficTool', 'ReportGeneratorTool']
+__all__ = ['LocalInventoryTool', 'TomTomTrafficTool', 'ReportGeneratorTool', 'RouteOptimizationTool', 'ToolRegistry', 'tool_registry']
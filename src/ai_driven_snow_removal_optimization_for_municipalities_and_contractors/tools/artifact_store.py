@@ -0,0 +1,155 @@
+"""
+Local store for full tool payloads kept out of the agent context.
+
+Tools return a compact summary plus a handle such as "traffic-3f2a9c0d1e4b5a67";
+the full payload is written here as gzipped JSON and can be read back whole
+(`get`) or piece by piece (`lookup`, used by ArtifactRetrievalTool).
+
+Handles are derived from the payload without its top-level fetch time and
+timings, so re-fetching unchanged data yields the same handle; the stored
+file is replaced with the latest payload, so it always carries the latest
+fetch time. Nested fields (e.g. forecast period times) are part of the
+handle. The directory is bounded by total size; the oldest artifacts are
+removed first.
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+
+# Dicts larger than this (as JSON) are described by their keys instead of returned whole
+MAX_VALUE_CHARS = 8000
+# Top-level fields left out of the handle digest
+VOLATILE_KEYS = frozenset(('timestamp', 'timings_ms'))
+
+
+def _without_volatile(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: v for k, v in value.items() if k not in VOLATILE_KEYS}
+    return value
+
+
+class ArtifactNotFoundError(KeyError):
+    """Raised for an unknown or expired artifact handle."""
+
+
+class ArtifactStore:
+    """Content-addressed gzipped JSON files under one directory, bounded by total size."""
+
+    def __init__(self, root: Union[str, Path], max_bytes: int = 256 * 1024 * 1024):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, handle: str) -> Path:
+        # Handles are "<kind>-<hex>"; reject anything that could escape the directory
+        kind, _, digest = handle.partition('-')
+        if not kind.isidentifier() or not digest.isalnum():
+            raise ArtifactNotFoundError(f"Invalid artifact handle: {handle}")
+        return self.root / f"{handle}.json.gz"
+
+    def put(self, kind: str, payload: Any) -> str:
+        """
+        Store a JSON-serializable payload.
+
+        Args:
+            kind: Short payload type used as the handle prefix (e.g. 'traffic', 'weather')
+            payload: The full payload
+
+        Returns:
+            The artifact handle
+        """
+        canonical = json.dumps(_without_volatile(payload), sort_keys=True, separators=(',', ':'), default=str)
+        handle = f"{kind}-{hashlib.sha256(canonical.encode()).hexdigest()[:16]}"
+        path = self._path(handle)
+        with self._lock:
+            # Rewritten even when the handle exists, so the file has the latest fetch time
+            existed = path.exists()
+            tmp = path.with_suffix('.tmp')
+            with gzip.open(tmp, 'wt', encoding='utf-8') as f:
+                json.dump(payload, f, separators=(',', ':'), default=str)
+            os.replace(tmp, path)
+            if not existed:
+                self._evict()
+        return handle
+
+    def _evict(self) -> None:
+        files = sorted(self.root.glob('*.json.gz'), key=lambda p: p.stat().st_mtime)
+        total = sum(p.stat().st_size for p in files)
+        for old in files[:-1]:
+            if total <= self.max_bytes:
+                break
+            total -= old.stat().st_size
+            old.unlink(missing_ok=True)
+
+    def get(self, handle: str) -> Any:
+        """Full payload for `handle`; raises ArtifactNotFoundError if it is unknown or was evicted."""
+        path = self._path(handle)
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise ArtifactNotFoundError(f"Artifact not found (unknown or evicted): {handle}") from None
+
+    def lookup(self, handle: str, path: Optional[str] = None, offset: int = 0, limit: int = 20) -> Dict[str, Any]:
+        """
+        Part of a payload, addressed by a dotted path ('traffic_flow.segments', 'forecast.3').
+
+        Lists are returned a page at a time (`offset`, `limit`); dicts holding large
+        values list their keys and sizes instead, so each lookup stays small.
+
+        Returns:
+            Dict with the handle, path, value type and the (paged) value
+        """
+        value = self.get(handle)
+        for part in [p for p in (path or '').split('.') if p]:
+            if isinstance(value, list) and part.lstrip('-').isdigit():
+                value = value[int(part)]
+            elif isinstance(value, dict) and part in value:
+                value = value[part]
+            else:
+                raise KeyError(f"Path '{path}' not found in {handle} (stopped at '{part}')")
+        result: Dict[str, Any] = {"handle": handle, "path": path or "", "type": type(value).__name__}
+        if isinstance(value, list):
+            result.update(total=len(value), offset=offset, items=value[offset:offset + limit])
+        elif isinstance(value, dict) and len(json.dumps(value, default=str)) > MAX_VALUE_CHARS:
+            result["keys"] = {
+                key: {"type": type(item).__name__, "chars": len(json.dumps(item, default=str))}
+                for key, item in value.items()
+            }
+        else:
+            result["value"] = value
+        return result
+
+
+_stores: Dict[Path, ArtifactStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_artifact_store(root: Optional[Union[str, Path]] = None) -> ArtifactStore:
+    """
+    Return the process-wide store for `root`.
+
+    Defaults to OLAF_ARTIFACT_DIR, or .cache/artifacts in the project root, bounded
+    by OLAF_ARTIFACT_MAX_MB (default 256).
+    """
+    path = Path(root or os.getenv('OLAF_ARTIFACT_DIR') or PROJECT_ROOT / '.cache' / 'artifacts').resolve()
+    with _stores_lock:
+        if path not in _stores:
+            max_bytes = int(float(os.getenv('OLAF_ARTIFACT_MAX_MB', '256')) * 1024 * 1024)
+            _stores[path] = ArtifactStore(path, max_bytes=max_bytes)
+        return _stores[path]
+
+
+def resolve_payload(output: Dict[str, Any]) -> Dict[str, Any]:
+    """The full payload behind a compact tool output, or the output itself when it has no artifact."""
+    handle = output.get('artifact') if isinstance(output, dict) else None
+    if not handle:
+        return output
+    return get_artifact_store().get(handle)
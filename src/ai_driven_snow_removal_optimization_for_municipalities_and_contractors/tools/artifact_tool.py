@@ -0,0 +1,73 @@
+from crewai.tools import BaseTool
+from typing import Optional, Type
+from pydantic import BaseModel, Field
+import json
+from .artifact_store import get_artifact_store
+
+
+class ArtifactRetrievalToolInput(BaseModel):
+    """Input schema for ArtifactRetrievalTool."""
+    handle: str = Field(
+        ...,
+        description="Artifact handle from a tool output's 'artifact' field (e.g. 'traffic-3f2a9c0d1e4b5a67')"
+    )
+    path: Optional[str] = Field(
+        default=None,
+        description="Optional dotted path into the payload (e.g. 'traffic_flow.segments', 'forecast.3', "
+                    "'route_incidents.incidents'); omit to list the top-level keys"
+    )
+    offset: int = Field(
+        default=0,
+        description="First list item to return when the path points to a list"
+    )
+    limit: int = Field(
+        default=20,
+        description="Maximum number of list items to return (1-100)"
+    )
+
+
+class ArtifactRetrievalTool(BaseTool):
+    name: str = "Tool Data Retrieval Tool"
+    description: str = """
+    Retrieves details that the weather and traffic tools left out of their summaries.
+    Pass the 'artifact' handle from their output and a dotted path to the part you need,
+    e.g. 'forecast' (every forecast period), 'traffic_flow.segments' (per-segment speeds),
+    'route_incidents' (incidents matched to route segments), 'traffic_incidents.incidents',
+    'optimized_route.routes.0.legs' (leg summaries) or 'route_geometry' (the route shape as an
+    encoded polyline). Lists are returned a page at a time.
+    """
+    args_schema: Type[BaseModel] = ArtifactRetrievalToolInput
+
+    def _run(self, handle: str, path: Optional[str] = None, offset: int = 0, limit: int = 20) -> str:
+        """
+        Look up part of a stored tool payload.
+
+        Args:
+            handle: Artifact handle returned by a tool
+            path: Dotted path into the payload
+            offset: First list item to return
+            limit: Maximum number of list items to return
+
+        Returns:
+            JSON string with the requested value, or its keys if it is large
+        """
+        try:
+            result = get_artifact_store().lookup(
+                handle, path, offset=max(offset, 0), limit=min(max(limit, 1), 100)
+            )
+            return json.dumps(result, indent=2)
+        except KeyError as e:
+            return json.dumps({
+                "error": "Artifact data not found",
+                "details": str(e.args[0]) if e.args else str(e)
+            })
+        except (IndexError, ValueError) as e:
+            return json.dumps({
+                "error": "Invalid artifact path",
+                "details": str(e)
+            })
+        except Exception as e:
+            return json.dumps({
+                "error": "An unexpected error occurred",
+                "details": str(e)
+            })
@@ -0,0 +1,149 @@
+"""
+Bounded-size summaries of the weather and traffic tool payloads.
+
+The agents only need totals, the worst spots and a few notable entries to
+reason about a region; the raw route geometry, guidance, incident and flow
+JSON stay in the artifact store behind the summary's "artifact" handle.
+Every list in a summary is capped, so its size does not grow with route
+length, forecast horizon or incident count.
+"""
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from .spatial_index import INCIDENT_CATEGORIES
+
+# Caps on the lists kept in a summary
+TOP_INCIDENTS = 5
+SLOWEST_SEGMENTS = 5
+NOTABLE_FORECAST_PERIODS = 8
+
+
+def _route_summary(result: Dict[str, Any]) -> Optional[dict]:
+    routes = (result.get('optimized_route') or {}).get('routes') or []
+    if not routes:
+        return None
+    summary = routes[0].get('summary') or {}
+    legs = routes[0].get('legs') or []
+    return {
+        "length_km": round(summary.get('lengthInMeters', 0) / 1000, 2),
+        "travel_time_min": round(summary.get('travelTimeInSeconds', 0) / 60, 1),
+        "traffic_delay_min": round(summary.get('trafficDelayInSeconds', 0) / 60, 1),
+        "departure": summary.get('departureTime'),
+        "arrival": summary.get('arrivalTime'),
+        "legs": len(legs),
+        "points": (result.get('route_geometry') or {}).get('points', 0)
+    }
+
+
+def _flow_summary(flow: Optional[dict]) -> Optional[dict]:
+    if not flow:
+        return None
+    segments = flow.get('segments') or []
+    measured = [s for s in segments if s.get('speed_ratio') is not None]
+    return {
+        **(flow.get('summary') or {}),
+        "requests": flow.get('requests'),
+        # One current speed per segment in route order (null where unmeasured)
+        "segment_speeds_kmh": [s.get('current_speed') for s in segments],
+        "slowest_segments": [
+            {k: s.get(k) for k in ('segment', 'from_km', 'to_km', 'current_speed', 'free_flow_speed',
+                                   'speed_ratio', 'road_closure')}
+            for s in sorted(measured, key=lambda s: s['speed_ratio'])[:SLOWEST_SEGMENTS]
+        ]
+    }
+
+
+def _incident_summary(incidents: Optional[dict], route_incidents: Optional[dict]) -> Optional[dict]:
+    if incidents is None:
+        return None
+    features = incidents.get('incidents') or []
+    categories = Counter(
+        INCIDENT_CATEGORIES.get((f.get('properties') or {}).get('iconCategory'), 'Unknown') for f in features
+    )
+    matched = route_incidents or {}
+    top: List[dict] = []
+    for segment in matched.get('segments', []):
+        for match in segment['incidents']:
+            top.append({
+                **matched['incidents'][match['incident']],
+                "from_km": segment['from_km'],
+                "to_km": segment['to_km'],
+                "distance_m": match['distance_m']
+            })
+    top.sort(key=lambda incident: incident['distance_m'])
+    return {
+        "total": len(features),
+        "by_category": dict(categories.most_common()),
+        "on_route": len(matched.get('incidents') or {}),
+        "radius_m": matched.get('radius_m'),
+        "nearest_on_route": top[:TOP_INCIDENTS]
+    }
+
+
+def compact_traffic(result: Dict[str, Any], handle: str) -> Dict[str, Any]:
+    """
+    Summary of a TomTomTrafficTool result.
+
+    Args:
+        result: Full tool result (raw incidents, route and flow profile)
+        handle: Artifact handle of the full result
+
+    Returns:
+        Route totals, incident counts with the nearest on-route incidents and
+        per-segment speeds with the slowest segments
+    """
+    return {
+        "timestamp": result.get("timestamp"),
+        "region": result.get("region"),
+        "artifact": handle,
+        "route": _route_summary(result),
+        "incidents": _incident_summary(result.get("traffic_incidents"), result.get("route_incidents")),
+        "traffic_flow": _flow_summary(result.get("traffic_flow")),
+        "errors": result.get("errors") or {},
+        "timings_ms": result.get("timings_ms") or {}
+    }
+
+
+def compact_weather(result: Dict[str, Any], handle: str) -> Dict[str, Any]:
+    """
+    Summary of a WeatherDataTool result.
+
+    Args:
+        result: Full tool result (current conditions, analyzed forecast, optional grid)
+        handle: Artifact handle of the full result
+
+    Returns:
+        Current conditions, alerts, forecast totals and the notable forecast
+        periods (snow, medium/high risk or ice), plus grid hotspots if sampled
+    """
+    forecast = result.get("forecast") or []
+    notable = [
+        f for f in forecast
+        if f.get("has_snow") or f.get("snow_risk") != "low" or f.get("road_condition") != "clear"
+    ]
+    snowy = [f for f in forecast if f.get("has_snow")]
+    summary = {
+        "timestamp": result.get("timestamp"),
+        "region": result.get("region"),
+        "artifact": handle,
+        "current_conditions": result.get("current_conditions"),
+        "alerts": result.get("alerts"),
+        "forecast_summary": {
+            "periods": len(forecast),
+            "window": [forecast[0]["timestamp"], forecast[-1]["timestamp"]] if forecast else [],
+            "total_snow_mm": round(sum(f.get("snow_amount_mm", 0) for f in forecast), 2),
+            "first_snow": snowy[0]["timestamp"] if snowy else None,
+            "high_risk_periods": sum(1 for f in forecast if f.get("snow_risk") == "high"),
+            "min_temperature": min((f["temperature"] for f in forecast), default=None),
+            "min_road_surface_temp": min((f["road_surface_temp"] for f in forecast), default=None),
+            "notable_periods": len(notable)
+        },
+        "notable_forecast": notable[:NOTABLE_FORECAST_PERIODS]
+    }
+    grid = result.get("grid")
+    if grid:
+        summary["grid"] = {
+            key: grid.get(key) for key in ("resolution_km", "shape", "forecast_window", "requests", "errors")
+        }
+        summary["grid"]["hotspots"] = (grid.get("hotspots") or [])[:TOP_INCIDENTS]
+    return summary
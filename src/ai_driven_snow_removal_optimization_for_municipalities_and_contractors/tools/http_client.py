@@ -0,0 +1,291 @@
+"""
+Shared HTTP client layer for the tools package.
+
+All outbound API calls (OpenWeather, TomTom) go through a single process-wide
+connection pool so that sockets are kept alive between calls, every request
+has a timeout, and transient 429/5xx responses are retried with jittered
+exponential backoff.
+
+Settings can be tuned with environment variables or with `configure()`:
+    OLAF_HTTP_CONNECT_TIMEOUT  Connect timeout in seconds (default 3.05)
+    OLAF_HTTP_READ_TIMEOUT     Read timeout in seconds (default 10)
+    OLAF_HTTP_RETRIES          Retries on 429/5xx and connection errors (default 3)
+    OLAF_HTTP_BACKOFF          Backoff factor in seconds (default 0.5)
+    OLAF_HTTP_POOL_MAXSIZE     Keep-alive connections per host (default 10)
+    OLAF_HTTP_FIXTURES         'record' saves every response as a fixture file,
+                               'replay' serves requests from fixtures without network
+    OLAF_HTTP_FIXTURE_DIR      Fixture directory (default .cache/http_fixtures)
+
+With OLAF_TRACE=1 every request made through `get()`/`post()` is recorded as
+an "http" span named by endpoint, with its status and response size.
+
+Fixtures are keyed by method, path, query string (without API keys) and body,
+not by host, so responses recorded against the live APIs or a stand-in server
+(see standin_api.py) replay for any base URL.
+"""
+import hashlib
+import json
+import os
+import random
+import threading
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+from .tracing import endpoint_name, tracer
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+FIXTURE_MODES = ('record', 'replay')
+# Query parameters left out of fixture keys and files
+SECRET_PARAMS = frozenset(('key', 'appid', 'api_key', 'apikey'))
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+@dataclass(frozen=True)
+class HttpClientConfig:
+    """Connection pool, timeout and retry settings for the shared client."""
+    connect_timeout: float = 3.05
+    read_timeout: float = 10.0
+    retries: int = 3
+    backoff_factor: float = 0.5
+    backoff_max: float = 20.0
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    retry_status_codes: Tuple[int, ...] = field(default=RETRY_STATUS_CODES)
+    # None for live traffic, else 'record' or 'replay'
+    fixture_mode: Optional[str] = None
+    fixture_dir: str = str(PROJECT_ROOT / '.cache' / 'http_fixtures')
+
+    def __post_init__(self):
+        if self.fixture_mode not in (None, *FIXTURE_MODES):
+            raise ValueError(f"fixture_mode must be one of {FIXTURE_MODES} or None, got {self.fixture_mode!r}")
+
+    @classmethod
+    def from_env(cls) -> "HttpClientConfig":
+        defaults = cls()
+        return cls(
+            connect_timeout=float(os.getenv('OLAF_HTTP_CONNECT_TIMEOUT', defaults.connect_timeout)),
+            read_timeout=float(os.getenv('OLAF_HTTP_READ_TIMEOUT', defaults.read_timeout)),
+            retries=int(os.getenv('OLAF_HTTP_RETRIES', defaults.retries)),
+            backoff_factor=float(os.getenv('OLAF_HTTP_BACKOFF', defaults.backoff_factor)),
+            pool_maxsize=int(os.getenv('OLAF_HTTP_POOL_MAXSIZE', defaults.pool_maxsize)),
+            fixture_mode=os.getenv('OLAF_HTTP_FIXTURES') or None,
+            fixture_dir=os.getenv('OLAF_HTTP_FIXTURE_DIR') or defaults.fixture_dir,
+        )
+
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        return (self.connect_timeout, self.read_timeout)
+
+
+class JitteredRetry(Retry):
+    """Retry policy using "full jitter" backoff so concurrent pollers don't retry in lockstep."""
+
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        if backoff <= 0:
+            return 0
+        return random.uniform(0, backoff)
+
+
+class FixtureNotFoundError(requests.exceptions.ConnectionError):
+    """Raised in replay mode for a request that has no recorded fixture."""
+
+
+def fixture_key(request: requests.PreparedRequest) -> str:
+    """Stable key for a request: method, path, sorted query without secrets, and body digest."""
+    url = urlsplit(request.url)
+    query = sorted((k, v) for k, v in parse_qsl(url.query, keep_blank_values=True) if k.lower() not in SECRET_PARAMS)
+    body = request.body or b''
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    payload = json.dumps([request.method, url.path, query, hashlib.sha256(body).hexdigest()])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+
+class FixtureAdapter(HTTPAdapter):
+    """
+    Transport adapter that records responses to, or replays them from, JSON fixture files.
+
+    In record mode requests go out through the normal retrying adapter and the
+    final response is saved; in replay mode no connection is made at all.
+    """
+
+    def __init__(self, mode: str, fixture_dir: Union[str, Path], **kwargs):
+        super().__init__(**kwargs)
+        self.mode = mode
+        self.fixture_dir = Path(fixture_dir)
+        self.fixture_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, request: requests.PreparedRequest) -> Path:
+        return self.fixture_dir / f"{fixture_key(request)}.json"
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        path = self._path(request)
+        if self.mode == 'replay':
+            try:
+                fixture = json.loads(path.read_text(encoding='utf-8'))
+            except FileNotFoundError:
+                raise FixtureNotFoundError(
+                    f"No fixture for {request.method} {urlsplit(request.url).path} in {self.fixture_dir}",
+                    request=request
+                ) from None
+            return self._replay(request, fixture)
+
+        response = super().send(request, **kwargs)
+        url = urlsplit(request.url)
+        fixture = {
+            "method": request.method,
+            "path": url.path,
+            "query": [[k, v] for k, v in parse_qsl(url.query, keep_blank_values=True)
+                      if k.lower() not in SECRET_PARAMS],
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() == 'content-type'},
+            "body": response.content.decode('utf-8', errors='replace'),
+        }
+        tmp = path.with_suffix(f'.{threading.get_ident()}.tmp')
+        tmp.write_text(json.dumps(fixture, indent=1), encoding='utf-8')
+        os.replace(tmp, path)
+        return response
+
+    @staticmethod
+    def _replay(request: requests.PreparedRequest, fixture: dict) -> requests.Response:
+        response = requests.Response()
+        response.status_code = fixture['status']
+        response.reason = fixture.get('reason')
+        response.headers = CaseInsensitiveDict(fixture.get('headers') or {})
+        response._content = fixture['body'].encode('utf-8')
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        return response
+
+
+_lock = threading.Lock()
+_config: HttpClientConfig = HttpClientConfig.from_env()
+_adapter: Optional[HTTPAdapter] = None
+_local = threading.local()
+
+
+def _build_adapter(config: HttpClientConfig) -> HTTPAdapter:
+    retry = JitteredRetry(
+        total=config.retries,
+        connect=config.retries,
+        read=config.retries,
+        status=config.retries,
+        backoff_factor=config.backoff_factor,
+        backoff_max=config.backoff_max,
+        status_forcelist=config.retry_status_codes,
+        allowed_methods=frozenset(['GET', 'HEAD', 'OPTIONS']),
+        respect_retry_after_header=True,
+        # Hand the final 429/5xx response back so callers can raise_for_status()
+        raise_on_status=False,
+    )
+    kwargs = dict(
+        pool_connections=config.pool_connections,
+        pool_maxsize=config.pool_maxsize,
+        max_retries=retry,
+    )
+    if config.fixture_mode:
+        return FixtureAdapter(config.fixture_mode, config.fixture_dir, **kwargs)
+    return HTTPAdapter(**kwargs)
+
+
+def _get_adapter() -> HTTPAdapter:
+    global _adapter
+    if _adapter is None:
+        with _lock:
+            if _adapter is None:
+                _adapter = _build_adapter(_config)
+    return _adapter
+
+
+def configure(**overrides) -> HttpClientConfig:
+    """
+    Replace the shared client settings.
+
+    Args:
+        **overrides: Any HttpClientConfig field (e.g. read_timeout=5, retries=0,
+            fixture_mode='replay')
+
+    Returns:
+        The configuration now in effect
+    """
+    global _config, _adapter
+    with _lock:
+        old_adapter = _adapter
+        _config = replace(_config, **overrides)
+        _adapter = None
+    if old_adapter is not None:
+        old_adapter.close()
+    return _config
+
+
+def get_config() -> HttpClientConfig:
+    return _config
+
+
+def get_session() -> requests.Session:
+    """
+    Return this thread's session, wired to the process-wide connection pool.
+
+    Sessions are kept per thread (requests.Session is not guaranteed to be
+    thread-safe) but they all mount the same adapter, so keep-alive
+    connections are shared between threads.
+    """
+    adapter = _get_adapter()
+    session = getattr(_local, 'session', None)
+    if session is None or getattr(_local, 'adapter', None) is not adapter:
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        _local.session = session
+        _local.adapter = adapter
+    return session
+
+
+def _request(method: str, url: str, timeout: Optional[Timeout] = None, **kwargs) -> requests.Response:
+    """Send a request through this thread's session, as a span when tracing (retries included)."""
+    if not tracer.enabled:
+        return get_session().request(method, url, timeout=timeout or _config.timeout, **kwargs)
+    with tracer.span(endpoint_name(url), 'http', method=method) as span:
+        response = get_session().request(method, url, timeout=timeout or _config.timeout, **kwargs)
+        span['status'] = response.status_code
+        span['output_bytes'] = len(response.content)
+        return response
+
+
+def get(url: str, params: Optional[dict] = None, timeout: Optional[Timeout] = None, **kwargs) -> requests.Response:
+    """
+    Issue a GET request through the shared pool.
+
+    Args:
+        url: Absolute URL to request
+        params: Query string parameters
+        timeout: Seconds (or a (connect, read) tuple); defaults to the configured timeouts
+
+    Returns:
+        The requests.Response (not yet checked with raise_for_status)
+    """
+    return _request('GET', url, params=params, timeout=timeout, **kwargs)
+
+
+def post(url: str, json: Optional[dict] = None, params: Optional[dict] = None,
+         timeout: Optional[Timeout] = None, **kwargs) -> requests.Response:
+    """
+    Issue a POST request through the shared pool.
+
+    POST is not retried on 5xx (it is not in the retry policy's allowed methods);
+    connection errors raised before the request is sent are still retried.
+    """
+    return _request('POST', url, json=json, params=params, timeout=timeout, **kwargs)
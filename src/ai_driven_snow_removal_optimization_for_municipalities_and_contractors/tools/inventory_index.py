@@ -0,0 +1,111 @@
+"""
+In-memory inverted index over inventory records.
+
+The index keeps the matching semantics of the original LocalInventoryTool
+search (every query term must appear as a substring of the item's JSON
+text) but answers queries from precomputed postings instead of re-scanning
+every item. Indexes are built and cached by InventoryStore.
+
+Query terms never contain whitespace, so a term matches an item's JSON text
+exactly when it is a substring of one of that text's whitespace-separated
+tokens. The index therefore maps each distinct token to the items containing
+it and resolves a term by scanning the (much smaller) token vocabulary once,
+memoizing the result.
+"""
+import json
+import threading
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+
+def _quantity_fields(item: dict) -> Tuple[Optional[str], Optional[str]]:
+    quantity = next((k for k in item if k.startswith('current_quantity')), None)
+    threshold = 'minimum_threshold' if 'minimum_threshold' in item else None
+    return quantity, threshold
+
+
+class InventoryIndex:
+    """Pre-tokenized inventory records with postings and typed field indexes."""
+
+    def __init__(self, items: List[dict], metadata: Optional[dict] = None):
+        self.items = items
+        self.metadata = metadata or {}
+        self._postings: Dict[str, set] = {}
+        self._by_location: Dict[str, set] = {}
+        self._by_type: Dict[str, set] = {}
+        self._below_threshold: set = set()
+        self._term_cache: Dict[str, FrozenSet[int]] = {}
+        self._term_lock = threading.Lock()
+
+        for i, item in enumerate(items):
+            for token in set(json.dumps(item).lower().split()):
+                self._postings.setdefault(token, set()).add(i)
+            location = str(item.get('storage_location', '')).lower()
+            self._by_location.setdefault(location, set()).add(i)
+            item_type = str(item.get('type', '')).lower()
+            self._by_type.setdefault(item_type, set()).add(i)
+            quantity, threshold = _quantity_fields(item)
+            if quantity and threshold and item[quantity] < item[threshold]:
+                self._below_threshold.add(i)
+
+    def _match_term(self, term: str) -> FrozenSet[int]:
+        matches = self._term_cache.get(term)
+        if matches is None:
+            found = set()
+            for token, ids in self._postings.items():
+                if term in token:
+                    found |= ids
+            matches = frozenset(found)
+            with self._term_lock:
+                self._term_cache[term] = matches
+        return matches
+
+    @staticmethod
+    def _match_field(index: Dict[str, set], value: str) -> set:
+        """Exact (case-insensitive) match, falling back to substring match on the field value."""
+        value = value.lower().strip()
+        if value in index:
+            return index[value]
+        found = set()
+        for key, ids in index.items():
+            if value in key:
+                found |= ids
+        return found
+
+    def search(
+        self,
+        search_query: str = "",
+        location: Optional[str] = None,
+        item_type: Optional[str] = None,
+        below_threshold: bool = False
+    ) -> List[dict]:
+        """
+        Return the items matching every query term and every given filter.
+
+        Args:
+            search_query: Whitespace-separated terms, each matched as a substring
+            location: Storage location filter (e.g. "East Depot")
+            item_type: Item type filter (e.g. "diesel", "rock_salt")
+            below_threshold: Only items whose current quantity is below their minimum threshold
+
+        Returns:
+            Matching items in file order
+        """
+        constraints = []
+        if location:
+            constraints.append(self._match_field(self._by_location, location))
+        if item_type:
+            constraints.append(self._match_field(self._by_type, item_type))
+        if below_threshold:
+            constraints.append(self._below_threshold)
+        constraints.extend(self._match_term(term) for term in search_query.lower().split())
+        if not constraints:
+            return list(self.items)
+
+        # Intersect from the most selective set down
+        constraints.sort(key=len)
+        candidates = set(constraints[0])
+        for ids in constraints[1:]:
+            if not candidates:
+                break
+            candidates &= ids
+        return [self.items[i] for i in sorted(candidates)]
@@ -0,0 +1,367 @@
+"""
+SQLite storage engine for salt and fuel inventory.
+
+Replaces the hand-edited fuel_inv.json / salt_inv.json files as the source of
+truth behind LocalInventoryTool:
+- depots, materials and items live in indexed tables
+- consumption is applied in a transaction and logged
+- totals are computed by aggregate queries instead of stored metadata
+- the existing JSON files are imported on first use (or explicitly with
+  `python -m ai_driven_snow_removal_optimization_for_municipalities_and_contractors.tools.inventory_store import <file>...`)
+
+Every write bumps a revision counter, which readers use to invalidate their
+cached search index.
+"""
+import json
+import os
+import sqlite3
+import sys
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from .inventory_index import InventoryIndex
+
+PACKAGE_DIR = Path(__file__).resolve().parent.parent
+
+# Inventory category -> (JSON file, top-level key, quantity unit, price unit)
+CATEGORIES: Dict[str, Tuple[str, str, str, str]] = {
+    'fuel': ('fuel_inv.json', 'fuel_inventory', 'liters', 'liter'),
+    'salt': ('salt_inv.json', 'salt_inventory', 'tons', 'ton'),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS depots (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS materials (
+    id INTEGER PRIMARY KEY,
+    category TEXT NOT NULL,
+    type TEXT NOT NULL,
+    unit TEXT NOT NULL,
+    UNIQUE (category, type)
+);
+CREATE TABLE IF NOT EXISTS items (
+    id TEXT PRIMARY KEY,
+    material_id INTEGER NOT NULL REFERENCES materials(id),
+    depot_id INTEGER NOT NULL REFERENCES depots(id),
+    current_quantity NUMERIC NOT NULL CHECK (current_quantity >= 0),
+    max_capacity NUMERIC,
+    minimum_threshold NUMERIC,
+    unit_price NUMERIC,
+    supplier TEXT,
+    last_refill_date TEXT,
+    last_updated TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_items_material ON items(material_id);
+CREATE INDEX IF NOT EXISTS idx_items_depot ON items(depot_id);
+CREATE TABLE IF NOT EXISTS consumption_log (
+    id INTEGER PRIMARY KEY,
+    item_id TEXT NOT NULL REFERENCES items(id),
+    quantity NUMERIC NOT NULL,
+    consumed_at TEXT NOT NULL,
+    note TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_consumption_item ON consumption_log(item_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('revision', '0');
+"""
+
+
+class InsufficientInventoryError(ValueError):
+    """Raised when a consumption would take an item below zero."""
+
+
+class InventoryStore:
+    """SQLite-backed inventory with per-thread connections and a revision-keyed search index cache."""
+
+    def __init__(self, db_path: Union[str, Path], seed_dir: Optional[Union[str, Path]] = PACKAGE_DIR):
+        self.db_path = Path(db_path)
+        self._local = threading.local()
+        self._index_cache: Dict[str, Tuple[int, InventoryIndex]] = {}
+        self._lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connection()
+        conn.executescript(SCHEMA)
+        conn.commit()
+        if seed_dir:
+            self._seed(Path(seed_dir))
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    def _seed(self, seed_dir: Path) -> None:
+        """Import the bundled JSON files for categories that have no items yet."""
+        for category, (filename, _, _, _) in CATEGORIES.items():
+            json_file = seed_dir / filename
+            if json_file.exists() and not self._count(category):
+                self.import_json(json_file)
+
+    def _count(self, category: str) -> int:
+        row = self._connection().execute(
+            "SELECT COUNT(*) FROM items JOIN materials m ON m.id = items.material_id WHERE m.category = ?",
+            (category,)
+        ).fetchone()
+        return row[0]
+
+    def _transaction(self) -> sqlite3.Connection:
+        conn = self._connection()
+        # Take the write lock up front so concurrent crews serialize cleanly
+        conn.execute("BEGIN IMMEDIATE")
+        return conn
+
+    @staticmethod
+    def _bump_revision(conn: sqlite3.Connection) -> None:
+        conn.execute("UPDATE meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'revision'")
+
+    def revision(self) -> int:
+        row = self._connection().execute("SELECT value FROM meta WHERE key = 'revision'").fetchone()
+        return int(row[0])
+
+    def import_json(self, json_file: Union[str, Path]) -> int:
+        """
+        Import (upsert) every item of a fuel_inv.json / salt_inv.json style file.
+
+        Args:
+            json_file: Path to the inventory JSON file
+
+        Returns:
+            Number of items imported
+        """
+        with open(json_file, 'r') as f:
+            data = json.load(f)
+        for category, (_, key, unit, price_unit) in CATEGORIES.items():
+            if key in data:
+                break
+        else:
+            raise ValueError(f"No known inventory key in {json_file}; expected one of "
+                             f"{[c[1] for c in CATEGORIES.values()]}")
+
+        conn = self._transaction()
+        try:
+            for item in data[key]:
+                conn.execute("INSERT OR IGNORE INTO depots (name) VALUES (?)", (item['storage_location'],))
+                conn.execute(
+                    "INSERT OR IGNORE INTO materials (category, type, unit) VALUES (?, ?, ?)",
+                    (category, item['type'], unit)
+                )
+                conn.execute(
+                    """
+                    INSERT INTO items (
+                        id, material_id, depot_id, current_quantity, max_capacity, minimum_threshold,
+                        unit_price, supplier, last_refill_date, last_updated
+                    ) VALUES (
+                        ?,
+                        (SELECT id FROM materials WHERE category = ? AND type = ?),
+                        (SELECT id FROM depots WHERE name = ?),
+                        ?, ?, ?, ?, ?, ?, ?
+                    )
+                    ON CONFLICT (id) DO UPDATE SET
+                        material_id = excluded.material_id,
+                        depot_id = excluded.depot_id,
+                        current_quantity = excluded.current_quantity,
+                        max_capacity = excluded.max_capacity,
+                        minimum_threshold = excluded.minimum_threshold,
+                        unit_price = excluded.unit_price,
+                        supplier = excluded.supplier,
+                        last_refill_date = excluded.last_refill_date,
+                        last_updated = excluded.last_updated
+                    """,
+                    (
+                        item['id'], category, item['type'], item['storage_location'],
+                        item[f'current_quantity_{unit}'], item.get(f'max_capacity_{unit}'),
+                        item.get('minimum_threshold'), item.get(f'price_per_{price_unit}'),
+                        item.get('supplier'), item.get('last_refill_date'), item.get('last_updated')
+                    )
+                )
+            currency = data.get('metadata', {}).get('currency')
+            if currency:
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (f'currency_{category}', currency))
+            self._bump_revision(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return len(data[key])
+
+    def consume(self, item_id: str, quantity: float, note: Optional[str] = None) -> float:
+        """
+        Atomically subtract `quantity` from an item and log the consumption.
+
+        Args:
+            item_id: Item identifier (e.g. 'SALT-001')
+            quantity: Amount to consume, in the item's unit
+            note: Optional free-text reason (route, vehicle, ...)
+
+        Returns:
+            The item's remaining quantity
+
+        Raises:
+            KeyError: If the item does not exist
+            InsufficientInventoryError: If the item holds less than `quantity`
+        """
+        if quantity <= 0:
+            raise ValueError("Consumed quantity must be positive")
+        now = datetime.now().isoformat(timespec='seconds')
+        conn = self._transaction()
+        try:
+            row = conn.execute("SELECT current_quantity FROM items WHERE id = ?", (item_id,)).fetchone()
+            if row is None:
+                raise KeyError(f"Unknown inventory item: {item_id}")
+            if row[0] < quantity:
+                raise InsufficientInventoryError(
+                    f"Cannot consume {quantity} from {item_id}: only {row[0]} available"
+                )
+            conn.execute(
+                "UPDATE items SET current_quantity = current_quantity - ?, last_updated = ? WHERE id = ?",
+                (quantity, now, item_id)
+            )
+            conn.execute(
+                "INSERT INTO consumption_log (item_id, quantity, consumed_at, note) VALUES (?, ?, ?, ?)",
+                (item_id, quantity, now, note)
+            )
+            self._bump_revision(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return row[0] - quantity
+
+    def items(self, category: str) -> List[dict]:
+        """Items of a category, shaped like the entries of the original JSON files."""
+        _, _, unit, price_unit = CATEGORIES[category]
+        rows = self._connection().execute(
+            """
+            SELECT i.*, m.type, d.name AS storage_location
+            FROM items i
+            JOIN materials m ON m.id = i.material_id
+            JOIN depots d ON d.id = i.depot_id
+            WHERE m.category = ?
+            ORDER BY i.id
+            """,
+            (category,)
+        ).fetchall()
+        return [
+            {
+                "id": row['id'],
+                "type": row['type'],
+                f"current_quantity_{unit}": row['current_quantity'],
+                f"max_capacity_{unit}": row['max_capacity'],
+                "storage_location": row['storage_location'],
+                "last_refill_date": row['last_refill_date'],
+                "last_updated": row['last_updated'],
+                "minimum_threshold": row['minimum_threshold'],
+                f"price_per_{price_unit}": row['unit_price'],
+                "supplier": row['supplier'],
+            }
+            for row in rows
+        ]
+
+    def totals(self, category: str) -> dict:
+        """Aggregate metadata for a category, computed from the item rows."""
+        conn = self._connection()
+        metadata = {}
+        last_updated = None
+        for row in conn.execute(
+            """
+            SELECT m.type, SUM(i.current_quantity) AS total, MAX(i.last_updated) AS last_updated
+            FROM items i JOIN materials m ON m.id = i.material_id
+            WHERE m.category = ?
+            GROUP BY m.type
+            ORDER BY m.type
+            """,
+            (category,)
+        ):
+            metadata[f"total_{row['type']}_available"] = row['total']
+            last_updated = max(filter(None, [last_updated, row['last_updated']]), default=None)
+        currency = conn.execute("SELECT value FROM meta WHERE key = ?", (f'currency_{category}',)).fetchone()
+        return {
+            "last_updated": last_updated,
+            **metadata,
+            "currency": currency[0] if currency else None,
+        }
+
+    def usage(self, category: str, days: float = 7.0) -> Dict[str, float]:
+        """Quantity consumed per material type over the last `days` days, from the consumption log."""
+        since = (datetime.now() - timedelta(days=days)).isoformat(timespec='seconds')
+        return {
+            row['type']: row['total']
+            for row in self._connection().execute(
+                """
+                SELECT m.type, SUM(c.quantity) AS total
+                FROM consumption_log c
+                JOIN items i ON i.id = c.item_id
+                JOIN materials m ON m.id = i.material_id
+                WHERE m.category = ? AND c.consumed_at >= ?
+                GROUP BY m.type
+                ORDER BY m.type
+                """,
+                (category, since)
+            )
+        }
+
+    def depot_stock(self) -> Dict[str, Dict[str, float]]:
+        """Salt (tons) and fuel (liters) on hand per depot, e.g. {'Main Depot': {'salt': 250, 'fuel': 5000}}."""
+        stock: Dict[str, Dict[str, float]] = {}
+        for row in self._connection().execute(
+            """
+            SELECT d.name, m.category, SUM(i.current_quantity) AS total
+            FROM items i
+            JOIN materials m ON m.id = i.material_id
+            JOIN depots d ON d.id = i.depot_id
+            GROUP BY d.name, m.category
+            ORDER BY d.name
+            """
+        ):
+            stock.setdefault(row['name'], {})[row['category']] = row['total']
+        return stock
+
+    def index(self, category: str) -> InventoryIndex:
+        """Search index for a category, rebuilt only when the store's revision changes."""
+        revision = self.revision()
+        cached = self._index_cache.get(category)
+        if cached is not None and cached[0] == revision:
+            return cached[1]
+        index = InventoryIndex(self.items(category), self.totals(category))
+        with self._lock:
+            self._index_cache[category] = (revision, index)
+        return index
+
+
+_stores: Dict[Path, InventoryStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(db_path: Optional[Union[str, Path]] = None) -> InventoryStore:
+    """
+    Return the process-wide store for `db_path`.
+
+    Defaults to OLAF_INVENTORY_DB, or inventory.sqlite3 next to the JSON files.
+    """
+    path = Path(db_path or os.getenv('OLAF_INVENTORY_DB') or PACKAGE_DIR / 'inventory.sqlite3').resolve()
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = InventoryStore(path)
+        return _stores[path]
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 3 or sys.argv[1] != 'import':
+        print("Usage: inventory_store.py import <inventory.json> [<inventory.json> ...]")
+        sys.exit(1)
+    store = get_store()
+    for json_file in sys.argv[2:]:
+        count = store.import_json(json_file)
+        print(f"Imported {count} item(s) from {json_file} into {store.db_path}")
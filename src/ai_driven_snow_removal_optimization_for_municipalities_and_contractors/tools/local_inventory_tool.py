@@ -2,8 +2,8 @@ from crewai.tools import BaseTool
 from typing import Type
 from pydantic import BaseModel, Field
 import json
-import os
 from typing import Optional
+from .inventory_store import CATEGORIES, get_store
 
 
 class LocalInventoryToolInput(BaseModel):
@@ -16,6 +16,18 @@ class LocalInventoryToolInput(BaseModel):
         ...,
         description="Mandatory json path you want to search"
     )
+    location: Optional[str] = Field(
+        default=None,
+        description="Optional storage location filter (e.g. 'Main Depot', 'East Depot')"
+    )
+    item_type: Optional[str] = Field(
+        default=None,
+        description="Optional item type filter (e.g. 'diesel', 'gasoline', 'rock_salt', 'treated_salt')"
+    )
+    below_threshold: bool = Field(
+        default=False,
+        description="Only return items whose current quantity is below their minimum threshold"
+    )
 
 
 class LocalInventoryTool(BaseTool):
@@ -23,38 +35,27 @@ class LocalInventoryTool(BaseTool):
     description: str = "A tool that can be used to semantic search a query from a JSON's content."
     args_schema: Type[BaseModel] = LocalInventoryToolInput
 
-    def _read_inventory_file(self, file_path: str) -> Optional[dict]:
-        """
-        Helper method to read and parse a JSON inventory file.
-        
-        Args:
-            file_path: Path to the inventory JSON file
-            
-        Returns:
-            Dict containing the inventory data or None if file cannot be read
-        """
-        try:
-            if os.path.exists(file_path):
-                with open(file_path, 'r') as f:
-                    return json.load(f)
-            return None
-        except Exception as e:
-            print(f"Error reading inventory file {file_path}: {str(e)}")
-            return None
-
-    def _run(self, search_query: str, json_path: str) -> str:
+    def _run(
+        self,
+        search_query: str,
+        json_path: str,
+        location: Optional[str] = None,
+        item_type: Optional[str] = None,
+        below_threshold: bool = False
+    ) -> str:
         """
         Search local inventory files based on the query.
         
         Args:
             search_query: The search query to filter inventory data
             json_path: The path to the JSON file to search ('fuel_inv.json' or 'salt_inv.json')
+            location: Optional storage location filter
+            item_type: Optional item type filter
+            below_threshold: Only return items below their minimum threshold
             
         Returns:
             String containing matching inventory information
         """
-        base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        
         if not json_path.endswith('.json'):
             json_path += '.json'
             
@@ -64,33 +65,33 @@ class LocalInventoryTool(BaseTool):
                 "message": "Invalid JSON path. Use 'fuel_inv.json' or 'salt_inv.json'"
             })
             
-        file_path = os.path.join(base_path, json_path)
-        data = self._read_inventory_file(file_path)
+        # Determine which inventory type we're dealing with
+        category = next(c for c, (filename, _, _, _) in CATEGORIES.items() if filename == json_path)
         
-        if not data:
+        try:
+            # Backed by the SQLite inventory store; the search index is cached
+            # until the next inventory write
+            index = get_store().index(category)
+        except Exception as e:
+            print(f"Error reading inventory store for {json_path}: {str(e)}")
             return json.dumps({
                 "status": "error",
                 "message": f"Could not read inventory file: {json_path}"
             })
-            
-        # Determine which inventory type we're dealing with
-        inventory_key = 'fuel_inventory' if 'fuel' in json_path else 'salt_inventory'
-        
-        # Basic semantic search - look for matches in various fields
-        search_terms = search_query.lower().split()
-        matching_items = []
         
-        for item in data[inventory_key]:
-            item_str = json.dumps(item).lower()
-            if all(term in item_str for term in search_terms):
-                matching_items.append(item)
+        matching_items = index.search(
+            search_query,
+            location=location,
+            item_type=item_type,
+            below_threshold=below_threshold
+        )
         
         if matching_items:
             return json.dumps({
                 "status": "success",
                 "source": "local",
                 "data": matching_items,
-                "metadata": data['metadata']
+                "metadata": index.metadata
             }, indent=2)
         
         return json.dumps({
@@ -0,0 +1,90 @@
+"""
+Per-process tool registry.
+
+Agents and tasks ask the registry for a tool class instead of constructing
+it themselves. Each tool is built lazily on first request, shared by every
+agent and task afterwards, and its construction time is recorded. Every
+instance is instrumented so its `_run` calls show up as spans when tracing
+is on (see tracing.py).
+"""
+import threading
+import time
+from typing import Dict, Hashable, Tuple, Type, TypeVar
+
+from crewai.tools import BaseTool
+
+from .tracing import instrument_tool
+
+ToolT = TypeVar('ToolT', bound=BaseTool)
+
+
+class ToolRegistry:
+    """Lazily constructs and shares one instance per tool class (and constructor arguments)."""
+
+    def __init__(self):
+        self._tools: Dict[Hashable, BaseTool] = {}
+        self._construction_ms: Dict[str, float] = {}
+        self._requests: Dict[str, int] = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _key(tool_cls: type, kwargs: dict) -> Tuple:
+        return (tool_cls, tuple(sorted(kwargs.items())))
+
+    @staticmethod
+    def _label(tool_cls: type, kwargs: dict) -> str:
+        if not kwargs:
+            return tool_cls.__name__
+        args = ', '.join(f"{k}={v!r}" for k, v in sorted(kwargs.items()))
+        return f"{tool_cls.__name__}({args})"
+
+    def get(self, tool_cls: Type[ToolT], **kwargs) -> ToolT:
+        """
+        Return the shared instance of `tool_cls`, constructing it on first use.
+
+        Args:
+            tool_cls: Tool class to instantiate
+            **kwargs: Constructor arguments; must be hashable, each distinct set gets its own instance
+
+        Returns:
+            The shared tool instance
+        """
+        key = self._key(tool_cls, kwargs)
+        label = self._label(tool_cls, kwargs)
+        with self._lock:
+            self._requests[label] = self._requests.get(label, 0) + 1
+            tool = self._tools.get(key)
+            if tool is None:
+                started = time.perf_counter()
+                tool = instrument_tool(tool_cls(**kwargs))
+                self._construction_ms[label] = round((time.perf_counter() - started) * 1000, 1)
+                self._tools[key] = tool
+            return tool
+
+    def stats(self) -> Dict[str, dict]:
+        """Construction time and number of requests per registered tool."""
+        with self._lock:
+            return {
+                label: {
+                    "construction_ms": self._construction_ms[label],
+                    "requests": self._requests[label],
+                }
+                for label in self._construction_ms
+            }
+
+    def summary(self) -> str:
+        stats = self.stats()
+        total_ms = sum(s["construction_ms"] for s in stats.values())
+        requests = sum(s["requests"] for s in stats.values())
+        details = ', '.join(f"{label} {s['construction_ms']:.0f}ms" for label, s in stats.items())
+        return f"{len(stats)} tool instance(s) for {requests} reference(s), built in {total_ms:.0f}ms: {details}"
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tools.clear()
+            self._construction_ms.clear()
+            self._requests.clear()
+
+
+# Shared by every crew created in this process
+tool_registry = ToolRegistry()
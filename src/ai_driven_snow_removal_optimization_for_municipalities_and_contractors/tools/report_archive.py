@@ -0,0 +1,445 @@
+"""
+Indexed archive for generated HTML reports.
+
+Reports stay in the reports/ directory, indexed by a SQLite manifest
+(reports/manifest.sqlite3) that records region, time, size and content hash:
+
+- the latest report per region is kept in a `latest` table, so "latest
+  report for Montreal" is a single keyed lookup;
+- time-range queries use the (region, created_at) index;
+- reports built from identical input share one stored file;
+- files not used for `compress_after` seconds are gzipped in place, except
+  each region's latest report, which stays directly viewable;
+- a retention policy drops old reports but always keeps each region's latest.
+
+Usage:
+    python -m ai_driven_snow_removal_optimization_for_municipalities_and_contractors.tools.report_archive latest <region>
+    python -m ai_driven_snow_removal_optimization_for_municipalities_and_contractors.tools.report_archive list [<region>]
+    python -m ai_driven_snow_removal_optimization_for_municipalities_and_contractors.tools.report_archive maintain
+    python -m ai_driven_snow_removal_optimization_for_municipalities_and_contractors.tools.report_archive scan
+"""
+import gzip
+import hashlib
+import os
+import re
+import shutil
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+REPORTS_DIR = Path(__file__).parent.parent.parent.parent / 'reports'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    content_hash TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL,
+    compressed INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    last_used_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY,
+    region TEXT NOT NULL,
+    title TEXT,
+    created_at REAL NOT NULL,
+    content_hash TEXT NOT NULL REFERENCES blobs(content_hash)
+);
+CREATE INDEX IF NOT EXISTS reports_region_time ON reports(region, created_at);
+CREATE INDEX IF NOT EXISTS reports_hash ON reports(content_hash);
+CREATE TABLE IF NOT EXISTS latest (
+    region TEXT PRIMARY KEY,
+    report_id INTEGER NOT NULL REFERENCES reports(id)
+);
+"""
+
+ENTRY_COLUMNS = (
+    "r.id, r.region, r.title, r.created_at, r.content_hash, "
+    "b.path, b.size, b.stored_size, b.compressed"
+)
+
+LEGACY_NAME = re.compile(r'snow_removal_report_(?:.*_)?(\d{8}_\d{6})\.html$')
+
+
+@dataclass
+class ArchiveEntry:
+    """One manifest row: a report and the stored file holding its HTML."""
+    id: int
+    region: str
+    title: Optional[str]
+    created_at: float
+    content_hash: str
+    path: Path
+    size: int
+    stored_size: int
+    compressed: bool
+    deduplicated: bool = False
+
+    def read_text(self) -> str:
+        """The report HTML, decompressing if needed."""
+        if self.compressed:
+            with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+                return f.read()
+        return self.path.read_text(encoding='utf-8')
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "region": self.region,
+            "title": self.title,
+            "created_at": datetime.fromtimestamp(self.created_at).isoformat(timespec='seconds'),
+            "path": str(self.path),
+            "size": self.size,
+            "stored_size": self.stored_size,
+            "compressed": self.compressed,
+            "content_hash": self.content_hash,
+        }
+
+
+def _slug(text: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-') or 'report'
+
+
+class ReportArchive:
+    """
+    Manifest-indexed report directory.
+
+    `maintain_if_due()` runs retention and compression at most once per
+    MAINTAIN_INTERVAL seconds, so report generation can call it on every render.
+
+    Args:
+        root: Directory holding the reports and manifest.sqlite3
+        compress_after: Seconds a stored file goes unused before it is gzipped
+        retention: Seconds a report is kept (each region's latest report is always kept)
+        keep_per_region: Upper bound on reports kept per region
+    """
+
+    MAINTAIN_INTERVAL = 3600.0
+
+    def __init__(self, root: Union[str, Path], compress_after: float = 24 * 3600,
+                 retention: float = 30 * 24 * 3600, keep_per_region: int = 500):
+        self.root = Path(root)
+        self.compress_after = compress_after
+        self.retention = retention
+        self.keep_per_region = keep_per_region
+        self.db_path = self.root / 'manifest.sqlite3'
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._last_maintained = 0.0
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    def _entry(self, row: sqlite3.Row, deduplicated: bool = False) -> ArchiveEntry:
+        return ArchiveEntry(
+            id=row['id'],
+            region=row['region'],
+            title=row['title'],
+            created_at=row['created_at'],
+            content_hash=row['content_hash'],
+            path=self.root / row['path'],
+            size=row['size'],
+            stored_size=row['stored_size'],
+            compressed=bool(row['compressed']),
+            deduplicated=deduplicated
+        )
+
+    def get(self, report_id: int) -> Optional[ArchiveEntry]:
+        row = self._connection().execute(
+            f"SELECT {ENTRY_COLUMNS} FROM reports r JOIN blobs b USING (content_hash) WHERE r.id = ?",
+            (report_id,)
+        ).fetchone()
+        return self._entry(row) if row else None
+
+    def add(
+        self,
+        region: str,
+        content_hash: str,
+        write: Callable[[Path], object],
+        title: Optional[str] = None,
+        created_at: Optional[float] = None
+    ) -> ArchiveEntry:
+        """
+        Record a report, writing its file only if no stored report has the same content hash.
+
+        Args:
+            region: Region the report covers
+            content_hash: Hash of everything the report HTML is derived from
+            write: Called with the destination path when the HTML must be written
+            title: Report title
+            created_at: Report time (epoch seconds); defaults to now
+
+        Returns:
+            The new manifest entry; `deduplicated` is True if an existing file was reused
+        """
+        created_at = time.time() if created_at is None else created_at
+        conn = self._connection()
+        blob = conn.execute("SELECT path, compressed FROM blobs WHERE content_hash = ?", (content_hash,)).fetchone()
+        deduplicated = blob is not None and (self.root / blob['path']).exists()
+        if deduplicated and blob['compressed']:
+            # The reused file becomes the latest report, which is kept as plain HTML
+            self._decompress(conn, content_hash, self.root / blob['path'])
+        if not deduplicated:
+            stamp = datetime.fromtimestamp(created_at).strftime('%Y%m%d_%H%M%S')
+            name = f"snow_removal_report_{_slug(region)}_{stamp}_{content_hash[:8]}.html"
+            path = self.root / name
+            try:
+                write(path)
+            except BaseException:
+                path.unlink(missing_ok=True)
+                raise
+            size = path.stat().st_size
+        with self._lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if deduplicated:
+                    conn.execute("UPDATE blobs SET last_used_at = ? WHERE content_hash = ?",
+                                 (created_at, content_hash))
+                else:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO blobs"
+                        " (content_hash, path, size, stored_size, compressed, created_at, last_used_at)"
+                        " VALUES (?, ?, ?, ?, 0, ?, ?)",
+                        (content_hash, name, size, size, created_at, created_at)
+                    )
+                report_id = conn.execute(
+                    "INSERT INTO reports (region, title, created_at, content_hash) VALUES (?, ?, ?, ?)",
+                    (region, title, created_at, content_hash)
+                ).lastrowid
+                current = self._latest_time(conn, region)
+                if current is None or created_at >= current:
+                    conn.execute("INSERT OR REPLACE INTO latest (region, report_id) VALUES (?, ?)",
+                                 (region, report_id))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return self._entry(conn.execute(
+            f"SELECT {ENTRY_COLUMNS} FROM reports r JOIN blobs b USING (content_hash) WHERE r.id = ?",
+            (report_id,)
+        ).fetchone(), deduplicated=deduplicated)
+
+    @staticmethod
+    def _latest_time(conn: sqlite3.Connection, region: str) -> Optional[float]:
+        row = conn.execute(
+            "SELECT r.created_at FROM latest l JOIN reports r ON r.id = l.report_id WHERE l.region = ?",
+            (region,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def latest(self, region: str) -> Optional[ArchiveEntry]:
+        """Most recent report for `region`: one primary-key lookup, independent of archive size."""
+        row = self._connection().execute(
+            f"SELECT {ENTRY_COLUMNS} FROM latest l JOIN reports r ON r.id = l.report_id"
+            " JOIN blobs b USING (content_hash) WHERE l.region = ?",
+            (region,)
+        ).fetchone()
+        return self._entry(row) if row else None
+
+    def between(self, region: str, start: Optional[float] = None, end: Optional[float] = None) -> List[ArchiveEntry]:
+        """Reports for `region` with start <= created_at < end, oldest first (index range scan)."""
+        rows = self._connection().execute(
+            f"SELECT {ENTRY_COLUMNS} FROM reports r JOIN blobs b USING (content_hash)"
+            " WHERE r.region = ? AND r.created_at >= ? AND r.created_at < ? ORDER BY r.created_at",
+            (region, start if start is not None else float('-inf'), end if end is not None else float('inf'))
+        ).fetchall()
+        return [self._entry(row) for row in rows]
+
+    def regions(self) -> List[str]:
+        return [row[0] for row in self._connection().execute("SELECT region FROM latest ORDER BY region")]
+
+    def _decompress(self, conn: sqlite3.Connection, content_hash: str, source: Path) -> None:
+        target = source.with_name(source.name[:-len('.gz')])
+        with gzip.open(source, 'rb') as src, open(target, 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        with self._lock:
+            conn.execute(
+                "UPDATE blobs SET path = ?, stored_size = size, compressed = 0 WHERE content_hash = ?",
+                (target.name, content_hash)
+            )
+        source.unlink()
+
+    def compress(self, now: Optional[float] = None) -> int:
+        """
+        Gzip stored files that have not been used for `compress_after` seconds.
+
+        Files holding a region's latest report are left uncompressed, as `prune`
+        leaves them in place.
+
+        Returns:
+            Number of files compressed
+        """
+        cutoff = (time.time() if now is None else now) - self.compress_after
+        conn = self._connection()
+        rows = conn.execute(
+            "SELECT content_hash, path FROM blobs WHERE compressed = 0 AND last_used_at < ?"
+            " AND content_hash NOT IN ("
+            "  SELECT r.content_hash FROM latest l JOIN reports r ON r.id = l.report_id)",
+            (cutoff,)
+        ).fetchall()
+        compressed = 0
+        for row in rows:
+            source = self.root / row['path']
+            if not source.exists():
+                continue
+            target = source.with_name(source.name + '.gz')
+            with open(source, 'rb') as src, gzip.open(target, 'wb', compresslevel=6) as dst:
+                shutil.copyfileobj(src, dst)
+            conn.execute(
+                "UPDATE blobs SET path = ?, stored_size = ?, compressed = 1 WHERE content_hash = ?",
+                (target.name, target.stat().st_size, row['content_hash'])
+            )
+            source.unlink()
+            compressed += 1
+        return compressed
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """
+        Apply the retention policy and delete files no report refers to any more.
+
+        Reports older than `retention`, or beyond the newest `keep_per_region` of
+        their region, are dropped; each region's latest report is always kept.
+
+        Returns:
+            Number of reports removed
+        """
+        cutoff = (time.time() if now is None else now) - self.retention
+        conn = self._connection()
+        with self._lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                removed = conn.execute(
+                    "DELETE FROM reports WHERE id NOT IN (SELECT report_id FROM latest) AND ("
+                    " created_at < ? OR id IN ("
+                    "  SELECT id FROM (SELECT id, ROW_NUMBER() OVER ("
+                    "   PARTITION BY region ORDER BY created_at DESC) AS rank FROM reports)"
+                    "  WHERE rank > ?))",
+                    (cutoff, self.keep_per_region)
+                ).rowcount
+                orphans = conn.execute(
+                    "SELECT content_hash, path FROM blobs"
+                    " WHERE content_hash NOT IN (SELECT content_hash FROM reports)"
+                ).fetchall()
+                conn.executemany("DELETE FROM blobs WHERE content_hash = ?",
+                                 [(row['content_hash'],) for row in orphans])
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        for row in orphans:
+            (self.root / row['path']).unlink(missing_ok=True)
+        return removed
+
+    def maintain(self, now: Optional[float] = None) -> dict:
+        """Run retention, then compression."""
+        return {"pruned": self.prune(now), "compressed": self.compress(now)}
+
+    def maintain_if_due(self, now: Optional[float] = None) -> Optional[dict]:
+        """`maintain()` if this process has not run it for MAINTAIN_INTERVAL seconds, else None."""
+        now = time.time() if now is None else now
+        with self._lock:
+            if now - self._last_maintained < self.MAINTAIN_INTERVAL:
+                return None
+            self._last_maintained = now
+        return self.maintain(now)
+
+    def scan(self) -> int:
+        """
+        Index report files in the directory that the manifest does not know about
+        (e.g. written before the archive existed). Their region is recorded as 'unknown'.
+
+        Returns:
+            Number of files added
+        """
+        conn = self._connection()
+        known = {row[0] for row in conn.execute("SELECT path FROM blobs")}
+        added = 0
+        for path in sorted(self.root.glob('snow_removal_report_*.html')):
+            if path.name in known:
+                continue
+            digest = hashlib.sha256(path.read_bytes()).hexdigest()
+            match = LEGACY_NAME.search(path.name)
+            created_at = (
+                datetime.strptime(match.group(1), '%Y%m%d_%H%M%S').timestamp()
+                if match else path.stat().st_mtime
+            )
+            size = path.stat().st_size
+            if conn.execute("SELECT 1 FROM blobs WHERE content_hash = ?", (digest,)).fetchone():
+                path.unlink()
+            else:
+                conn.execute(
+                    "INSERT INTO blobs (content_hash, path, size, stored_size, compressed, created_at, last_used_at)"
+                    " VALUES (?, ?, ?, ?, 0, ?, ?)",
+                    (digest, path.name, size, size, created_at, created_at)
+                )
+            self.add('unknown', digest, lambda _: None, created_at=created_at)
+            added += 1
+        return added
+
+    def stats(self) -> dict:
+        row = self._connection().execute(
+            "SELECT (SELECT COUNT(*) FROM reports) AS reports, COUNT(*) AS files,"
+            " COALESCE(SUM(size), 0) AS size, COALESCE(SUM(stored_size), 0) AS stored_size,"
+            " COALESCE(SUM(compressed), 0) AS compressed FROM blobs"
+        ).fetchone()
+        return dict(row)
+
+
+_archives: Dict[Path, ReportArchive] = {}
+_archives_lock = threading.Lock()
+
+
+def get_archive(root: Optional[Union[str, Path]] = None) -> ReportArchive:
+    """
+    Return the process-wide archive for `root` (default: OLAF_REPORTS_DIR, or the project's
+    reports/ directory).
+
+    Policy comes from OLAF_REPORT_COMPRESS_AFTER_HOURS (24), OLAF_REPORT_RETENTION_DAYS (30)
+    and OLAF_REPORT_KEEP_PER_REGION (500).
+    """
+    path = Path(root or os.getenv('OLAF_REPORTS_DIR') or REPORTS_DIR).resolve()
+    with _archives_lock:
+        if path not in _archives:
+            _archives[path] = ReportArchive(
+                path,
+                compress_after=float(os.getenv('OLAF_REPORT_COMPRESS_AFTER_HOURS', '24')) * 3600,
+                retention=float(os.getenv('OLAF_REPORT_RETENTION_DAYS', '30')) * 24 * 3600,
+                keep_per_region=int(os.getenv('OLAF_REPORT_KEEP_PER_REGION', '500'))
+            )
+        return _archives[path]
+
+
+if __name__ == '__main__':
+    commands = ('latest', 'list', 'maintain', 'scan')
+    if len(sys.argv) < 2 or sys.argv[1] not in commands or (sys.argv[1] == 'latest' and len(sys.argv) < 3):
+        print("Usage: report_archive.py latest <region> | list [<region>] | maintain | scan")
+        sys.exit(1)
+    archive = get_archive()
+    command = sys.argv[1]
+    if command == 'latest':
+        entry = archive.latest(sys.argv[2])
+        print(entry.path if entry else f"No report for {sys.argv[2]}")
+    elif command == 'list':
+        for region in sys.argv[2:] or archive.regions():
+            for entry in archive.between(region):
+                info = entry.to_dict()
+                print(f"{info['created_at']}  {region:<10} {info['stored_size']:>9}  {entry.path.name}")
+    elif command == 'maintain':
+        print(archive.maintain())
+    else:
+        print(f"Indexed {archive.scan()} report file(s)")
@@ -0,0 +1,473 @@
+"""
+HTML rendering engine for snow removal reports.
+
+Templates under tools/templates are compiled once per process; the Plotly
+runtime is emitted once per report (from the CDN, or inline for tablets
+that work offline) instead of once per figure, and the stylesheet is loaded
+once and either inlined or written next to the reports as a shared asset.
+Reports are streamed to disk chunk by chunk.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, TextIO, Tuple, Union
+
+import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.offline import get_plotlyjs, get_plotlyjs_version
+from jinja2 import Environment, FileSystemLoader, StrictUndefined, select_autoescape
+from markupsafe import Markup
+
+from .route_geometry import RouteGeometry
+from .tracing import tracer
+
+TEMPLATE_DIR = Path(__file__).parent / 'templates'
+
+PLOTLY_MODES = ('cdn', 'inline')
+STYLESHEET_MODES = ('inline', 'link')
+
+
+@lru_cache(maxsize=1)
+def template_environment() -> Environment:
+    """The process-wide Jinja environment, with every report template compiled up front."""
+    env = Environment(
+        loader=FileSystemLoader(str(TEMPLATE_DIR)),
+        autoescape=select_autoescape(['html', 'j2']),
+        trim_blocks=True,
+        lstrip_blocks=True,
+        undefined=StrictUndefined,
+        auto_reload=False,
+    )
+    for name in env.list_templates(extensions=['j2']):
+        env.get_template(name)
+    return env
+
+
+@lru_cache(maxsize=1)
+def stylesheet() -> str:
+    return (TEMPLATE_DIR / 'report.css').read_text(encoding='utf-8')
+
+
+@lru_cache(maxsize=1)
+def stylesheet_name() -> str:
+    """Content-addressed file name, so a changed stylesheet never reuses a stale cached copy."""
+    digest = hashlib.sha256(stylesheet().encode('utf-8')).hexdigest()[:12]
+    return f"report-{digest}.css"
+
+
+@lru_cache(maxsize=1)
+def plotly_inline_script() -> Markup:
+    # ~4.6 MB; loaded from the plotly package once per process
+    return Markup(get_plotlyjs())
+
+
+def plotly_cdn_url() -> str:
+    return f"https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"
+
+
+def content_digest(content: Any) -> str:
+    """Stable hash of a section's input data."""
+    payload = json.dumps(content, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _map_trace(**kwargs) -> Any:
+    """Tile-map scatter trace: Scattermap on plotly >= 5.24 (MapLibre), Scattermapbox before that."""
+    if hasattr(go, 'Scattermap'):
+        return go.Scattermap(**kwargs)
+    return go.Scattermapbox(**kwargs)
+
+
+def _map_layout(center: Dict[str, float], zoom: int) -> Dict[str, Any]:
+    key = 'map' if hasattr(go, 'Scattermap') else 'mapbox'
+    return {f"{key}_style": "carto-positron", key: dict(center=center, zoom=zoom)}
+
+
+def _parse_amount(value: Any) -> float:
+    """Leading number of a value such as "3.13 mm" or "120 tons"."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).split()[0])
+    except (IndexError, ValueError):
+        return 0.0
+
+
+def _clock_time(value: Any) -> str:
+    """Time part of an ISO datetime ("2025-02-04T06:30:00" -> "06:30:00")."""
+    text = str(value or '')
+    return text.split('T', 1)[1] if 'T' in text else text
+
+
+class SectionCache:
+    """
+    LRU of rendered section HTML keyed by (header, content hash), bounded by total size.
+
+    Sections whose input has not changed since an earlier report are served
+    from here, skipping figure construction and template rendering.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Tuple[str, str]) -> Optional[str]:
+        with self._lock:
+            html = self._entries.get(key)
+            if html is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return html
+
+    def set(self, key: Tuple[str, str], html: str) -> None:
+        size = len(html)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = html
+            self._size += size
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self._hits = self._misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+                "entries": len(self._entries),
+                "size_bytes": self._size,
+                "max_bytes": self.max_bytes,
+            }
+
+
+# Shared by every renderer: section HTML does not depend on the Plotly or stylesheet mode
+section_cache = SectionCache(
+    max_bytes=int(float(os.getenv('OLAF_REPORT_SECTION_CACHE_MB', '32')) * 1024 * 1024)
+)
+
+
+class ReportRenderer:
+    """
+    Renders report sections and whole reports from the precompiled templates.
+
+    Args:
+        plotly_js: 'cdn' to load Plotly from its CDN, 'inline' to embed it (offline use)
+        stylesheet_mode: 'inline' to embed the CSS, 'link' to reference a shared file
+            written once into the report directory
+        cache: Section cache to use; defaults to the shared `section_cache`, None disables caching
+    """
+
+    def __init__(self, plotly_js: str = 'cdn', stylesheet_mode: str = 'inline',
+                 cache: Optional[SectionCache] = section_cache):
+        if plotly_js not in PLOTLY_MODES:
+            raise ValueError(f"plotly_js must be one of {PLOTLY_MODES}, got '{plotly_js}'")
+        if stylesheet_mode not in STYLESHEET_MODES:
+            raise ValueError(f"stylesheet_mode must be one of {STYLESHEET_MODES}, got '{stylesheet_mode}'")
+        self.plotly_js = plotly_js
+        self.stylesheet_mode = stylesheet_mode
+        self.cache = cache
+        self.env = template_environment()
+        self._section_renderers: Dict[str, Callable[[Dict[str, Any], str], str]] = {
+            'Alerts': self._render_alerts,
+            'Weather Dashboard': self._render_weather,
+            'Route Optimization': self._render_traffic,
+            'Vehicle Routes': self._render_vehicle_routes,
+            'Resource Inventory': self._render_inventory,
+            'Operational Recommendations': self._render_recommendations,
+            'Run Timings': self._render_timings,
+        }
+
+    @staticmethod
+    def _figure_html(fig: go.Figure, div_id: str) -> Markup:
+        # The runtime is added once in the page head, never per figure
+        return Markup(pio.to_html(fig, full_html=False, include_plotlyjs=False, div_id=div_id))
+
+    def _render_alerts(self, content: Dict[str, Any], digest: str) -> str:
+        return self.env.get_template('alerts.html.j2').render(alerts=content.get('alerts', []))
+
+    def _render_weather(self, content: Dict[str, Any], digest: str) -> str:
+        current = content.get('current_conditions', {})
+        forecast = content.get('forecast', [])
+
+        fig = go.Figure()
+        fig.add_trace(go.Indicator(
+            mode="number+delta",
+            value=current.get('temperature', 0),
+            title={'text': "Temperature (°C)"},
+            delta={'reference': current.get('road_surface_temp', 0)},
+            domain={'row': 0, 'column': 0}
+        ))
+        if forecast:
+            fig.add_trace(go.Bar(
+                x=[f.get('time', '') for f in forecast],
+                y=[_parse_amount(f.get('expected_snow', '0')) for f in forecast],
+                name='Expected Snow (mm)',
+                marker_color='#3498db'
+            ))
+        fig.update_layout(
+            title='Weather Forecast',
+            height=400,
+            grid={'rows': 2, 'columns': 1},
+            margin=dict(t=50, b=50, l=50, r=50)
+        )
+        return self.env.get_template('weather.html.j2').render(
+            current=current,
+            forecast=forecast,
+            plot=self._figure_html(fig, f"weather-{digest[:12]}")
+        )
+
+    def _render_traffic(self, content: Dict[str, Any], digest: str) -> str:
+        traffic = content.get('traffic_data', {})
+        route = content.get('optimized_route', {})
+
+        incidents = traffic.get('traffic_incidents', [])
+        shape = RouteGeometry.from_dict(route['route_shape']).coords if route.get('route_shape') else None
+        has_route = shape is not None and len(shape) > 0
+        plot = Markup('')
+        if incidents or has_route:
+            fig = go.Figure()
+            if has_route:
+                fig.add_trace(_map_trace(
+                    lat=shape[:, 0],
+                    lon=shape[:, 1],
+                    mode='lines',
+                    line=dict(width=4, color='#1f77b4'),
+                    name='Route',
+                    hoverinfo='skip'
+                ))
+            if incidents:
+                fig.add_trace(_map_trace(
+                    lat=[inc['location']['latitude'] for inc in incidents],
+                    lon=[inc['location']['longitude'] for inc in incidents],
+                    mode='markers+text',
+                    marker=dict(size=12, color='red'),
+                    text=[f"{inc['type']}: {inc['description']}" for inc in incidents],
+                    textposition="top center",
+                    name='Incidents'
+                ))
+            # Centre on the route when there is one, else on the incidents
+            if has_route:
+                center = dict(lat=float(shape[:, 0].mean()), lon=float(shape[:, 1].mean()))
+            else:
+                center = dict(
+                    lat=sum(inc['location']['latitude'] for inc in incidents) / len(incidents),
+                    lon=sum(inc['location']['longitude'] for inc in incidents) / len(incidents)
+                )
+            fig.update_layout(
+                **_map_layout(center, zoom=12),
+                showlegend=False,
+                height=400,
+                margin=dict(t=0, b=0, l=0, r=0)
+            )
+            plot = self._figure_html(fig, f"traffic-{digest[:12]}")
+
+        segments = [
+            {
+                'start_time': _clock_time(segment.get('start')),
+                'end_time': _clock_time(segment.get('end')),
+                'start_point': segment.get('start_point') or {},
+                'end_point': segment.get('end_point') or {},
+            }
+            for segment in route.get('segments', [])
+        ]
+        return self.env.get_template('traffic.html.j2').render(
+            traffic=traffic, route=route, segments=segments, plot=plot
+        )
+
+    def _render_inventory(self, content: Dict[str, Any], digest: str) -> str:
+        alerts = content.get('low_inventory_alerts', {})
+
+        plot = Markup('')
+        if alerts:
+            resources = list(alerts)
+            fig = go.Figure()
+            fig.add_trace(go.Bar(
+                name='Current Level',
+                x=resources,
+                y=[_parse_amount(alerts[r]['Current Level']) for r in resources],
+                marker_color='#3498db'
+            ))
+            fig.add_trace(go.Bar(
+                name='Threshold',
+                x=resources,
+                y=[_parse_amount(alerts[r]['Threshold']) for r in resources],
+                marker_color='#e74c3c'
+            ))
+            fig.update_layout(
+                title='Resource Inventory Levels vs Thresholds',
+                barmode='group',
+                height=400,
+                margin=dict(t=50, b=50, l=50, r=50)
+            )
+            plot = self._figure_html(fig, f"inventory-{digest[:12]}")
+
+        return self.env.get_template('inventory.html.j2').render(
+            inventory=content.get('inventory_levels', {}),
+            usage=content.get('recent_usage', {}),
+            needs=content.get('projected_needs', {}),
+            alerts=alerts,
+            plot=plot
+        )
+
+    def _render_recommendations(self, content: Dict[str, Any], digest: str) -> str:
+        return self.env.get_template('recommendations.html.j2').render(content=content)
+
+    def _render_vehicle_routes(self, content: Dict[str, Any], digest: str) -> str:
+        return self.env.get_template('vehicle_routes.html.j2').render(
+            vehicles=content.get('vehicles', []),
+            total_distance_km=content.get('total_distance_km'),
+            makespan_minutes=content.get('makespan_minutes'),
+            unassigned_stops=content.get('unassigned_stops', [])
+        )
+
+    def _render_timings(self, content: Dict[str, Any], digest: str) -> str:
+        categories = content.get('categories', {})
+        plot = Markup('')
+        if categories:
+            fig = go.Figure(go.Bar(
+                x=[values.get('total_ms', 0) / 1000 for values in categories.values()],
+                y=list(categories),
+                orientation='h',
+                marker_color='#3498db'
+            ))
+            fig.update_layout(
+                title='Time per category (s, summed over concurrent spans)',
+                height=80 + 40 * len(categories),
+                margin=dict(t=50, b=30, l=80, r=30)
+            )
+            plot = self._figure_html(fig, f"timings-{digest[:12]}")
+        return self.env.get_template('timings.html.j2').render(
+            wall_ms=content.get('wall_ms', 0),
+            categories=categories,
+            spans=content.get('spans', []),
+            plot=plot
+        )
+
+    def render_section(self, section: Dict[str, Any]) -> str:
+        """
+        Render one report section, reusing the cached HTML when its content is unchanged.
+
+        Args:
+            section: {"header": ..., "content": {...}}
+
+        Returns:
+            Section HTML, or an empty string for headers the report does not know
+        """
+        header = section.get('header')
+        renderer = self._section_renderers.get(header)
+        if renderer is None:
+            return ''
+        content = section.get('content') or {}
+        with tracer.span(header, 'render') as span:
+            digest = content_digest(content)
+            if self.cache is None:
+                html = renderer(content, digest)
+            else:
+                key = (header, digest)
+                html = self.cache.get(key)
+                span['cached'] = html is not None
+                if html is None:
+                    html = renderer(content, digest)
+                    self.cache.set(key, html)
+            span['output_bytes'] = len(html)
+            return html
+
+    def _head_assets(self, output_dir: Optional[Path]) -> Dict[str, Any]:
+        assets: Dict[str, Any] = {
+            'plotly_src': plotly_cdn_url() if self.plotly_js == 'cdn' else None,
+            'plotly_inline': plotly_inline_script() if self.plotly_js == 'inline' else None,
+            'stylesheet': Markup(stylesheet()),
+            'stylesheet_href': None,
+        }
+        if self.stylesheet_mode == 'link' and output_dir is not None:
+            assets['stylesheet_href'] = f"assets/{self.write_stylesheet(output_dir).name}"
+        return assets
+
+    @staticmethod
+    def write_stylesheet(output_dir: Path) -> Path:
+        """Write the shared stylesheet under output_dir/assets (once per stylesheet version)."""
+        path = Path(output_dir) / 'assets' / stylesheet_name()
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix('.tmp')
+            tmp.write_text(stylesheet(), encoding='utf-8')
+            tmp.replace(path)
+        return path
+
+    def generate(self, content: Dict[str, Any], output_dir: Optional[Path] = None) -> Iterator[str]:
+        """
+        Yield the report HTML in chunks.
+
+        Sections are rendered lazily as the page template reaches them, so the
+        whole document is never held in memory at once.
+
+        Args:
+            content: {"title": ..., "sections": [...]}
+            output_dir: Directory the report will be written to (needed for 'link' stylesheets)
+        """
+        title = content.get('title', 'Snow Removal Report')
+        sections = (
+            Markup(html)
+            for html in (self.render_section(section) for section in content.get('sections', []))
+            if html
+        )
+        return self.env.get_template('report.html.j2').generate(
+            title=title,
+            generated_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            sections=sections,
+            **self._head_assets(output_dir)
+        )
+
+    def render_to(self, content: Dict[str, Any], target: Union[str, Path, TextIO]) -> int:
+        """
+        Stream the report to a path or an open text file.
+
+        Returns:
+            Number of characters written
+        """
+        if isinstance(target, (str, Path)):
+            path = Path(target)
+            with open(path, 'w', encoding='utf-8') as f:
+                return self._write(self.generate(content, path.parent), f)
+        return self._write(self.generate(content), target)
+
+    @staticmethod
+    def _write(chunks: Iterator[str], f: TextIO) -> int:
+        written = 0
+        for chunk in chunks:
+            f.write(chunk)
+            written += len(chunk)
+        return written
+
+    def render(self, content: Dict[str, Any]) -> str:
+        """Render the whole report to a string."""
+        return ''.join(self.generate(content))
+
+
+@lru_cache(maxsize=None)
+def get_renderer(plotly_js: str = 'cdn', stylesheet_mode: str = 'inline') -> ReportRenderer:
+    """Shared renderer per output mode."""
+    return ReportRenderer(plotly_js=plotly_js, stylesheet_mode=stylesheet_mode)
@@ -0,0 +1,173 @@
+"""
+TTL response cache for API lookups made by the tools.
+
+Two tiers:
+- an in-memory LRU (bounded number of entries), always on
+- an optional SQLite file that survives process restarts
+
+Entries carry their own TTL so one cache can hold short-lived current
+conditions next to long-lived forecasts.
+"""
+import atexit
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Optional, Tuple, Union
+
+
+def make_key(endpoint: str, lat: float, lon: float, precision: int = 2, **extra) -> str:
+    """
+    Build a cache key from an endpoint (name or URL) and coordinates rounded to `precision` decimals.
+
+    Two decimals is ~1 km, well below the resolution of the weather models behind
+    the API, so nearby lookups share an entry.
+    """
+    key = f"{endpoint}:{round(lat, precision):.{precision}f},{round(lon, precision):.{precision}f}"
+    for name in sorted(extra):
+        key += f":{name}={extra[name]}"
+    return key
+
+
+class ResponseCache:
+    """Thread-safe LRU + optional on-disk cache with per-entry TTL and hit/miss counters."""
+
+    # Expired disk rows are deleted at most this often (seconds), not on every write
+    PRUNE_INTERVAL = 60.0
+
+    def __init__(self, max_entries: int = 256, disk_path: Optional[Union[str, Path]] = None):
+        self.max_entries = max_entries
+        self.disk_path = Path(disk_path) if disk_path else None
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        # One connection for the disk tier, shared by all threads under its own lock so
+        # memory-tier lookups never wait on disk I/O
+        self._disk_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._last_prune = 0.0
+        if self.disk_path:
+            self.disk_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._disk_lock:
+                self._connection().executescript(
+                    "CREATE TABLE IF NOT EXISTS responses ("
+                    " key TEXT PRIMARY KEY, expires_at REAL NOT NULL, value TEXT NOT NULL);"
+                    "CREATE INDEX IF NOT EXISTS responses_expires_at ON responses(expires_at);"
+                )
+            atexit.register(self.close)
+
+    def _connection(self) -> sqlite3.Connection:
+        """The disk tier's connection, opened on first use; callers hold `_disk_lock`."""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.disk_path, timeout=5, isolation_level=None, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        return self._conn
+
+    def close(self) -> None:
+        """Close the disk tier's connection; later calls reopen it."""
+        with self._disk_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _disk_get(self, key: str, now: float) -> Optional[Tuple[float, Any]]:
+        try:
+            with self._disk_lock:
+                row = self._connection().execute(
+                    "SELECT expires_at, value FROM responses WHERE key = ? AND expires_at > ?",
+                    (key, now)
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Response cache disk read failed: {str(e)}")
+            return None
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def _disk_set(self, key: str, expires_at: float, value: Any) -> None:
+        try:
+            with self._disk_lock:
+                conn = self._connection()
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, expires_at, value) VALUES (?, ?, ?)",
+                    (key, expires_at, json.dumps(value))
+                )
+                now = time.time()
+                if now - self._last_prune >= self.PRUNE_INTERVAL:
+                    conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+                    self._last_prune = now
+        except sqlite3.Error as e:
+            print(f"Response cache disk write failed: {str(e)}")
+
+    def _remember(self, key: str, expires_at: float, value: Any) -> None:
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for `key`, or None if absent or expired."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return entry[1]
+                del self._entries[key]
+        if self.disk_path:
+            entry = self._disk_get(key, now)
+            if entry is not None:
+                with self._lock:
+                    self._remember(key, *entry)
+                    self._hits += 1
+                    self._disk_hits += 1
+                return entry[1]
+        with self._lock:
+            self._misses += 1
+        return None
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store a JSON-serializable `value` for `ttl` seconds."""
+        expires_at = time.time() + ttl
+        with self._lock:
+            self._remember(key, expires_at, value)
+        if self.disk_path:
+            self._disk_set(key, expires_at, value)
+
+    def get_or_fetch(self, key: str, ttl: float, fetch: Callable[[], Any]) -> Any:
+        """Return the cached value for `key`, calling `fetch()` and caching its result on a miss."""
+        value = self.get(key)
+        if value is None:
+            value = fetch()
+            self.set(key, value, ttl)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._disk_hits = self._misses = 0
+        if self.disk_path:
+            try:
+                with self._disk_lock:
+                    self._connection().execute("DELETE FROM responses")
+            except sqlite3.Error as e:
+                print(f"Response cache disk clear failed: {str(e)}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "disk_path": str(self.disk_path) if self.disk_path else None,
+            }
@@ -0,0 +1,162 @@
+"""
+Compact route geometry.
+
+TomTom returns a route's shape as one {"latitude", "longitude"} dict per point
+and leg, which costs a few hundred bytes per point in memory and ~60 in
+indented JSON. RouteGeometry keeps the points of all legs in one (n, 2)
+float array with the leg boundaries as offsets, and serializes to an encoded
+polyline (Google's polyline algorithm, 1e-5 degree precision by default),
+about 6 bytes per point.
+
+Tool results carry the geometry under "route_geometry" (see `to_dict`), and
+the per-point lists are dropped from the raw route legs.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .traffic_flow import Point, cumulative_distance_m
+
+# Decimal digits kept by the encoded polyline (5 is ~1 m, the TomTom/Google default)
+DEFAULT_PRECISION = 5
+
+
+def encode_polyline(coords: np.ndarray, precision: int = DEFAULT_PRECISION) -> str:
+    """Encode (lat, lon) rows with the encoded polyline algorithm."""
+    scaled = np.round(np.asarray(coords, dtype=float).reshape(-1, 2) * 10 ** precision).astype(np.int64)
+    deltas = np.diff(scaled, axis=0, prepend=np.zeros((1, 2), dtype=np.int64)).ravel()
+    # Zigzag: sign moved to the low bit so small negative deltas stay short
+    values = (deltas << 1) ^ (deltas >> 63)
+    chars: List[str] = []
+    for value in values.tolist():
+        while value >= 0x20:
+            chars.append(chr((0x20 | (value & 0x1f)) + 63))
+            value >>= 5
+        chars.append(chr(value + 63))
+    return ''.join(chars)
+
+
+def decode_polyline(encoded: str, precision: int = DEFAULT_PRECISION) -> np.ndarray:
+    """Decode an encoded polyline into an (n, 2) array of (lat, lon)."""
+    values: List[int] = []
+    value = shift = 0
+    for char in encoded:
+        chunk = ord(char) - 63
+        value |= (chunk & 0x1f) << shift
+        if chunk < 0x20:
+            values.append(~(value >> 1) if value & 1 else value >> 1)
+            value = shift = 0
+        else:
+            shift += 5
+    if len(values) % 2:
+        raise ValueError("Truncated polyline")
+    return np.cumsum(np.array(values, dtype=np.int64).reshape(-1, 2), axis=0) / 10 ** precision
+
+
+class RouteGeometry:
+    """Points of a route's legs in one float array, with `leg_offsets[i]:leg_offsets[i + 1]` per leg."""
+
+    __slots__ = ('coords', 'leg_offsets')
+
+    def __init__(self, coords: Any, leg_offsets: Optional[Sequence[int]] = None):
+        self.coords = np.asarray(coords, dtype=float).reshape(-1, 2)
+        offsets = [0, len(self.coords)] if leg_offsets is None else list(leg_offsets)
+        if offsets[0] != 0 or offsets[-1] != len(self.coords) or any(a > b for a, b in zip(offsets, offsets[1:])):
+            raise ValueError(f"Invalid leg offsets {offsets} for {len(self.coords)} points")
+        self.leg_offsets = np.asarray(offsets, dtype=np.int64)
+
+    @classmethod
+    def from_points(cls, points: Iterable[Point]) -> 'RouteGeometry':
+        """Single-leg geometry from (lat, lon) pairs."""
+        return cls(np.array(list(points), dtype=float))
+
+    @classmethod
+    def from_tomtom(cls, route: Optional[dict]) -> 'RouteGeometry':
+        """
+        Geometry of the first route in a TomTom calculateRoute response.
+
+        Returns:
+            The geometry; empty if the response holds no points
+        """
+        legs = ((route or {}).get('routes') or [{}])[0].get('legs') or []
+        arrays, offsets = [], [0]
+        for leg in legs:
+            points = leg.get('points') or []
+            arrays.append(np.fromiter(
+                (value for point in points for value in (point['latitude'], point['longitude'])),
+                dtype=float, count=2 * len(points)
+            ))
+            offsets.append(offsets[-1] + len(points))
+        coords = np.concatenate(arrays) if arrays else np.empty(0)
+        return cls(coords, offsets)
+
+    def __len__(self) -> int:
+        return len(self.coords)
+
+    @property
+    def legs(self) -> int:
+        return len(self.leg_offsets) - 1
+
+    def leg(self, index: int) -> np.ndarray:
+        """(lat, lon) rows of one leg."""
+        return self.coords[self.leg_offsets[index]:self.leg_offsets[index + 1]]
+
+    def length_m(self) -> float:
+        """Length along the points (legs joined end to end)."""
+        return float(cumulative_distance_m(self.coords)[-1]) if len(self.coords) else 0.0
+
+    def downsample(self, max_points: int) -> 'RouteGeometry':
+        """
+        At most about `max_points` points, evenly strided; every leg keeps its end points.
+
+        Used to bound the size of map traces for long routes.
+        """
+        if len(self.coords) <= max_points:
+            return self
+        stride = -(-len(self.coords) // max_points)
+        arrays, offsets = [], [0]
+        for index in range(self.legs):
+            leg = self.leg(index)
+            if len(leg) > 2:
+                leg = leg[np.unique(np.append(np.arange(0, len(leg), stride), len(leg) - 1))]
+            arrays.append(leg)
+            offsets.append(offsets[-1] + len(leg))
+        return RouteGeometry(np.concatenate(arrays), offsets)
+
+    def encode(self, precision: int = DEFAULT_PRECISION) -> str:
+        return encode_polyline(self.coords, precision)
+
+    def to_dict(self, precision: int = DEFAULT_PRECISION) -> Dict[str, Any]:
+        """JSON form: the encoded polyline of all points plus the leg offsets."""
+        return {
+            "polyline": self.encode(precision),
+            "precision": precision,
+            "points": len(self.coords),
+            "leg_offsets": self.leg_offsets.tolist()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'RouteGeometry':
+        coords = decode_polyline(data.get('polyline') or '', data.get('precision', DEFAULT_PRECISION))
+        return cls(coords, data.get('leg_offsets'))
+
+
+def strip_points(route: Optional[dict]) -> Optional[dict]:
+    """Copy of a calculateRoute response without the per-point lists of its legs."""
+    if not route or not route.get('routes'):
+        return route
+    return {
+        **route,
+        "routes": [
+            {**r, "legs": [{k: v for k, v in leg.items() if k != 'points'} for leg in r.get('legs') or []]}
+            for r in route['routes']
+        ]
+    }
+
+
+def result_geometry(traffic: Optional[dict]) -> RouteGeometry:
+    """Route geometry of a TomTomTrafficTool result ("route_geometry", or the raw legs of older results)."""
+    traffic = traffic or {}
+    if traffic.get('route_geometry'):
+        return RouteGeometry.from_dict(traffic['route_geometry'])
+    return RouteGeometry.from_tomtom(traffic.get('optimized_route'))
@@ -0,0 +1,152 @@
+from crewai.tools import BaseTool
+from typing import Type, Dict, List, Optional, ClassVar
+from pydantic import BaseModel, Field
+from datetime import datetime
+import json
+from .inventory_store import get_store
+from .tomtom_traffic_tool import TomTomTrafficTool
+from .travel_matrix import shared_travel_matrix
+from .vrp_solver import Depot, Stop, Vehicle, solve
+
+
+class RouteOptimizationToolInput(BaseModel):
+    """Input schema for RouteOptimizationTool."""
+    region: str = Field(..., description="Region to plan routes for (e.g., Montreal, Toronto, Quebec)")
+    stops_json: Optional[str] = Field(
+        default=None,
+        description=(
+            "Optional JSON list of stops to serve: "
+            '[{"id": "S1", "latitude": 46.81, "longitude": -71.21, "salt_tons": 1.5, "service_minutes": 5}]. '
+            "Defaults to the region's priority waypoints."
+        )
+    )
+    trucks_per_depot: int = Field(default=2, description="Number of trucks based at each depot")
+    truck_salt_capacity_tons: float = Field(default=10.0, description="Salt each truck can carry per trip (tons)")
+    truck_fuel_capacity_liters: float = Field(default=300.0, description="Fuel tank size of each truck (liters)")
+    time_budget_seconds: float = Field(default=2.0, description="Time budget for route improvement (seconds)")
+
+
+class RouteOptimizationTool(BaseTool):
+    name: str = "Fleet Route Optimization Tool"
+    description: str = """
+    Plans snow removal routes for a whole fleet across multiple depots.
+    Respects truck salt capacity and fuel range as well as salt on hand at each depot,
+    and returns per-vehicle trips with distance, duration, salt and fuel use.
+    """
+    args_schema: Type[BaseModel] = RouteOptimizationToolInput
+
+    # Approximate municipal yard locations for the depots in the inventory
+    depot_locations: ClassVar[Dict[str, Dict[str, List[float]]]] = {
+        "Toronto": {
+            "Main Depot": [43.6560, -79.3580],
+            "East Depot": [43.6890, -79.2930],
+            "West Depot": [43.6380, -79.4650]
+        },
+        "Montreal": {
+            "Main Depot": [45.5080, -73.5550],
+            "East Depot": [45.5660, -73.5300],
+            "West Depot": [45.4650, -73.6400]
+        },
+        "Quebec": {
+            "Main Depot": [46.8120, -71.2250],
+            "East Depot": [46.8380, -71.1650],
+            "West Depot": [46.7780, -71.3050]
+        }
+    }
+
+    def _load_stops(self, region: str, stops_json: Optional[str]) -> List[Stop]:
+        if stops_json:
+            return [Stop(**stop) for stop in json.loads(stops_json)]
+        return [
+            Stop(id=f"{region}-WP{i + 1}", latitude=lat, longitude=lon)
+            for i, (lat, lon) in enumerate(TomTomTrafficTool.region_coordinates[region])
+        ]
+
+    def _load_depots(self, region: str) -> List[Depot]:
+        stock = get_store().depot_stock()
+        return [
+            Depot(
+                name=name,
+                latitude=lat,
+                longitude=lon,
+                salt_tons=stock.get(name, {}).get('salt', 0),
+                fuel_liters=stock.get(name, {}).get('fuel', 0)
+            )
+            for name, (lat, lon) in self.depot_locations[region].items()
+        ]
+
+    def _run(
+        self,
+        region: str,
+        stops_json: Optional[str] = None,
+        trucks_per_depot: int = 2,
+        truck_salt_capacity_tons: float = 10.0,
+        truck_fuel_capacity_liters: float = 300.0,
+        time_budget_seconds: float = 2.0
+    ) -> str:
+        """
+        Main execution method for the tool.
+
+        Args:
+            region: The region to plan for
+            stops_json: Optional JSON list of stops; defaults to the region's waypoints
+            trucks_per_depot: Trucks based at each depot
+            truck_salt_capacity_tons: Salt capacity per truck and trip
+            truck_fuel_capacity_liters: Fuel tank size per truck
+            time_budget_seconds: Budget for the local search phase
+
+        Returns:
+            JSON string containing per-vehicle routes and depot usage
+        """
+        try:
+            if region not in self.depot_locations:
+                return json.dumps({
+                    "error": "Invalid region",
+                    "details": f"Region '{region}' not found. Available regions: {list(self.depot_locations.keys())}"
+                })
+
+            stops = self._load_stops(region, stops_json)
+            depots = self._load_depots(region)
+            vehicles = [
+                Vehicle(
+                    id=f"{depot.name.split()[0].upper()}-{k + 1}",
+                    depot=depot.name,
+                    salt_capacity_tons=truck_salt_capacity_tons,
+                    fuel_capacity_liters=truck_fuel_capacity_liters
+                )
+                for depot in depots
+                for k in range(trucks_per_depot)
+            ]
+            # Depots first, then stops: the layout the solver expects
+            matrix = shared_travel_matrix()
+            points = [(d.latitude, d.longitude) for d in depots] + [(s.latitude, s.longitude) for s in stops]
+            distance_km, duration_s = matrix.get(points)
+            solution = solve(
+                depots, vehicles, stops,
+                distance_km=distance_km,
+                duration_s=duration_s,
+                time_budget_s=time_budget_seconds
+            )
+
+            return json.dumps({
+                "timestamp": datetime.now().isoformat(),
+                "region": region,
+                "stops": len(stops),
+                "depots": [
+                    {"name": d.name, "latitude": d.latitude, "longitude": d.longitude}
+                    for d in depots
+                ],
+                "routes": solution.to_dict(),
+                "travel_matrix": matrix.stats()
+            }, indent=2)
+
+        except (ValueError, TypeError) as e:
+            return json.dumps({
+                "error": "Invalid routing input",
+                "details": str(e)
+            })
+        except Exception as e:
+            return json.dumps({
+                "error": "An unexpected error occurred",
+                "details": str(e)
+            })
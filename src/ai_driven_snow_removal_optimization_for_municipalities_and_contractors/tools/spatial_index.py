@@ -0,0 +1,239 @@
+"""
+Uniform-grid spatial index over traffic incident geometries.
+
+Incident geometries (GeoJSON Point or LineString, lon/lat order, as returned
+by TomTom incidentDetails) are projected onto a local plane in metres and
+their edges are bucketed into square cells. "Incidents within X metres of a
+segment" then only measures exact distances to the edges in the cells the
+segment (grown by X) overlaps.
+"""
+import math
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from .traffic_flow import EARTH_RADIUS_M, Point, RouteSegment, cumulative_distance_m
+
+# TomTom incident iconCategory codes
+INCIDENT_CATEGORIES = {
+    0: "Unknown", 1: "Accident", 2: "Fog", 3: "DangerousConditions", 4: "Rain",
+    5: "Ice", 6: "Jam", 7: "LaneClosed", 8: "RoadClosed", 9: "RoadWorks",
+    10: "Wind", 11: "Flooding", 14: "BrokenDownVehicle"
+}
+
+
+class LocalProjection:
+    """Equirectangular projection around a reference latitude; accurate to well under 1% at city scale."""
+
+    def __init__(self, origin_lat: float):
+        self.scale_x = EARTH_RADIUS_M * math.cos(math.radians(origin_lat))
+
+    def project(self, lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+        return np.column_stack((
+            np.radians(np.asarray(lon, dtype=float)) * self.scale_x,
+            np.radians(np.asarray(lat, dtype=float)) * EARTH_RADIUS_M
+        ))
+
+
+def _point_segment_distance(p: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Distance from points `p` to segments `a`-`b` (all (n, 2) arrays, broadcast)."""
+    ab = b - a
+    length_sq = np.einsum('ij,ij->i', ab, ab)
+    t = np.einsum('ij,ij->i', p - a, ab) / np.where(length_sq > 0, length_sq, 1)
+    closest = a + np.clip(t, 0, 1)[:, None] * ab
+    return np.hypot(*(p - closest).T)
+
+
+def _cross(o: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return (a[:, 0] - o[:, 0]) * (b[:, 1] - o[:, 1]) - (a[:, 1] - o[:, 1]) * (b[:, 0] - o[:, 0])
+
+
+def segment_distances(a: np.ndarray, b: np.ndarray, c: np.ndarray, d: np.ndarray) -> np.ndarray:
+    """
+    Minimum distance between segment a-b and each segment c[i]-d[i].
+
+    Args:
+        a, b: (2,) end points of the query segment
+        c, d: (n, 2) end points of the candidate segments
+
+    Returns:
+        (n,) distances, 0 where the segments cross
+    """
+    a = np.broadcast_to(a, c.shape)
+    b = np.broadcast_to(b, c.shape)
+    distance = np.minimum.reduce([
+        _point_segment_distance(a, c, d),
+        _point_segment_distance(b, c, d),
+        _point_segment_distance(c, a, b),
+        _point_segment_distance(d, a, b),
+    ])
+    d1, d2 = _cross(c, d, a), _cross(c, d, b)
+    d3, d4 = _cross(a, b, c), _cross(a, b, d)
+    crossing = (d1 * d2 < 0) & (d3 * d4 < 0)
+    return np.where(crossing, 0.0, distance)
+
+
+def incident_points(incident: dict) -> List[Point]:
+    """(lat, lon) vertices of an incident's GeoJSON geometry."""
+    geometry = incident.get('geometry') or {}
+    coordinates = geometry.get('coordinates') or []
+    if geometry.get('type') == 'Point':
+        coordinates = [coordinates]
+    return [(float(c[1]), float(c[0])) for c in coordinates if len(c) >= 2]
+
+
+class IncidentIndex:
+    """
+    Grid index over incident polylines.
+
+    Cells hold the edges (not whole incidents) that overlap them, so a query
+    measures exact distances only to nearby edges, in one vectorized call.
+    Building is O(total incident vertices); matching a route of n edges costs
+    O(n) cell lookups plus the distance checks on nearby edges.
+    """
+
+    def __init__(self, incidents: Sequence[dict], cell_size_m: float = 250.0,
+                 origin_lat: Optional[float] = None):
+        self.incidents = list(incidents)
+        self.cell_size_m = cell_size_m
+        vertices = [incident_points(incident) for incident in self.incidents]
+        if origin_lat is None:
+            lats = [lat for points in vertices for lat, _ in points]
+            origin_lat = sum(lats) / len(lats) if lats else 0.0
+        self.projection = LocalProjection(origin_lat)
+
+        # Flat edge arrays; a Point incident becomes one zero-length edge
+        starts, ends, owners = [], [], []
+        for incident_id, points in enumerate(vertices):
+            if not points:
+                continue
+            xy = self.projection.project(*np.asarray(points).T)
+            starts.append(xy[:-1] if len(xy) > 1 else xy)
+            ends.append(xy[1:] if len(xy) > 1 else xy)
+            owners.append(np.full(len(starts[-1]), incident_id))
+        self._starts = np.concatenate(starts) if starts else np.empty((0, 2))
+        self._ends = np.concatenate(ends) if ends else np.empty((0, 2))
+        self._owners = np.concatenate(owners) if owners else np.empty(0, dtype=int)
+
+        cells: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        low_cells = np.floor(np.minimum(self._starts, self._ends) / cell_size_m).astype(int)
+        high_cells = np.floor(np.maximum(self._starts, self._ends) / cell_size_m).astype(int)
+        for edge, ((x0, y0), (x1, y1)) in enumerate(zip(low_cells.tolist(), high_cells.tolist())):
+            for x in range(x0, x1 + 1):
+                for y in range(y0, y1 + 1):
+                    cells[(x, y)].append(edge)
+        self._cells = dict(cells)
+
+    def __len__(self) -> int:
+        return len(self.incidents)
+
+    def project(self, points: Sequence[Point]) -> np.ndarray:
+        """Project (lat, lon) points into this index's plane (metres)."""
+        return self.projection.project(*np.asarray(points, dtype=float).reshape(-1, 2).T)
+
+    def near_projected(self, a: np.ndarray, b: np.ndarray, radius_m: float) -> List[Tuple[int, float]]:
+        """Like near_segment, for end points already projected with `project`."""
+        x0, y0 = np.floor((np.minimum(a, b) - radius_m) / self.cell_size_m).astype(int).tolist()
+        x1, y1 = np.floor((np.maximum(a, b) + radius_m) / self.cell_size_m).astype(int).tolist()
+        candidates: Set[int] = set()
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                candidates.update(self._cells.get((x, y), ()))
+        if not candidates:
+            return []
+        edges = np.fromiter(candidates, dtype=int, count=len(candidates))
+        distance = segment_distances(a, b, self._starts[edges], self._ends[edges])
+        close = distance <= radius_m
+        nearest: Dict[int, float] = {}
+        for incident_id, gap in zip(self._owners[edges[close]].tolist(), distance[close].tolist()):
+            if gap < nearest.get(incident_id, math.inf):
+                nearest[incident_id] = gap
+        return sorted(nearest.items(), key=lambda match: match[1])
+
+    def near_segment(self, a: Point, b: Point, radius_m: float) -> List[Tuple[int, float]]:
+        """
+        Incidents within `radius_m` of the segment a-b.
+
+        Args:
+            a, b: Segment end points as (lat, lon)
+            radius_m: Search radius in metres
+
+        Returns:
+            (incident index, distance in metres) pairs, nearest first
+        """
+        ab = self.project([a, b])
+        return self.near_projected(ab[0], ab[1], radius_m)
+
+
+def summarize_incident(incident: dict) -> dict:
+    """Short description of an incident for route annotations."""
+    properties = incident.get('properties') or {}
+    category = properties.get('iconCategory')
+    return {
+        "category": INCIDENT_CATEGORIES.get(category, str(category)) if category is not None else None,
+        "start_time": properties.get('startTime'),
+        "end_time": properties.get('endTime'),
+        "length_m": properties.get('length')
+    }
+
+
+def annotate_route(
+    points: Sequence[Point],
+    segments: List[RouteSegment],
+    incidents: Sequence[dict],
+    radius_m: float,
+    cell_size_m: float = 250.0
+) -> dict:
+    """
+    Attach incidents within `radius_m` of the route to the route segments they affect.
+
+    Every edge of the route polyline is queried against the index and mapped to
+    the segment containing its midpoint, so segment numbers line up with the
+    traffic flow profile.
+
+    Args:
+        points: Route polyline as (lat, lon) pairs
+        segments: Route segments (see traffic_flow.segment_route)
+        incidents: TomTom incident features
+        radius_m: Match distance in metres
+        cell_size_m: Grid cell size for the index
+
+    Returns:
+        Dict with the affected segments, the matched incidents (keyed by their
+        position in `incidents`) and a count of incidents away from the route
+    """
+    index = IncidentIndex(incidents, cell_size_m=cell_size_m,
+                          origin_lat=points[0][0] if len(points) else None)
+    nearest: Dict[int, Dict[int, float]] = defaultdict(dict)
+    if len(points) > 1 and segments and len(index):
+        distance = cumulative_distance_m(points)
+        bounds = np.array([s.end_m for s in segments])
+        owners = np.minimum(np.searchsorted(bounds, (distance[:-1] + distance[1:]) / 2), len(segments) - 1)
+        xy = index.project(points)
+        for edge, owner in enumerate(owners.tolist()):
+            for incident_id, gap in index.near_projected(xy[edge], xy[edge + 1], radius_m):
+                best = nearest[owner].get(incident_id)
+                if best is None or gap < best:
+                    nearest[owner][incident_id] = gap
+
+    matched = sorted({incident_id for found in nearest.values() for incident_id in found})
+    return {
+        "radius_m": radius_m,
+        "incidents": {
+            str(incident_id): summarize_incident(index.incidents[incident_id]) for incident_id in matched
+        },
+        "segments": [
+            {
+                "segment": segments[owner].index,
+                "from_km": round(segments[owner].start_m / 1000, 2),
+                "to_km": round(segments[owner].end_m / 1000, 2),
+                "incidents": [
+                    {"incident": str(incident_id), "distance_m": round(gap, 1)}
+                    for incident_id, gap in sorted(found.items(), key=lambda item: item[1])
+                ]
+            }
+            for owner, found in sorted(nearest.items())
+        ],
+        "off_route_incidents": len(index) - len(matched)
+    }
@@ -0,0 +1,471 @@
+"""
+Local stand-in for the OpenWeather and TomTom endpoints the tools call.
+
+Serves, on one port:
+    /data/2.5/weather, /data/2.5/forecast                     OpenWeather current + 3-hourly forecast
+    /traffic/services/5/incidentDetails                       TomTom incidents in a bbox
+    /routing/1/calculateRoute/{lat,lon:lat,lon...}/json       TomTom route through the waypoints
+    /traffic/services/4/flowSegmentData/absolute/{z}/json     TomTom flow at a point
+    /routing/matrix/2 (POST)                                  TomTom matrix routing
+
+Responses have the shape of the real APIs, with values derived from a hash of
+the request and a seed, so the same request always gets the same answer.
+Latency (fixed plus jitter, optionally per endpoint) and error responses
+(a share of requests per endpoint, decided per request URL and attempt so a
+retry can succeed) are injected for load and failure testing. API keys are
+accepted and ignored.
+
+Point the tools at it with OLAF_OPENWEATHER_BASE_URL / OLAF_TOMTOM_BASE_URL
+(or their base_url argument):
+
+    python -m ai_driven_snow_removal_optimization_for_municipalities_and_contractors.tools.standin_api \\
+        --port 8765 --latency-ms 80 --error-rate 0.05
+"""
+import argparse
+import hashlib
+import json
+import math
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .travel_matrix import estimate_matrices
+
+ENDPOINTS = ('weather', 'forecast', 'incidents', 'route', 'flow', 'matrix')
+OPENWEATHER_PREFIX = '/data/2.5'
+FORECAST_STEP_S = 3 * 3600
+# OpenWeather condition codes for light snow, snow and heavy snow
+SNOW_IDS = (600, 601, 602)
+
+
+@dataclass
+class StandInConfig:
+    """Behaviour of the stand-in; may be swapped on a running server."""
+    seed: int = 0
+    # Added to every response; jitter is uniform in [0, jitter_ms)
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    endpoint_latency_ms: Dict[str, float] = field(default_factory=dict)
+    # Share of requests answered with error_status, limited to error_endpoints when given
+    error_rate: float = 0.0
+    error_status: int = 503
+    error_endpoints: Optional[FrozenSet[str]] = None
+    # Route shape density and incident count per bbox
+    route_points_per_leg: int = 200
+    incidents: int = 20
+    # First forecast time; None is the current time rounded down to 3 hours
+    start: Optional[datetime] = None
+
+
+def _unit(*parts: Any) -> float:
+    """Deterministic value in [0, 1) from the given parts."""
+    digest = hashlib.sha256('|'.join(map(str, parts)).encode()).digest()
+    return int.from_bytes(digest[:8], 'big') / 2 ** 64
+
+
+class StandInData:
+    """Builds the response bodies."""
+
+    def __init__(self, config: StandInConfig):
+        self.config = config
+
+    def _start(self) -> datetime:
+        if self.config.start:
+            return self.config.start.astimezone(timezone.utc)
+        now = datetime.now(timezone.utc)
+        return now.replace(hour=now.hour - now.hour % 3, minute=0, second=0, microsecond=0)
+
+    def _conditions(self, lat: float, lon: float, step: int) -> Dict[str, Any]:
+        """Weather at a point for a 3-hour step: a cold spell with snow bands passing through."""
+        seed = self.config.seed
+        phase = _unit(seed, 'phase', round(lat, 2), round(lon, 2)) * 2 * math.pi
+        temp = -4.0 + 5.0 * math.sin(phase + step * math.pi / 4) - 2.0 * _unit(seed, 'temp', lat, lon, step)
+        snowing = _unit(seed, 'snow', round(lat, 1), round(lon, 1), step // 2) < 0.45 and temp < 1.5
+        snow_3h = round(0.2 + 4.0 * _unit(seed, 'amount', lat, lon, step), 2) if snowing else 0.0
+        return {
+            "main": {
+                "temp": round(temp, 2),
+                "feels_like": round(temp - 4, 2),
+                "humidity": int(60 + 35 * _unit(seed, 'humidity', lat, lon, step)),
+                "pressure": 1008
+            },
+            "weather": [{
+                "id": SNOW_IDS[int(_unit(seed, 'kind', step) * 3)] if snowing else 804,
+                "main": "Snow" if snowing else "Clouds",
+                "description": "snow" if snowing else "overcast clouds",
+                "icon": "13n" if snowing else "04n"
+            }],
+            "clouds": {"all": int(100 if snowing else 40 + 60 * _unit(seed, 'clouds', lat, lon, step))},
+            "wind": {"speed": round(1 + 9 * _unit(seed, 'wind', lat, lon, step), 2), "deg": 270},
+            **({"snow": {"3h": snow_3h}} if snowing else {})
+        }
+
+    def weather(self, lat: float, lon: float) -> dict:
+        start = self._start()
+        body = self._conditions(lat, lon, 0)
+        if "snow" in body:
+            body["snow"] = {"1h": round(body["snow"]["3h"] / 3, 2)}
+        day = start.replace(hour=0)
+        return {
+            "coord": {"lat": lat, "lon": lon},
+            **body,
+            "dt": int(start.timestamp()),
+            "sys": {"sunrise": int((day + timedelta(hours=12)).timestamp()),
+                    "sunset": int((day + timedelta(hours=21, minutes=30)).timestamp())},
+            "name": "Stand-in"
+        }
+
+    def forecast(self, lat: float, lon: float, count: int) -> dict:
+        start = self._start()
+        entries = []
+        for step in range(max(1, min(count, 40))):
+            at = start + timedelta(seconds=step * FORECAST_STEP_S)
+            entries.append({
+                "dt": int(at.timestamp()),
+                **self._conditions(lat, lon, step),
+                "sys": {"pod": "d" if 12 <= at.hour < 21 else "n"},
+                "dt_txt": at.strftime('%Y-%m-%d %H:%M:%S')
+            })
+        return {"cod": "200", "cnt": len(entries), "list": entries,
+                "city": {"name": "Stand-in", "coord": {"lat": lat, "lon": lon}}}
+
+    def incidents(self, bbox: Tuple[float, float, float, float]) -> dict:
+        min_lon, min_lat, max_lon, max_lat = bbox
+        seed = self.config.seed
+        features = []
+        for i in range(self.config.incidents):
+            lat = min_lat + (max_lat - min_lat) * _unit(seed, 'inc-lat', bbox, i)
+            lon = min_lon + (max_lon - min_lon) * _unit(seed, 'inc-lon', bbox, i)
+            category = (1, 6, 7, 8, 9)[int(_unit(seed, 'inc-cat', bbox, i) * 5)]
+            length = int(50 + 950 * _unit(seed, 'inc-len', bbox, i))
+            if _unit(seed, 'inc-shape', bbox, i) < 0.5:
+                geometry = {"type": "Point", "coordinates": [round(lon, 6), round(lat, 6)]}
+            else:
+                # A short street-aligned stretch of `length` metres
+                dlon = length / (111320 * math.cos(math.radians(lat)))
+                geometry = {"type": "LineString",
+                            "coordinates": [[round(lon, 6), round(lat, 6)], [round(lon + dlon, 6), round(lat, 6)]]}
+            start = self._start() - timedelta(minutes=int(240 * _unit(seed, 'inc-start', bbox, i)))
+            features.append({
+                "type": "Feature",
+                "geometry": geometry,
+                "properties": {
+                    "iconCategory": category,
+                    "startTime": start.isoformat(),
+                    "endTime": (start + timedelta(hours=6)).isoformat(),
+                    "length": length
+                }
+            })
+        return {"incidents": features}
+
+    def route(self, waypoints: List[Tuple[float, float]]) -> dict:
+        """Polyline through the waypoints with a gentle deterministic bend on every leg."""
+        seed = self.config.seed
+        per_leg = max(2, self.config.route_points_per_leg)
+        departure = self._start()
+        legs, total_m, total_s, delay_s = [], 0.0, 0.0, 0.0
+        clock = departure
+        for (lat1, lon1), (lat2, lon2) in zip(waypoints, waypoints[1:]):
+            bend = (_unit(seed, 'bend', lat1, lon1, lat2, lon2) - 0.5) * 0.2
+            points = []
+            for k in range(per_leg):
+                t = k / (per_leg - 1)
+                offset = bend * math.sin(math.pi * t)
+                points.append({
+                    "latitude": round(lat1 + (lat2 - lat1) * t - (lon2 - lon1) * offset, 6),
+                    "longitude": round(lon1 + (lon2 - lon1) * t + (lat2 - lat1) * offset, 6)
+                })
+            length_m = sum(
+                _haversine_m(a["latitude"], a["longitude"], b["latitude"], b["longitude"])
+                for a, b in zip(points, points[1:])
+            )
+            free_s = length_m / (40 / 3.6)
+            leg_delay = free_s * 0.3 * _unit(seed, 'delay', lat1, lon1, lat2, lon2)
+            arrival = clock + timedelta(seconds=free_s + leg_delay)
+            legs.append({
+                "summary": {
+                    "lengthInMeters": int(length_m),
+                    "travelTimeInSeconds": int(free_s + leg_delay),
+                    "trafficDelayInSeconds": int(leg_delay),
+                    "departureTime": clock.isoformat(),
+                    "arrivalTime": arrival.isoformat()
+                },
+                "points": points
+            })
+            clock = arrival
+            total_m += length_m
+            total_s += free_s + leg_delay
+            delay_s += leg_delay
+        return {
+            "formatVersion": "0.0.12",
+            "routes": [{
+                "summary": {
+                    "lengthInMeters": int(total_m),
+                    "travelTimeInSeconds": int(total_s),
+                    "trafficDelayInSeconds": int(delay_s),
+                    "trafficLengthInMeters": int(total_m * 0.2),
+                    "departureTime": departure.isoformat(),
+                    "arrivalTime": clock.isoformat()
+                },
+                "legs": legs
+            }]
+        }
+
+    def flow(self, lat: float, lon: float) -> dict:
+        seed = self.config.seed
+        # Speeds are constant over ~100 m so nearby samples agree, as on a real road
+        cell = (round(lat, 3), round(lon, 3))
+        free = (30, 40, 50, 70, 90)[int(_unit(seed, 'frc', cell) * 5)]
+        ratio = 0.25 + 0.8 * _unit(seed, 'ratio', cell)
+        closed = _unit(seed, 'closed', cell) < 0.01
+        current = 0 if closed else max(1, int(free * min(ratio, 1.0)))
+        return {"flowSegmentData": {
+            "frc": f"FRC{int(_unit(seed, 'frc', cell) * 5)}",
+            "currentSpeed": current,
+            "freeFlowSpeed": free,
+            "currentTravelTime": int(360 / max(current, 1) * 10),
+            "freeFlowTravelTime": int(360 / free * 10),
+            "confidence": round(0.7 + 0.3 * _unit(seed, 'conf', cell), 2),
+            "roadClosure": closed,
+            "coordinates": {"coordinate": [{"latitude": lat, "longitude": lon}]}
+        }}
+
+    def matrix(self, body: dict) -> dict:
+        def points(key: str) -> List[Tuple[float, float]]:
+            return [(p['point']['latitude'], p['point']['longitude']) for p in body.get(key) or []]
+
+        origins, destinations = points('origins'), points('destinations')
+        distance_km, duration_s = estimate_matrices(origins, destinations)
+        data = [
+            {"originIndex": i, "destinationIndex": j,
+             "routeSummary": {"lengthInMeters": int(distance_km[i, j] * 1000),
+                              "travelTimeInSeconds": int(duration_s[i, j]),
+                              "trafficDelayInSeconds": 0}}
+            for i in range(len(origins)) for j in range(len(destinations))
+        ]
+        return {"data": data, "statistics": {"totalCount": len(data), "successes": len(data), "failures": 0}}
+
+
+def _haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    a = math.sin((p2 - p1) / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2
+    return 2 * 6371008.8 * math.asin(math.sqrt(min(a, 1.0)))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: '_Server'
+
+    def _route(self) -> Tuple[Optional[str], Dict[str, str], str]:
+        url = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        path = url.path
+        if path == f'{OPENWEATHER_PREFIX}/weather':
+            return 'weather', query, path
+        if path == f'{OPENWEATHER_PREFIX}/forecast':
+            return 'forecast', query, path
+        if path.startswith('/traffic/services/') and path.endswith('/incidentDetails'):
+            return 'incidents', query, path
+        if path.startswith('/routing/1/calculateRoute/'):
+            return 'route', query, path
+        if path.startswith('/traffic/services/4/flowSegmentData/'):
+            return 'flow', query, path
+        if path.startswith('/routing/matrix/2'):
+            return 'matrix', query, path
+        return None, query, path
+
+    def _body(self, endpoint: str, query: Dict[str, str], path: str, payload: Optional[dict]) -> dict:
+        data = StandInData(self.server.config)
+        if endpoint == 'weather':
+            return data.weather(float(query['lat']), float(query['lon']))
+        if endpoint == 'forecast':
+            return data.forecast(float(query['lat']), float(query['lon']), int(query.get('cnt', 40)))
+        if endpoint == 'incidents':
+            min_lon, min_lat, max_lon, max_lat = (float(v) for v in query['bbox'].split(','))
+            return data.incidents((min_lon, min_lat, max_lon, max_lat))
+        if endpoint == 'route':
+            locations = unquote(path[len('/routing/1/calculateRoute/'):].rsplit('/', 1)[0])
+            waypoints = [tuple(float(v) for v in pair.split(',')) for pair in locations.split(':')]
+            if len(waypoints) < 2:
+                raise ValueError("At least two waypoints are required")
+            return data.route(waypoints)
+        if endpoint == 'flow':
+            lat, lon = (float(v) for v in query['point'].split(','))
+            return data.flow(lat, lon)
+        return data.matrix(payload or {})
+
+    def _respond(self, method: str) -> None:
+        endpoint, query, path = self._route()
+        if endpoint is None or (endpoint == 'matrix') != (method == 'POST'):
+            self._send(404, {"error": f"No stand-in for {method} {path}"})
+            return
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        config = self.server.config
+        # Each repeat of the same request is a new attempt with its own latency and error draw
+        attempt = self.server.attempt(self.path + raw.decode('utf-8', 'replace'))
+        delay = config.endpoint_latency_ms.get(endpoint, config.latency_ms)
+        delay += config.jitter_ms * _unit(config.seed, 'jitter', self.path, attempt)
+        if delay > 0:
+            time.sleep(delay / 1000)
+        self.server.count('requests', endpoint)
+        failing = config.error_endpoints is None or endpoint in config.error_endpoints
+        if failing and config.error_rate > 0 and _unit(config.seed, 'error', self.path, attempt) < config.error_rate:
+            self.server.count('errors', endpoint)
+            self._send(config.error_status, {"error": "Injected error", "endpoint": endpoint})
+            return
+        try:
+            body = self._body(endpoint, query, path, json.loads(raw) if raw else None)
+        except (KeyError, ValueError) as e:
+            self._send(400, {"error": f"Bad request: {e}"})
+            return
+        self._send(200, body)
+
+    def _send(self, status: int, body: dict) -> None:
+        payload = json.dumps(body, separators=(',', ':')).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        self._respond('GET')
+
+    def do_POST(self):
+        self._respond('POST')
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], config: StandInConfig):
+        super().__init__(address, _Handler)
+        self.config = config
+        self._lock = threading.Lock()
+        self._attempts: Counter = Counter()
+        self.stats: Dict[str, Counter] = {'requests': Counter(), 'errors': Counter()}
+
+    def attempt(self, key: str) -> int:
+        with self._lock:
+            self._attempts[key] += 1
+            return self._attempts[key]
+
+    def count(self, kind: str, endpoint: str) -> None:
+        with self._lock:
+            self.stats[kind][endpoint] += 1
+
+
+class StandInServer:
+    """
+    The stand-in on a background thread.
+
+        with StandInServer(StandInConfig(latency_ms=50)) as server:
+            tool = TomTomTrafficTool(api_key="x", base_url=server.tomtom_url)
+    """
+
+    def __init__(self, config: Optional[StandInConfig] = None, host: str = '127.0.0.1', port: int = 0):
+        self._server = _Server((host, port), config or StandInConfig())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def config(self) -> StandInConfig:
+        return self._server.config
+
+    @config.setter
+    def config(self, config: StandInConfig) -> None:
+        self._server.config = config
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def openweather_url(self) -> str:
+        return self.url + OPENWEATHER_PREFIX
+
+    @property
+    def tomtom_url(self) -> str:
+        return self.url
+
+    def start(self) -> 'StandInServer':
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, name='olaf-standin', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread = None
+        self._server.server_close()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Requests served and errors injected, per endpoint."""
+        with self._server._lock:
+            return {kind: dict(counter) for kind, counter in self._server.stats.items()}
+
+    def reset_stats(self) -> None:
+        with self._server._lock:
+            self._server._attempts.clear()
+            for counter in self._server.stats.values():
+                counter.clear()
+
+    def __enter__(self) -> 'StandInServer':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local stand-in for the OpenWeather and TomTom APIs")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--endpoint-latency', action='append', default=[], metavar='ENDPOINT=MS',
+                        help=f"Latency for one endpoint ({', '.join(ENDPOINTS)}); repeatable")
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--error-endpoints', default=None, help="Comma-separated endpoints that may fail")
+    parser.add_argument('--route-points', type=int, default=200, help="Route points per leg")
+    parser.add_argument('--incidents', type=int, default=20, help="Incidents per bounding box")
+    args = parser.parse_args()
+
+    endpoint_latency = {}
+    for item in args.endpoint_latency:
+        name, _, ms = item.partition('=')
+        if name not in ENDPOINTS:
+            parser.error(f"Unknown endpoint '{name}'; choose from {', '.join(ENDPOINTS)}")
+        endpoint_latency[name] = float(ms)
+    config = StandInConfig(
+        seed=args.seed, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        endpoint_latency_ms=endpoint_latency, error_rate=args.error_rate, error_status=args.error_status,
+        error_endpoints=frozenset(args.error_endpoints.split(',')) if args.error_endpoints else None,
+        route_points_per_leg=args.route_points, incidents=args.incidents
+    )
+    server = StandInServer(config, host=args.host, port=args.port)
+    print(f"Stand-in API on {server.url}")
+    print(f"  export OLAF_OPENWEATHER_BASE_URL={server.openweather_url}")
+    print(f"  export OLAF_TOMTOM_BASE_URL={server.tomtom_url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(json.dumps(server.stats()))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,22 @@
 from crewai.tools import BaseTool
-from typing import Type, List, Optional, Dict
+from typing import Type, List, Optional, Dict, ClassVar
 from pydantic import BaseModel, Field
 import requests
+from . import http_client
+from .artifact_store import get_artifact_store
+from .compaction import compact_traffic
+from .response_cache import ResponseCache
+from .route_geometry import RouteGeometry, strip_points
+from .spatial_index import annotate_route
+from .traffic_flow import RouteSegment, compact_flow, segment_route, speed_profile, tile_key
 import os
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
 import json
+import time
+
+# Flow observations per map tile, shared by every TomTomTrafficTool instance
+flow_cache = ResponseCache(max_entries=int(os.getenv('OLAF_FLOW_CACHE_SIZE', '1024')))
 
 class TomTomTrafficToolInput(BaseModel):
     """Input schema for TomTomTrafficTool."""
@@ -20,9 +32,24 @@ class TomTomTrafficTool(BaseTool):
     args_schema: Type[BaseModel] = TomTomTrafficToolInput
     api_key: Optional[str] = None
     base_url: str = "https://api.tomtom.com"
+    # Per-call timeout (seconds) applied to each TomTom endpoint
+    request_timeout: float = 10.0
+    # Overall budget (seconds) for the concurrent fetch, including HTTP retries
+    deadline: float = 30.0
+    # Flow sampling along the route: target spacing, sample cap, concurrency,
+    # cache tile size (zoom 17 tiles are ~200 m across) and cache lifetime
+    flow_sample_spacing_m: float = 500.0
+    max_flow_samples: int = 40
+    flow_workers: int = 8
+    flow_tile_zoom: int = 17
+    flow_ttl: int = 120
+    # Incidents closer than this (metres) to the route are attached to its segments
+    incident_radius_m: float = 50.0
+    # Return a bounded summary plus an artifact handle instead of the full payload
+    compact_output: bool = os.getenv('OLAF_COMPACT_TOOL_OUTPUT', '1') != '0'
     
     # Region to coordinates mapping
-    region_coordinates: Dict[str, List[List[float]]] = {
+    region_coordinates: ClassVar[Dict[str, List[List[float]]]] = {
         "Toronto": [
             [43.6532, -79.3832],  # Downtown Toronto
             [43.7046, -79.3590],  # North York
@@ -43,11 +70,16 @@ class TomTomTrafficTool(BaseTool):
         ]
     }
     
-    def __init__(self):
-        super().__init__()
-        self.api_key = os.getenv('TOMTOM_API_KEY')
-        if not self.api_key:
-            raise ValueError("TOMTOM_API_KEY environment variable is required")
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None, **kwargs):
+        """
+        Args:
+            api_key: TomTom key; defaults to TOMTOM_API_KEY
+            base_url: API root; defaults to OLAF_TOMTOM_BASE_URL, else the public API
+                (point it at a stand-in server, see standin_api.py, to run offline)
+        """
+        super().__init__(**kwargs)
+        self.api_key = api_key or os.getenv('TOMTOM_API_KEY')
+        self.base_url = base_url or os.getenv('OLAF_TOMTOM_BASE_URL') or self.base_url
         
     def _get_traffic_incidents(self, bbox: str) -> dict:
         """Get traffic incidents in the specified bounding box."""
@@ -62,7 +94,7 @@ class TomTomTrafficTool(BaseTool):
             'timeValidityFilter': 'present'
         }
         
-        response = requests.get(endpoint, params=params)
+        response = http_client.get(endpoint, params=params, timeout=self.request_timeout)
         response.raise_for_status()
         return response.json()
     
@@ -79,35 +111,114 @@ class TomTomTrafficTool(BaseTool):
             'travelMode': 'truck'  # Appropriate for snow removal vehicles
         }
         
-        response = requests.get(endpoint, params=params)
+        response = http_client.get(endpoint, params=params, timeout=self.request_timeout)
         response.raise_for_status()
         return response.json()
     
-    def _get_traffic_flow(self, coordinates: List[List[float]]) -> dict:
-        """Get traffic flow data along the route."""
-        # Calculate the bounding box from the coordinates
-        lats = [coord[0] for coord in coordinates]
-        lons = [coord[1] for coord in coordinates]
-        min_lat = max(min(lats), -90)
-        max_lat = min(max(lats), 90)
-        min_lon = max(min(lons), -180)
-        max_lon = min(max(lons), 180)
-        # Compute the center of the bounding box
-        center_lat = (min_lat + max_lat) / 2
-        center_lon = (min_lon + max_lon) / 2
-        point = f"{center_lat:.6f},{center_lon:.6f}"
-        
+    def _get_flow_at(self, lat: float, lon: float) -> dict:
+        """Get flow on the road nearest to a point (cached per map tile for `flow_ttl` seconds)."""
+        # Keyed by base URL too so a stand-in server and the real API never share entries
+        key = f"{self.base_url}/{tile_key(lat, lon, self.flow_tile_zoom)}"
+        return flow_cache.get_or_fetch(key, self.flow_ttl, lambda: self._fetch_flow_at(lat, lon))
+    
+    def _fetch_flow_at(self, lat: float, lon: float) -> dict:
+        """Fetch flow segment data for a single point from the API."""
         # Flow Segment Data endpoint expects a point, not a bbox.
         endpoint = f"{self.base_url}/traffic/services/4/flowSegmentData/absolute/10/json"
         params = {
             'key': self.api_key,
-            'point': point,
+            'point': f"{lat:.6f},{lon:.6f}",
             'unit': 'KMPH'
         }
         
-        response = requests.get(endpoint, params=params)
+        response = http_client.get(endpoint, params=params, timeout=self.request_timeout)
         response.raise_for_status()
-        return response.json()
+        return compact_flow(response.json())
+    
+    def _get_traffic_flow(self, segments: List[RouteSegment], deadline: Optional[float] = None) -> dict:
+        """
+        Get a per-segment speed profile along a route.
+        
+        Args:
+            segments: Route segments to sample (see traffic_flow.segment_route)
+            deadline: Seconds allowed for all flow requests; defaults to `deadline`
+            
+        Returns:
+            Speed profile with per-segment speeds and a travel-time summary
+        """
+        tiles = [tile_key(s.latitude, s.longitude, self.flow_tile_zoom) for s in segments]
+        # One request per tile, however many segments fall in it
+        calls = {}
+        for segment, tile in zip(segments, tiles):
+            calls.setdefault(tile, (self._get_flow_at, (segment.latitude, segment.longitude)))
+        fetched = self._fetch_concurrently(calls, deadline=deadline, max_workers=self.flow_workers)
+        
+        profile = speed_profile(segments, tiles, fetched)
+        profile["requests"] = len(calls)
+        profile["spacing_m"] = round(segments[-1].length_m) if segments else 0
+        if fetched["errors"]:
+            profile["errors"] = fetched["errors"]
+            if len(fetched["errors"]) == len(calls):
+                raise RuntimeError(f"All {len(calls)} flow requests failed")
+        return profile
+
+    def _fetch_concurrently(
+        self,
+        calls: Dict[str, tuple],
+        deadline: Optional[float] = None,
+        max_workers: Optional[int] = None
+    ) -> dict:
+        """
+        Issue independent API calls in parallel and collect whatever succeeded.
+        
+        Args:
+            calls: Mapping of result key to a (method, args) pair
+            deadline: Overall time budget in seconds; defaults to `deadline`
+            max_workers: Concurrent calls; defaults to one thread per call
+            
+        Returns:
+            Dict with one entry per key (None when the call failed), an "errors"
+            mapping for failed calls and per-call "timings_ms"
+        """
+        results: Dict[str, Optional[dict]] = {key: None for key in calls}
+        errors: Dict[str, str] = {}
+        timings: Dict[str, float] = {}
+        
+        def timed(key, method, args):
+            started = time.perf_counter()
+            try:
+                return method(*args)
+            finally:
+                timings[key] = round((time.perf_counter() - started) * 1000, 1)
+        
+        deadline = self.deadline if deadline is None else deadline
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers or len(calls), len(calls))),
+            thread_name_prefix="tomtom"
+        )
+        try:
+            futures = {
+                executor.submit(timed, key, method, args): key
+                for key, (method, args) in calls.items()
+            }
+            # The request timeout bounds each socket operation and the shared
+            # client may retry, so cap the whole fetch with an overall deadline
+            done, not_done = wait(futures, timeout=deadline)
+            for future in done:
+                key = futures[future]
+                try:
+                    results[key] = future.result()
+                except Exception as e:
+                    errors[key] = str(e)
+            for future in not_done:
+                future.cancel()
+                errors[futures[future]] = f"Timed out after {deadline:.1f}s"
+        finally:
+            executor.shutdown(wait=False)
+        
+        results["errors"] = errors
+        results["timings_ms"] = dict(timings)
+        return results
 
     def _run(self, region: str, route_type: str = "fastest") -> str:
         """
@@ -118,8 +229,16 @@ class TomTomTrafficTool(BaseTool):
             route_type: Type of route optimization (fastest/shortest)
             
         Returns:
-            JSON string containing traffic data, incidents, and optimized route
+            JSON string containing traffic data, incidents, and optimized route (its shape
+            as an encoded polyline in "route_geometry")
         """
+        # A key is only needed for the public API, not for a stand-in or replayed fixtures
+        if not self.api_key and self.base_url == type(self).model_fields['base_url'].default \
+                and http_client.get_config().fixture_mode != 'replay':
+            return json.dumps({
+                "error": "Missing API key",
+                "details": "Set TOMTOM_API_KEY, or OLAF_TOMTOM_BASE_URL to use a stand-in server"
+            })
         try:
             # Get coordinates for the region
             coordinates = self.region_coordinates.get(region)
@@ -139,20 +258,55 @@ class TomTomTrafficTool(BaseTool):
             max_lat = min(max(lats), 90)
             bbox = f"{min_lon:.6f},{min_lat:.6f},{max_lon:.6f},{max_lat:.6f}"
             
-            # Gather all required data
-            incidents = self._get_traffic_incidents(bbox)
-            route = self._calculate_route(coordinates, route_type)
-            flow = self._get_traffic_flow(coordinates)
-            
-            # Compile results
+            # Incidents and the route are independent, so fetch them concurrently;
+            # flow is then sampled along the route geometry
+            started = time.perf_counter()
             result = {
                 "timestamp": datetime.now().isoformat(),
                 "region": region,
-                "traffic_incidents": incidents,
-                "optimized_route": route,
-                "traffic_flow": flow
             }
+            result.update(self._fetch_concurrently({
+                "traffic_incidents": (self._get_traffic_incidents, (bbox,)),
+                "optimized_route": (self._calculate_route, (coordinates, route_type)),
+            }))
+            
+            # The route shape is kept as one compact geometry (an encoded polyline in the
+            # output) instead of a dict per point in every leg
+            geometry = RouteGeometry.from_tomtom(result["optimized_route"])
+            if len(geometry):
+                result["optimized_route"] = strip_points(result["optimized_route"])
+                result["route_geometry"] = geometry.to_dict()
+            else:
+                # Without a route, sample along the straight lines between waypoints
+                geometry = RouteGeometry.from_points(tuple(c) for c in coordinates)
+            points = geometry.coords
+            segments = segment_route(points, self.flow_sample_spacing_m, self.max_flow_samples)
+            remaining = max(self.deadline - (time.perf_counter() - started), 0.0)
+            flow_started = time.perf_counter()
+            try:
+                result["traffic_flow"] = self._get_traffic_flow(segments, deadline=remaining)
+            except Exception as e:
+                result["traffic_flow"] = None
+                result["errors"]["traffic_flow"] = str(e)
+            result["timings_ms"]["traffic_flow"] = round((time.perf_counter() - flow_started) * 1000, 1)
+            
+            # Match incidents to the route segments they affect (segment numbers follow traffic_flow)
+            if result["traffic_incidents"] is not None:
+                result["route_incidents"] = annotate_route(
+                    points, segments,
+                    result["traffic_incidents"].get("incidents") or [],
+                    self.incident_radius_m
+                )
+            
+            if all(result[key] is None for key in ("traffic_incidents", "optimized_route", "traffic_flow")):
+                return json.dumps({
+                    "error": "Traffic API request failed",
+                    "details": result["errors"]
+                })
             
+            if self.compact_output:
+                handle = get_artifact_store().put('traffic', result)
+                return json.dumps(compact_traffic(result, handle), indent=2)
             return json.dumps(result, indent=2)
             
         except requests.exceptions.RequestException as e:
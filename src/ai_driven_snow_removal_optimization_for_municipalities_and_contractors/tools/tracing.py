@@ -0,0 +1,382 @@
+"""
+Timing spans for tool calls, HTTP requests, report rendering and crew tasks.
+
+With OLAF_TRACE=1 the following are recorded as spans (name, category,
+start, duration, thread and payload sizes):
+    tool    every tool `_run` (tools are wrapped by the tool registry)
+    http    every request through the shared HTTP client, named by endpoint
+    render  every report section rendered
+    task    every crew task, with the tokens its agent used
+    llm     every LLM call, with prompt and response sizes
+
+Spans are collected process-wide. `trace_run()` (used by main.py) writes
+a run's spans as a Chrome trace file under OLAF_TRACE_DIR (default
+.cache/traces), which opens in chrome://tracing or https://ui.perfetto.dev,
+with a per-span summary in its "otherData". OLAF_REPORT_TIMINGS=1 adds
+that summary to the generated report as a "Run Timings" section.
+
+With tracing off a span costs one attribute check.
+"""
+import functools
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+
+CATEGORIES = ('task', 'llm', 'tool', 'http', 'render')
+# Spans listed in the summary (the longest by total time)
+SUMMARY_SPANS = 25
+# Path segments with coordinates, ids or dates, replaced to group HTTP spans by endpoint
+VARIABLE_SEGMENT = re.compile(r'^(?=.*\d).{4,}$')
+
+
+@dataclass
+class Span:
+    """One timed operation."""
+    name: str
+    category: str
+    # time.perf_counter() seconds
+    start: float
+    duration_ms: float
+    thread_id: int
+    thread_name: str
+    args: Dict[str, Any] = field(default_factory=dict)
+
+
+class _NoopSpan:
+    """Stands in for a span while tracing is off."""
+
+    def __enter__(self) -> Dict[str, Any]:
+        return {}
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class _ActiveSpan:
+    def __init__(self, tracer: 'Tracer', name: str, category: str, args: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self) -> Dict[str, Any]:
+        self.start = time.perf_counter()
+        return self.args
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        self.tracer.record(self.name, self.category, self.start, time.perf_counter(), **self.args)
+        return False
+
+
+class Tracer:
+    """
+    Thread-safe span collector.
+
+    Args:
+        enabled: Record spans; when False `span()` returns a no-op context
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._spans: List[Span] = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._started_at = datetime.now()
+
+    def span(self, name: str, category: str, **args) -> Union[_ActiveSpan, _NoopSpan]:
+        """
+        Context manager timing the enclosed block.
+
+        The context value is the span's args dict; add sizes or counts to it
+        inside the block (e.g. `span['output_bytes'] = len(body)`).
+        """
+        if not self.enabled:
+            return _NOOP
+        return _ActiveSpan(self, name, category, args)
+
+    def record(self, name: str, category: str, start: float, end: float, **args) -> None:
+        """Add a span measured elsewhere (start and end from time.perf_counter())."""
+        if not self.enabled:
+            return
+        thread = threading.current_thread()
+        span = Span(name, category, start, round((end - start) * 1000, 3), thread.ident, thread.name, args)
+        with self._lock:
+            self._spans.append(span)
+
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def reset(self) -> None:
+        """Drop every span and restart the trace clock."""
+        with self._lock:
+            self._spans.clear()
+            self._origin = time.perf_counter()
+            self._started_at = datetime.now()
+
+    def summary(self, limit: int = SUMMARY_SPANS) -> Dict[str, Any]:
+        """
+        Totals per category and per span name.
+
+        Returns:
+            {"wall_ms", "span_count", "categories": {category: {"count", "total_ms"}},
+             "spans": [{"category", "name", "count", "total_ms", "max_ms", "input_bytes",
+             "output_bytes", "tokens", "errors"}, ...]} with the `limit` longest span names
+        """
+        spans = self.spans()
+        categories: Dict[str, Dict[str, float]] = {}
+        grouped: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for span in spans:
+            category = categories.setdefault(span.category, {"count": 0, "total_ms": 0.0})
+            category["count"] += 1
+            category["total_ms"] += span.duration_ms
+            entry = grouped.setdefault((span.category, span.name), {
+                "category": span.category, "name": span.name, "count": 0, "total_ms": 0.0,
+                "max_ms": 0.0, "input_bytes": 0, "output_bytes": 0, "tokens": 0, "errors": 0
+            })
+            entry["count"] += 1
+            entry["total_ms"] += span.duration_ms
+            entry["max_ms"] = max(entry["max_ms"], span.duration_ms)
+            entry["input_bytes"] += span.args.get('input_bytes') or 0
+            entry["output_bytes"] += span.args.get('output_bytes') or 0
+            entry["tokens"] += span.args.get('total_tokens') or 0
+            entry["errors"] += 1 if span.args.get('error') else 0
+        for values in list(categories.values()) + list(grouped.values()):
+            for key in ('total_ms', 'max_ms'):
+                if key in values:
+                    values[key] = round(values[key], 1)
+        wall_ms = 0.0
+        if spans:
+            wall_ms = (max(s.start + s.duration_ms / 1000 for s in spans) - min(s.start for s in spans)) * 1000
+        ordered = sorted(grouped.values(), key=lambda entry: entry["total_ms"], reverse=True)
+        return {
+            "wall_ms": round(wall_ms, 1),
+            "span_count": len(spans),
+            "categories": {
+                name: categories[name]
+                for name in sorted(categories, key=lambda c: CATEGORIES.index(c) if c in CATEGORIES else len(CATEGORIES))
+            },
+            "spans": ordered[:limit]
+        }
+
+    def summary_line(self) -> str:
+        summary = self.summary()
+        totals = ', '.join(
+            f"{name} {values['total_ms'] / 1000:.1f}s/{values['count']}"
+            for name, values in summary["categories"].items()
+        )
+        return f"{summary['span_count']} span(s) over {summary['wall_ms'] / 1000:.1f}s: {totals or 'none'}"
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """The spans in Chrome trace event format ("X" events, microseconds from the trace start)."""
+        pid = os.getpid()
+        spans = self.spans()
+        events: List[Dict[str, Any]] = []
+        threads = {}
+        for span in spans:
+            threads.setdefault(span.thread_id, span.thread_name)
+            events.append({
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": round((span.start - self._origin) * 1e6, 1),
+                "dur": round(span.duration_ms * 1000, 1),
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": span.args
+            })
+        for thread_id, thread_name in threads.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": thread_id,
+                           "args": {"name": thread_name}})
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "started_at": self._started_at.isoformat(timespec='seconds'),
+                "summary": self.summary()
+            }
+        }
+
+    def export(self, label: str = 'run', directory: Optional[Union[str, Path]] = None) -> Path:
+        """
+        Write the Chrome trace to `directory` (default OLAF_TRACE_DIR or .cache/traces).
+
+        Returns:
+            Path of the trace file, trace-<label>-<start time>.json
+        """
+        directory = Path(directory or os.getenv('OLAF_TRACE_DIR') or PROJECT_ROOT / '.cache' / 'traces')
+        directory.mkdir(parents=True, exist_ok=True)
+        safe_label = re.sub(r'[^A-Za-z0-9_.-]+', '_', label).strip('_') or 'run'
+        path = directory / f"trace-{safe_label}-{self._started_at.strftime('%Y%m%d-%H%M%S')}.json"
+        tmp = path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f, default=str)
+        os.replace(tmp, path)
+        return path
+
+
+# Shared by every tool, HTTP call and crew in this process
+tracer = Tracer(enabled=os.getenv('OLAF_TRACE', '0') == '1')
+
+
+def trace_enabled() -> bool:
+    return tracer.enabled
+
+
+@contextmanager
+def trace_run(label: str) -> Iterator[Optional[Tracer]]:
+    """
+    Trace one run: start from an empty trace and write it out when the block exits.
+
+    Does nothing unless tracing is enabled.
+    """
+    if not tracer.enabled:
+        yield None
+        return
+    tracer.reset()
+    try:
+        yield tracer
+    finally:
+        path = tracer.export(label)
+        print(f"Trace: {path} ({tracer.summary_line()})")
+
+
+def _payload_bytes(value: Any) -> int:
+    if isinstance(value, str):
+        return len(value.encode('utf-8', errors='replace'))
+    if isinstance(value, bytes):
+        return len(value)
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return len(str(value))
+
+
+def instrument_tool(tool: Any) -> Any:
+    """
+    Wrap a tool instance's `_run` in a "tool" span with input and output sizes.
+
+    The wrapper checks `tracer.enabled` on every call, so tools instrumented
+    at construction time start reporting as soon as tracing is turned on.
+    """
+    run = tool._run
+    if getattr(run, '_olaf_traced', False):
+        return tool
+    name = type(tool).__name__
+
+    @functools.wraps(run)
+    def traced_run(*args, **kwargs):
+        if not tracer.enabled:
+            return run(*args, **kwargs)
+        with tracer.span(name, 'tool') as span:
+            span['input_bytes'] = _payload_bytes([args, kwargs] if args else kwargs)
+            result = run(*args, **kwargs)
+            span['output_bytes'] = _payload_bytes(result)
+            return result
+
+    traced_run._olaf_traced = True
+    # Tools are pydantic models; set the wrapper on the instance without validation
+    object.__setattr__(tool, '_run', traced_run)
+    return tool
+
+
+def endpoint_name(url: str) -> str:
+    """Host and path of a URL with coordinate, id and date segments replaced by '*'."""
+    parts = urlsplit(url)
+    segments = ['*' if VARIABLE_SEGMENT.match(segment) else segment for segment in parts.path.split('/')]
+    return f"{parts.netloc}{'/'.join(segments)}"
+
+
+_crew_lock = threading.Lock()
+_crew_instrumented = False
+# Task running in each thread, so LLM spans can name it
+_current = threading.local()
+
+
+def _task_name(task: Any) -> str:
+    return getattr(task, 'name', None) or str(getattr(task, 'description', 'task'))[:60]
+
+
+def _token_usage(task: Any) -> Dict[str, int]:
+    process = getattr(getattr(task, 'agent', None), '_token_process', None)
+    return {
+        key: getattr(process, key, 0) or 0
+        for key in ('prompt_tokens', 'completion_tokens', 'total_tokens', 'successful_requests')
+    }
+
+
+def instrument_crew() -> None:
+    """
+    Record crew tasks and LLM calls as spans.
+
+    Wraps `Task.execute_sync` and `LLM.call` on the classes, which exist with
+    the same role on every crewai version (scheduling.py runs background tasks
+    through `Task.execute_sync` too). Task spans carry the tokens the task's
+    agent used while it ran, from the agent's token counter (the usage the LLM
+    API reported); LLM spans name the task that made the call. Like the tool
+    wrappers, both check `tracer.enabled` on every call. Safe to call more than once.
+    """
+    global _crew_instrumented
+    with _crew_lock:
+        if _crew_instrumented:
+            return
+        _crew_instrumented = True
+
+    from crewai import LLM, Task
+
+    execute_sync = Task.execute_sync
+    llm_call = LLM.call
+
+    @functools.wraps(execute_sync)
+    def traced_execute_sync(task, *args, **kwargs):
+        if not tracer.enabled:
+            return execute_sync(task, *args, **kwargs)
+        before = _token_usage(task)
+        previous, _current.task = getattr(_current, 'task', None), task
+        start = time.perf_counter()
+        args_out: Dict[str, Any] = {}
+        try:
+            output = execute_sync(task, *args, **kwargs)
+            args_out['output_bytes'] = _payload_bytes(getattr(output, 'raw', '') or '')
+            return output
+        except Exception as e:
+            args_out['error'] = str(e)[:200]
+            raise
+        finally:
+            _current.task = previous
+            after = _token_usage(task)
+            usage = {key: after[key] - before[key] for key in after}
+            tracer.record(_task_name(task), 'task', start, time.perf_counter(),
+                          agent=getattr(getattr(task, 'agent', None), 'role', None),
+                          llm_requests=usage.pop('successful_requests'), **usage, **args_out)
+
+    @functools.wraps(llm_call)
+    def traced_call(llm, messages, *args, **kwargs):
+        if not tracer.enabled:
+            return llm_call(llm, messages, *args, **kwargs)
+        task = getattr(_current, 'task', None)
+        with tracer.span(str(getattr(llm, 'model', None) or 'llm'), 'llm',
+                         task=_task_name(task) if task is not None else None,
+                         agent=getattr(getattr(task, 'agent', None), 'role', None)) as span:
+            span['input_bytes'] = _payload_bytes(messages)
+            response = llm_call(llm, messages, *args, **kwargs)
+            span['output_bytes'] = _payload_bytes(response if isinstance(response, str) else str(response))
+            return response
+
+    Task.execute_sync = traced_execute_sync
+    LLM.call = traced_call
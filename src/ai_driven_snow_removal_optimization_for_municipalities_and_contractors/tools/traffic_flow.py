@@ -0,0 +1,167 @@
+"""
+Traffic flow sampling along a route's geometry.
+
+The route polyline is cut into segments of roughly equal length and flow is
+requested at each segment's midpoint. Samples falling in the same map tile
+share one request (and one cache entry), and the per-tile answers are
+assembled into a per-segment speed profile with travel-time estimates.
+"""
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_M = 6371008.8
+
+# Below this fraction of free-flow speed a segment counts as congested
+CONGESTION_RATIO = 0.6
+
+Point = Tuple[float, float]
+
+
+@dataclass
+class RouteSegment:
+    """A stretch of the route, sampled at its midpoint."""
+    index: int
+    start_m: float
+    end_m: float
+    latitude: float
+    longitude: float
+
+    @property
+    def length_m(self) -> float:
+        return self.end_m - self.start_m
+
+
+def cumulative_distance_m(points: Sequence[Point]) -> np.ndarray:
+    """Distance from the first point to each point along the polyline, in metres."""
+    coords = np.radians(np.asarray(points, dtype=float).reshape(-1, 2))
+    if len(coords) < 2:
+        return np.zeros(len(coords))
+    lat1, lon1 = coords[:-1, 0], coords[:-1, 1]
+    lat2, lon2 = coords[1:, 0], coords[1:, 1]
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    steps = 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+    return np.concatenate(([0.0], np.cumsum(steps)))
+
+
+def segment_route(points: Sequence[Point], spacing_m: float, max_segments: int) -> List[RouteSegment]:
+    """
+    Cut a polyline into segments of about `spacing_m`, widening the spacing if
+    that would produce more than `max_segments`.
+
+    Args:
+        points: Route polyline as (lat, lon) pairs
+        spacing_m: Desired segment length in metres
+        max_segments: Upper bound on the number of segments (and flow samples)
+
+    Returns:
+        Segments in route order, each with its midpoint coordinates
+    """
+    if len(points) == 0:
+        return []
+    distance = cumulative_distance_m(points)
+    total = float(distance[-1])
+    count = max(1, min(max_segments, math.ceil(total / spacing_m))) if total > 0 else 1
+    bounds = np.linspace(0.0, total, count + 1)
+    midpoints = (bounds[:-1] + bounds[1:]) / 2
+    coords = np.asarray(points, dtype=float).reshape(-1, 2)
+    # Linear interpolation along the polyline is accurate enough at street scale
+    lats = np.interp(midpoints, distance, coords[:, 0])
+    lons = np.interp(midpoints, distance, coords[:, 1])
+    return [
+        RouteSegment(
+            index=i,
+            start_m=float(bounds[i]),
+            end_m=float(bounds[i + 1]),
+            latitude=float(lats[i]),
+            longitude=float(lons[i])
+        )
+        for i in range(count)
+    ]
+
+
+def tile_key(lat: float, lon: float, zoom: int) -> str:
+    """Web-mercator tile containing (lat, lon) at `zoom`, as a cache key."""
+    n = 2 ** zoom
+    lat_rad = math.radians(max(min(lat, 85.0511), -85.0511))
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n)
+    return f"flow:{zoom}/{min(max(x, 0), n - 1)}/{min(max(y, 0), n - 1)}"
+
+
+def compact_flow(response: dict) -> dict:
+    """Keep the fields of a flowSegmentData response that the profile uses (drops the geometry)."""
+    data = response.get('flowSegmentData', {})
+    return {
+        "frc": data.get('frc'),
+        "current_speed": data.get('currentSpeed'),
+        "free_flow_speed": data.get('freeFlowSpeed'),
+        "confidence": data.get('confidence'),
+        "road_closure": bool(data.get('roadClosure', False))
+    }
+
+
+def speed_profile(
+    segments: List[RouteSegment],
+    tiles: List[str],
+    flows: Dict[str, Optional[dict]]
+) -> dict:
+    """
+    Join per-tile flow observations back onto the route segments.
+
+    Args:
+        segments: Route segments in order
+        tiles: Tile key of each segment's midpoint
+        flows: Compact flow per tile key (None where the request failed)
+
+    Returns:
+        Dict with the per-segment profile and route-level travel-time summary
+    """
+    profile = []
+    covered_m = free_s = current_s = 0.0
+    congested = closed = 0
+    for segment, tile in zip(segments, tiles):
+        flow = flows.get(tile)
+        entry = {
+            "segment": segment.index,
+            "from_km": round(segment.start_m / 1000, 2),
+            "to_km": round(segment.end_m / 1000, 2),
+            "latitude": round(segment.latitude, 5),
+            "longitude": round(segment.longitude, 5)
+        }
+        if flow and flow.get('current_speed') is not None and flow.get('free_flow_speed'):
+            current, free = flow['current_speed'], flow['free_flow_speed']
+            ratio = current / free
+            entry.update({
+                "current_speed": current,
+                "free_flow_speed": free,
+                "speed_ratio": round(ratio, 2),
+                "road_closure": flow['road_closure'],
+                "confidence": flow.get('confidence')
+            })
+            if flow['road_closure'] or current <= 0:
+                closed += 1
+            else:
+                covered_m += segment.length_m
+                free_s += segment.length_m / (free / 3.6)
+                current_s += segment.length_m / (current / 3.6)
+                if ratio < CONGESTION_RATIO:
+                    congested += 1
+        profile.append(entry)
+
+    length_m = segments[-1].end_m if segments else 0.0
+    return {
+        "segments": profile,
+        "summary": {
+            "length_km": round(length_m / 1000, 2),
+            "sampled_segments": len(segments),
+            "coverage": round(covered_m / length_m, 2) if length_m else 0.0,
+            "free_flow_minutes": round(free_s / 60, 1),
+            "estimated_minutes": round(current_s / 60, 1),
+            "delay_minutes": round((current_s - free_s) / 60, 1),
+            "congested_segments": congested,
+            "closed_segments": closed
+        }
+    }
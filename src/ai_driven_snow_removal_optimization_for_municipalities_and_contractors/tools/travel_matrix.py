@@ -0,0 +1,332 @@
+"""
+Batched N x M travel distance/time matrices with incremental caching.
+
+Providers compute rectangular origin x destination blocks:
+- TomTomMatrixProvider calls the TomTom Matrix Routing v2 endpoint, splitting
+  large requests into blocks that fit the synchronous cell limit
+- EstimatedMatrixProvider is the local stand-in: straight-line distance with
+  a road detour factor and an average winter speed
+
+TravelTimeMatrix caches results as NumPy arrays per time-of-day bucket. When
+a planning call adds stops to a known point set, only the rows and columns of
+the new points are requested; everything else comes from the cache.
+"""
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from . import http_client
+
+EARTH_RADIUS_KM = 6371.0
+
+Point = Tuple[float, float]
+
+
+def haversine_matrix(origins: Sequence[Point], destinations: Optional[Sequence[Point]] = None) -> np.ndarray:
+    """Great-circle distances (km) from every origin to every destination (default: origins)."""
+    o = np.radians(np.asarray(origins, dtype=float).reshape(-1, 2))
+    d = o if destinations is None else np.radians(np.asarray(destinations, dtype=float).reshape(-1, 2))
+    lat1, lon1 = o[:, 0][:, None], o[:, 1][:, None]
+    lat2, lon2 = d[:, 0][None, :], d[:, 1][None, :]
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def estimate_matrices(
+    origins: Sequence[Point],
+    destinations: Optional[Sequence[Point]] = None,
+    detour_factor: float = 1.3,
+    speed_kmh: float = 35.0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Road distance (km) and travel time (s) estimates from straight-line distance.
+
+    Used when no routed travel-time matrix is available.
+    """
+    distance = haversine_matrix(origins, destinations) * detour_factor
+    return distance, distance / speed_kmh * 3600
+
+
+class EstimatedMatrixProvider:
+    """Local stand-in for a matrix routing service."""
+
+    name = "estimated"
+
+    def __init__(self, detour_factor: float = 1.3, speed_kmh: float = 35.0):
+        self.detour_factor = detour_factor
+        self.speed_kmh = speed_kmh
+
+    def compute(self, origins: Sequence[Point], destinations: Sequence[Point],
+                depart_at: Optional[datetime] = None) -> Tuple[np.ndarray, np.ndarray]:
+        return estimate_matrices(origins, destinations, self.detour_factor, self.speed_kmh)
+
+
+class TomTomMatrixProvider:
+    """TomTom Matrix Routing v2 (synchronous) client with request batching."""
+
+    name = "tomtom"
+
+    def __init__(self, api_key: str, base_url: str = "https://api.tomtom.com",
+                 max_cells: int = 200, travel_mode: str = "truck", timeout: float = 30.0):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.max_cells = max_cells
+        self.travel_mode = travel_mode
+        self.timeout = timeout
+
+    def _blocks(self, n_origins: int, n_destinations: int):
+        """Split the matrix into origin x destination blocks of at most max_cells cells."""
+        cols = min(n_destinations, self.max_cells)
+        rows = max(1, self.max_cells // cols)
+        for r in range(0, n_origins, rows):
+            for c in range(0, n_destinations, cols):
+                yield slice(r, min(r + rows, n_origins)), slice(c, min(c + cols, n_destinations))
+
+    def compute(self, origins: Sequence[Point], destinations: Sequence[Point],
+                depart_at: Optional[datetime] = None) -> Tuple[np.ndarray, np.ndarray]:
+        distance = np.full((len(origins), len(destinations)), np.nan)
+        duration = np.full((len(origins), len(destinations)), np.nan)
+        options = {
+            "routeType": "fastest",
+            "travelMode": self.travel_mode,
+            "traffic": "live" if depart_at is None else "historical",
+            "departAt": "now" if depart_at is None else depart_at.isoformat(timespec='seconds'),
+        }
+        for rows, cols in self._blocks(len(origins), len(destinations)):
+            body = {
+                "origins": [{"point": {"latitude": lat, "longitude": lon}} for lat, lon in origins[rows]],
+                "destinations": [{"point": {"latitude": lat, "longitude": lon}} for lat, lon in destinations[cols]],
+                "options": options,
+            }
+            response = http_client.post(
+                f"{self.base_url}/routing/matrix/2",
+                json=body,
+                params={'key': self.api_key},
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            for cell in response.json().get('data', []):
+                summary = cell.get('routeSummary')
+                if summary is None:
+                    continue  # Unroutable pair; left as NaN
+                i = rows.start + cell['originIndex']
+                j = cols.start + cell['destinationIndex']
+                distance[i, j] = summary['lengthInMeters'] / 1000
+                duration[i, j] = summary['travelTimeInSeconds']
+        return distance, duration
+
+
+class _BucketMatrix:
+    """
+    Square matrix over a growing point set, for one time-of-day bucket.
+
+    Only the pairs that some request needed are computed; `known` marks them.
+    """
+
+    def __init__(self):
+        self.points: List[Point] = []
+        self.index: Dict[Point, int] = {}
+        self.distance = np.zeros((0, 0))
+        self.duration = np.zeros((0, 0))
+        self.known = np.zeros((0, 0), dtype=bool)
+        self.created_at = time.time()
+
+    def add_points(self, new_points: List[Point]) -> None:
+        n_old = len(self.points)
+        n_all = n_old + len(new_points)
+        for name in ('distance', 'duration', 'known'):
+            old = getattr(self, name)
+            grown = np.zeros((n_all, n_all), dtype=old.dtype)
+            grown[:n_old, :n_old] = old
+            setattr(self, name, grown)
+        np.fill_diagonal(self.known, True)
+        self.points = self.points + new_points
+        self.index = {p: i for i, p in enumerate(self.points)}
+
+
+class TravelTimeMatrix:
+    """
+    Cached travel matrices keyed by time-of-day bucket, updated incrementally.
+
+    Coordinates are rounded to `precision` decimals (~10 m at 4) so repeated
+    plans for the same depots and stops hit the cache.
+    """
+
+    def __init__(self, provider=None, bucket_minutes: int = 30, max_age_s: float = 3600,
+                 precision: int = 4, cache_dir: Optional[Union[str, Path]] = None):
+        self.provider = provider or EstimatedMatrixProvider()
+        self.bucket_minutes = bucket_minutes
+        self.max_age_s = max_age_s
+        self.precision = precision
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._buckets: Dict[int, _BucketMatrix] = {}
+        self._lock = threading.Lock()
+        self.cells_requested = 0
+        self.cells_served = 0
+        self.cells_reused = 0
+
+    def _bucket_id(self, depart_at: Optional[datetime]) -> int:
+        moment = depart_at or datetime.now()
+        return (moment.hour * 60 + moment.minute) // self.bucket_minutes
+
+    def _cache_file(self, bucket_id: int) -> Optional[Path]:
+        if not self.cache_dir:
+            return None
+        return self.cache_dir / f"travel_matrix_{self.provider.name}_b{bucket_id}.npz"
+
+    def _load(self, bucket_id: int) -> _BucketMatrix:
+        bucket = _BucketMatrix()
+        path = self._cache_file(bucket_id)
+        if path and path.exists():
+            with np.load(path) as data:
+                created_at = float(data['created_at'])
+                if time.time() - created_at < self.max_age_s:
+                    bucket.points = [tuple(p) for p in data['points'].tolist()]
+                    bucket.distance = data['distance']
+                    bucket.duration = data['duration']
+                    bucket.known = data['known']
+                    bucket.index = {p: i for i, p in enumerate(bucket.points)}
+                    bucket.created_at = created_at
+        return bucket
+
+    def _save(self, bucket_id: int, bucket: _BucketMatrix) -> None:
+        path = self._cache_file(bucket_id)
+        if path:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            np.savez_compressed(path, points=np.asarray(bucket.points).reshape(-1, 2),
+                                distance=bucket.distance, duration=bucket.duration,
+                                known=bucket.known, created_at=bucket.created_at)
+
+    def get(self, points: Sequence[Point], depart_at: Optional[datetime] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Distance (km) and duration (s) matrices between every pair of `points`.
+
+        Args:
+            points: (lat, lon) pairs; depots and stops in the order the caller needs
+            depart_at: Departure time used to pick the time-of-day bucket (default: now)
+
+        Returns:
+            (distance, duration) arrays of shape len(points) x len(points)
+        """
+        rounded = [(round(lat, self.precision), round(lon, self.precision)) for lat, lon in points]
+        unique = list(dict.fromkeys(rounded))
+        bucket_id = self._bucket_id(depart_at)
+        requested = 0
+        while True:
+            with self._lock:
+                bucket = self._bucket(bucket_id)
+                new_points = [p for p in unique if p not in bucket.index]
+                if new_points:
+                    bucket.add_points(new_points)
+                idx = np.array([bucket.index[p] for p in unique], dtype=int)
+                blocks = self._missing_blocks(bucket, idx)
+                if not blocks:
+                    full_idx = np.array([bucket.index[p] for p in rounded], dtype=int)
+                    self.cells_served += len(full_idx) ** 2
+                    self.cells_reused += max(0, len(idx) ** 2 - requested)
+                    return bucket.distance[np.ix_(full_idx, full_idx)], bucket.duration[np.ix_(full_idx, full_idx)]
+
+            # The provider may make blocking HTTP calls, so other plans keep reading the
+            # cache meanwhile; the blocks are merged into whatever bucket is current then
+            computed = [
+                (origins, destinations) + self._compute(origins, destinations, depart_at)
+                for origins, destinations in blocks
+            ]
+            with self._lock:
+                bucket = self._bucket(bucket_id)
+                for origins, destinations, distance, duration in computed:
+                    requested += self._store(bucket, origins, destinations, distance, duration)
+                self._save(bucket_id, bucket)
+
+    def _bucket(self, bucket_id: int) -> _BucketMatrix:
+        """Current matrix for `bucket_id`, reloaded once expired (call with the lock held)."""
+        bucket = self._buckets.get(bucket_id)
+        if bucket is None or time.time() - bucket.created_at > self.max_age_s:
+            bucket = self._load(bucket_id)
+            self._buckets[bucket_id] = bucket
+        return bucket
+
+    def _missing_blocks(self, bucket: _BucketMatrix, idx: np.ndarray) -> List[Tuple[List[Point], List[Point]]]:
+        """
+        Origin x destination blocks covering the unknown pairs among `idx`.
+
+        Points never seen before get whole rows (new point to every requested
+        point); the remaining gaps are then the columns of those new points.
+        """
+        blocks = []
+        known = bucket.known[np.ix_(idx, idx)].copy()
+        unseen = known.sum(axis=1) <= 1
+        if unseen.any():
+            blocks.append((idx[unseen], idx))
+            known[unseen, :] = True
+        if not known.all():
+            blocks.append((idx[~known.all(axis=1)], idx[~known.all(axis=0)]))
+        return [([bucket.points[i] for i in rows], [bucket.points[j] for j in cols]) for rows, cols in blocks]
+
+    def _compute(self, origins: List[Point], destinations: List[Point],
+                 depart_at: Optional[datetime]) -> Tuple[np.ndarray, np.ndarray]:
+        """Compute one origins x destinations block from the provider."""
+        distance, duration = self.provider.compute(origins, destinations, depart_at)
+        # Unroutable pairs fall back to the straight-line estimate so solvers stay finite
+        missing = np.isnan(distance) | np.isnan(duration)
+        if missing.any():
+            est_d, est_t = estimate_matrices(origins, destinations)
+            distance[missing] = est_d[missing]
+            duration[missing] = est_t[missing]
+        return distance, duration
+
+    def _store(self, bucket: _BucketMatrix, origins: List[Point], destinations: List[Point],
+               distance: np.ndarray, duration: np.ndarray) -> int:
+        """Write a computed block into `bucket` (call with the lock held)."""
+        absent = [p for p in dict.fromkeys(origins + destinations) if p not in bucket.index]
+        if absent:
+            bucket.add_points(absent)
+        block = np.ix_([bucket.index[p] for p in origins], [bucket.index[p] for p in destinations])
+        bucket.distance[block] = distance
+        bucket.duration[block] = duration
+        bucket.known[block] = True
+        np.fill_diagonal(bucket.distance, 0)
+        np.fill_diagonal(bucket.duration, 0)
+        self.cells_requested += distance.size
+        return distance.size
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "provider": self.provider.name,
+                "buckets": len(self._buckets),
+                "points_cached": sum(len(b.points) for b in self._buckets.values()),
+                "cells_requested": self.cells_requested,
+                "cells_served": self.cells_served,
+                "hit_rate": round(self.cells_reused / self.cells_served, 3) if self.cells_served else 0.0,
+            }
+
+
+_shared: Optional[TravelTimeMatrix] = None
+_shared_lock = threading.Lock()
+
+
+def shared_travel_matrix() -> TravelTimeMatrix:
+    """
+    Process-wide matrix cache.
+
+    Uses TomTom (at OLAF_TOMTOM_BASE_URL if set) when TOMTOM_API_KEY is set, unless
+    OLAF_MATRIX_PROVIDER=estimated, and persists buckets to OLAF_MATRIX_CACHE_DIR when given.
+    """
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            api_key = os.getenv('TOMTOM_API_KEY')
+            if api_key and os.getenv('OLAF_MATRIX_PROVIDER', 'tomtom') == 'tomtom':
+                provider = TomTomMatrixProvider(
+                    api_key, base_url=os.getenv('OLAF_TOMTOM_BASE_URL') or "https://api.tomtom.com"
+                )
+            else:
+                provider = EstimatedMatrixProvider()
+            _shared = TravelTimeMatrix(provider, cache_dir=os.getenv('OLAF_MATRIX_CACHE_DIR') or None)
+        return _shared
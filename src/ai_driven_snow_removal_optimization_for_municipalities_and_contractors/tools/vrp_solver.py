@@ -0,0 +1,366 @@
+"""
+Capacitated multi-depot vehicle routing for snow removal fleets.
+
+The solver works on a precomputed distance/time matrix whose first rows are
+the depots followed by the stops. It:
+1. assigns each stop to the closest depot that still has salt for it,
+2. builds trips per depot with the Clarke-Wright savings heuristic, bounded by
+   the trucks' salt capacity and fuel range,
+3. improves the trips with 2-opt and inter-trip relocate moves until no move
+   helps or the time budget runs out,
+4. spreads the trips over the depot's trucks (longest trip first, to the
+   least-loaded truck); a truck may run several trips, reloading at its depot.
+"""
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .travel_matrix import estimate_matrices
+
+
+@dataclass
+class Depot:
+    name: str
+    latitude: float
+    longitude: float
+    salt_tons: float = math.inf
+    fuel_liters: float = math.inf
+
+
+@dataclass
+class Stop:
+    id: str
+    latitude: float
+    longitude: float
+    salt_tons: float = 1.0
+    service_minutes: float = 5.0
+
+
+@dataclass
+class Vehicle:
+    id: str
+    depot: str
+    salt_capacity_tons: float = 10.0
+    fuel_capacity_liters: float = 300.0
+    fuel_liters_per_km: float = 0.6
+
+
+@dataclass
+class Trip:
+    vehicle_id: str
+    depot: str
+    stops: List[str]
+    distance_km: float
+    duration_minutes: float
+    salt_tons: float
+    fuel_liters: float
+
+
+@dataclass
+class VrpSolution:
+    trips: List[Trip] = field(default_factory=list)
+    unassigned: List[str] = field(default_factory=list)
+    total_distance_km: float = 0.0
+    makespan_minutes: float = 0.0
+    solve_seconds: float = 0.0
+    improvement_passes: int = 0
+    depot_usage: Dict[str, dict] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        vehicles: Dict[str, dict] = {}
+        for trip in self.trips:
+            vehicle = vehicles.setdefault(trip.vehicle_id, {
+                "vehicle_id": trip.vehicle_id,
+                "depot": trip.depot,
+                "trips": [],
+                "distance_km": 0.0,
+                "duration_minutes": 0.0,
+            })
+            vehicle["trips"].append({
+                "stops": trip.stops,
+                "distance_km": round(trip.distance_km, 2),
+                "duration_minutes": round(trip.duration_minutes, 1),
+                "salt_tons": round(trip.salt_tons, 2),
+                "fuel_liters": round(trip.fuel_liters, 1),
+            })
+            vehicle["distance_km"] = round(vehicle["distance_km"] + trip.distance_km, 2)
+            vehicle["duration_minutes"] = round(vehicle["duration_minutes"] + trip.duration_minutes, 1)
+        return {
+            "vehicles": list(vehicles.values()),
+            "unassigned_stops": self.unassigned,
+            "total_distance_km": round(self.total_distance_km, 2),
+            "makespan_minutes": round(self.makespan_minutes, 1),
+            "solve_seconds": round(self.solve_seconds, 3),
+            "improvement_passes": self.improvement_passes,
+            "depot_usage": self.depot_usage,
+        }
+
+
+class _DepotProblem:
+    """Routing state for the stops served by one depot (matrix indices are global)."""
+
+    def __init__(self, depot: int, stops: List[int], demand: np.ndarray, service_s: np.ndarray,
+                 distance: np.ndarray, duration: np.ndarray, capacity: float, max_km: float):
+        self.depot = depot
+        self.stops = stops
+        self.demand = demand
+        self.service_s = service_s
+        self.distance = distance
+        self.duration = duration
+        self.capacity = capacity
+        self.max_km = max_km
+        # Trips may only be reversed when reversing does not change their length
+        nodes = np.asarray([depot] + stops)
+        block = distance[np.ix_(nodes, nodes)]
+        self.symmetric = bool(np.allclose(block, block.T))
+
+    def trip_km(self, trip: List[int]) -> float:
+        if not trip:
+            return 0.0
+        d = self.distance
+        path = [self.depot] + trip + [self.depot]
+        return float(d[path[:-1], path[1:]].sum())
+
+    def trip_seconds(self, trip: List[int]) -> float:
+        if not trip:
+            return 0.0
+        path = [self.depot] + trip + [self.depot]
+        return float(self.duration[path[:-1], path[1:]].sum() + self.service_s[trip].sum())
+
+    def load(self, trip: List[int]) -> float:
+        return float(self.demand[trip].sum())
+
+    def savings(self) -> List[List[int]]:
+        """
+        Clarke-Wright parallel savings construction.
+
+        Joining a trip that ends at i to one that starts at j saves
+        d[i, depot] + d[depot, j] - d[i, j]; both (i, j) and (j, i) are scored
+        since routed matrices are directional.
+        """
+        d = self.distance
+        dep = self.depot
+        trips: Dict[int, List[int]] = {s: [s] for s in self.stops}
+        trip_of: Dict[int, int] = {s: s for s in self.stops}
+        loads: Dict[int, float] = {s: float(self.demand[s]) for s in self.stops}
+
+        if len(self.stops) > 1:
+            idx = np.asarray(self.stops)
+            saving = d[idx, dep][:, None] + d[dep, idx][None, :] - d[np.ix_(idx, idx)]
+            rows, cols = np.nonzero(~np.eye(len(idx), dtype=bool))
+            values = saving[rows, cols]
+            order = np.argsort(-values, kind='stable')
+            for k in order:
+                if values[k] <= 0:
+                    break
+                i, j = int(idx[rows[k]]), int(idx[cols[k]])
+                ti, tj = trip_of[i], trip_of[j]
+                if ti == tj or loads[ti] + loads[tj] > self.capacity + 1e-9:
+                    continue
+                a, b = trips[ti], trips[tj]
+                # i must end a and j start b; with a symmetric matrix either trip may
+                # be reversed to get there, otherwise the pair (j, i) covers the other order
+                if a[-1] != i:
+                    if not self.symmetric or a[0] != i:
+                        continue
+                    a = a[::-1]
+                if b[0] != j:
+                    if not self.symmetric or b[-1] != j:
+                        continue
+                    b = b[::-1]
+                merged = a + b
+                if self.trip_km(merged) > self.max_km + 1e-9:
+                    continue
+                trips[ti] = merged
+                loads[ti] += loads.pop(tj)
+                del trips[tj]
+                for s in b:
+                    trip_of[s] = ti
+        return list(trips.values())
+
+    def two_opt(self, trip: List[int], deadline: float) -> bool:
+        """Reverse trip segments while that shortens the trip."""
+        d = self.distance
+        improved = False
+        path = [self.depot] + trip + [self.depot]
+        n = len(path)
+        changed = True
+        while changed and time.perf_counter() < deadline:
+            changed = False
+            for i in range(1, n - 2):
+                for j in range(i + 1, n - 1):
+                    delta = (d[path[i - 1], path[j]] + d[path[i], path[j + 1]]
+                             - d[path[i - 1], path[i]] - d[path[j], path[j + 1]])
+                    if delta < -1e-9:
+                        # The delta assumes symmetric costs; confirm on the full
+                        # path since routed travel matrices are directional
+                        candidate = path[:i] + path[i:j + 1][::-1] + path[j + 1:]
+                        if d[candidate[:-1], candidate[1:]].sum() < d[path[:-1], path[1:]].sum() - 1e-9:
+                            path = candidate
+                            changed = improved = True
+        trip[:] = path[1:-1]
+        return improved
+
+    def relocate(self, trips: List[List[int]], deadline: float) -> bool:
+        """Move single stops to the cheapest feasible position in another trip."""
+        d = self.distance
+        dep = self.depot
+        improved = False
+        for a in range(len(trips)):
+            pos = 0
+            while pos < len(trips[a]):
+                if time.perf_counter() >= deadline:
+                    return improved
+                src = trips[a]
+                s = src[pos]
+                prev = src[pos - 1] if pos > 0 else dep
+                nxt = src[pos + 1] if pos + 1 < len(src) else dep
+                removal_gain = d[prev, s] + d[s, nxt] - d[prev, nxt]
+                best: Optional[Tuple[float, int, int]] = None
+                for b, dst in enumerate(trips):
+                    if b == a or self.load(dst) + self.demand[s] > self.capacity + 1e-9:
+                        continue
+                    dst_km = self.trip_km(dst)
+                    for p in range(len(dst) + 1):
+                        before = dst[p - 1] if p > 0 else dep
+                        after = dst[p] if p < len(dst) else dep
+                        insertion = d[before, s] + d[s, after] - d[before, after]
+                        if insertion - removal_gain < -1e-9 and dst_km + insertion <= self.max_km + 1e-9:
+                            if best is None or insertion < best[0]:
+                                best = (insertion, b, p)
+                if best is not None:
+                    _, b, p = best
+                    trips[b].insert(p, s)
+                    del src[pos]
+                    improved = True
+                else:
+                    pos += 1
+        trips[:] = [t for t in trips if t]
+        return improved
+
+
+def solve(
+    depots: List[Depot],
+    vehicles: List[Vehicle],
+    stops: List[Stop],
+    distance_km: Optional[np.ndarray] = None,
+    duration_s: Optional[np.ndarray] = None,
+    time_budget_s: float = 2.0
+) -> VrpSolution:
+    """
+    Plan per-vehicle trips for a multi-depot fleet.
+
+    Args:
+        depots: Depots, in the order of the first matrix rows
+        vehicles: Trucks, each based at one depot (by name)
+        stops: Stops to serve, in the order of the remaining matrix rows
+        distance_km: (D+S)x(D+S) road distances; estimated from coordinates if omitted
+        duration_s: (D+S)x(D+S) travel times; estimated from coordinates if omitted
+        time_budget_s: Wall-clock budget for the local search phase
+
+    Returns:
+        VrpSolution with one Trip per truck outing and the stops that could not be served
+    """
+    started = time.perf_counter()
+    points = [(d.latitude, d.longitude) for d in depots] + [(s.latitude, s.longitude) for s in stops]
+    if distance_km is None or duration_s is None:
+        est_distance, est_duration = estimate_matrices(points)
+        distance_km = est_distance if distance_km is None else distance_km
+        duration_s = est_duration if duration_s is None else duration_s
+    distance_km = np.asarray(distance_km, dtype=float)
+    duration_s = np.asarray(duration_s, dtype=float)
+    if distance_km.shape != (len(points), len(points)) or duration_s.shape != distance_km.shape:
+        raise ValueError(f"Matrices must be {len(points)}x{len(points)} (depots followed by stops)")
+
+    n_depots = len(depots)
+    demand = np.zeros(len(points))
+    service_s = np.zeros(len(points))
+    for k, stop in enumerate(stops):
+        demand[n_depots + k] = stop.salt_tons
+        service_s[n_depots + k] = stop.service_minutes * 60
+
+    fleet: Dict[int, List[Vehicle]] = {}
+    depot_index = {d.name: i for i, d in enumerate(depots)}
+    for vehicle in vehicles:
+        if vehicle.depot not in depot_index:
+            raise ValueError(f"Vehicle {vehicle.id} is based at unknown depot '{vehicle.depot}'")
+        fleet.setdefault(depot_index[vehicle.depot], []).append(vehicle)
+
+    # 1. Assign stops to the nearest depot with trucks and enough salt left
+    salt_left = {i: d.salt_tons for i, d in enumerate(depots)}
+    assigned: Dict[int, List[int]] = {i: [] for i in fleet}
+    unassigned: List[str] = []
+    for k, stop in enumerate(stops):
+        node = n_depots + k
+        candidates = sorted(fleet, key=lambda i: duration_s[i, node] + duration_s[node, i])
+        for i in candidates:
+            capacity = min(v.salt_capacity_tons for v in fleet[i])
+            max_km = min(v.fuel_capacity_liters / v.fuel_liters_per_km for v in fleet[i])
+            reachable = distance_km[i, node] + distance_km[node, i] <= max_km
+            if reachable and stop.salt_tons <= min(capacity, salt_left[i]):
+                assigned[i].append(node)
+                salt_left[i] -= stop.salt_tons
+                break
+        else:
+            unassigned.append(stop.id)
+
+    # 2-3. Savings construction then local search, per depot
+    deadline = started + time_budget_s
+    problems: Dict[int, Tuple[_DepotProblem, List[List[int]]]] = {}
+    for i, nodes in assigned.items():
+        if not nodes:
+            continue
+        problem = _DepotProblem(
+            depot=i, stops=nodes, demand=demand, service_s=service_s,
+            distance=distance_km, duration=duration_s,
+            capacity=min(v.salt_capacity_tons for v in fleet[i]),
+            max_km=min(v.fuel_capacity_liters / v.fuel_liters_per_km for v in fleet[i]),
+        )
+        problems[i] = (problem, problem.savings())
+
+    passes = 0
+    improving = True
+    while improving and time.perf_counter() < deadline:
+        improving = False
+        passes += 1
+        for problem, trips in problems.values():
+            for trip in trips:
+                improving |= problem.two_opt(trip, deadline)
+            improving |= problem.relocate(trips, deadline)
+
+    # 4. Longest trip first to the truck with the least accumulated time
+    solution = VrpSolution(unassigned=unassigned, improvement_passes=passes)
+    for i, (problem, trips) in problems.items():
+        busy = {v.id: 0.0 for v in fleet[i]}
+        by_id = {v.id: v for v in fleet[i]}
+        for trip in sorted(trips, key=problem.trip_seconds, reverse=True):
+            vehicle_id = min(busy, key=busy.get)
+            seconds = problem.trip_seconds(trip)
+            km = problem.trip_km(trip)
+            busy[vehicle_id] += seconds
+            solution.trips.append(Trip(
+                vehicle_id=vehicle_id,
+                depot=depots[i].name,
+                stops=[stops[node - n_depots].id for node in trip],
+                distance_km=km,
+                duration_minutes=seconds / 60,
+                salt_tons=problem.load(trip),
+                fuel_liters=km * by_id[vehicle_id].fuel_liters_per_km,
+            ))
+        solution.makespan_minutes = max(solution.makespan_minutes, max(busy.values()) / 60)
+    solution.total_distance_km = sum(t.distance_km for t in solution.trips)
+    for depot in depots:
+        trips = [t for t in solution.trips if t.depot == depot.name]
+        fuel = sum(t.fuel_liters for t in trips)
+        solution.depot_usage[depot.name] = {
+            "salt_planned_tons": round(sum(t.salt_tons for t in trips), 2),
+            "salt_available_tons": None if math.isinf(depot.salt_tons) else depot.salt_tons,
+            "fuel_planned_liters": round(fuel, 1),
+            "fuel_available_liters": None if math.isinf(depot.fuel_liters) else depot.fuel_liters,
+            "fuel_shortfall": fuel > depot.fuel_liters,
+        }
+    solution.solve_seconds = time.perf_counter() - started
+    return solution
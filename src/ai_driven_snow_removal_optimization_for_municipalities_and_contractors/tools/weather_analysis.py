@@ -0,0 +1,154 @@
+"""
+Vectorized snow-condition analysis over OpenWeather entries.
+
+Rules, applied to whole arrays at once (one forecast of T timesteps, or many
+locations, L x T) in a single NumPy pass:
+- snow risk is high at or below 0°C with humidity over 80%, medium at or below 2°C
+- roads are snowy when snow is reported (icy at or below -5°C), otherwise
+  potential ice at or below 0°C
+- road surface temperature is a simplified estimate from air temperature,
+  cloud cover and day/night
+"""
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+SNOW_CONDITION_IDS = frozenset((600, 601, 602))
+
+SNOW_RISK_LEVELS = np.array(['low', 'medium', 'high'])
+ROAD_CONDITIONS = np.array(['clear', 'potential ice', 'snowy', 'icy'])
+
+
+def entries_to_arrays(entries: Sequence[dict]) -> Dict[str, np.ndarray]:
+    """
+    Extract the fields used by the analysis into columnar arrays.
+
+    Args:
+        entries: OpenWeather `/weather` responses or `/forecast` list items
+
+    Returns:
+        Dict of 1-D arrays: temperature, humidity, cloud_cover, snow_amount_mm,
+        wind_speed, has_snow, is_night
+    """
+    rows = []
+    append = rows.append
+    for entry in entries:
+        main = entry['main']
+        snow = entry.get('snow')
+        has_snow = False
+        for weather in entry.get('weather', ()):
+            if weather['id'] in SNOW_CONDITION_IDS:
+                has_snow = True
+                break
+        append((
+            main['temp'],
+            main.get('humidity', 0),
+            entry['clouds']['all'],
+            snow.get('3h', 0) if snow is not None else 0,
+            entry['wind']['speed'],
+            has_snow,
+            'n' in entry.get('sys', {}).get('pod', 'n'),
+        ))
+    # One pass over the dicts, one allocation; columns are views into it
+    table = np.array(rows, dtype=float).reshape(len(rows), 7)
+    temperature, humidity, cloud_cover, snow_amount_mm, wind_speed = table[:, :5].T
+    has_snow = table[:, 5].astype(bool)
+    is_night = table[:, 6].astype(bool)
+    return {
+        'temperature': temperature,
+        'humidity': humidity,
+        'cloud_cover': cloud_cover,
+        'snow_amount_mm': snow_amount_mm,
+        'wind_speed': wind_speed,
+        'has_snow': has_snow,
+        'is_night': is_night,
+    }
+
+
+def analyze_arrays(
+    temperature: np.ndarray,
+    humidity: np.ndarray,
+    cloud_cover: np.ndarray,
+    has_snow: np.ndarray,
+    is_night: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """
+    Snow risk, road condition and road surface temperature for arrays of any shape.
+
+    Returns:
+        Dict with 'snow_risk' and 'road_condition' (string arrays), their integer
+        codes ('snow_risk_code', 'road_condition_code', indexes into SNOW_RISK_LEVELS
+        and ROAD_CONDITIONS) and 'road_surface_temp' (float array), all shaped
+        like `temperature`
+    """
+    temperature = np.asarray(temperature, dtype=float)
+    cloud_cover = np.asarray(cloud_cover, dtype=float)
+    has_snow = np.asarray(has_snow, dtype=bool)
+
+    risk = np.where(
+        (temperature <= 0) & (np.asarray(humidity) > 80), 2,
+        np.where(temperature <= 2, 1, 0)
+    )
+    road = np.where(
+        has_snow, np.where(temperature <= -5, 3, 2),
+        np.where(temperature <= 0, 1, 0)
+    )
+    # Night: road cools up to 3°C below air (less under clouds); day: warms up to 12°C
+    surface = np.where(
+        is_night,
+        temperature + -3 * (cloud_cover / 100),
+        temperature + 12 * (1 - cloud_cover / 100)
+    )
+    return {
+        'snow_risk': SNOW_RISK_LEVELS[risk],
+        'road_condition': ROAD_CONDITIONS[road],
+        'snow_risk_code': risk.astype(np.int8),
+        'road_condition_code': road.astype(np.int8),
+        'road_surface_temp': surface,
+    }
+
+
+def analyze_entries(entries: Sequence[dict]) -> Dict[str, np.ndarray]:
+    """Columnar analysis of one series of entries (e.g. a forecast list)."""
+    columns = entries_to_arrays(entries)
+    columns.update(analyze_arrays(
+        columns['temperature'], columns['humidity'], columns['cloud_cover'],
+        columns['has_snow'], columns['is_night']
+    ))
+    return columns
+
+
+def analyze_locations(series: Sequence[Sequence[dict]]) -> Dict[str, np.ndarray]:
+    """
+    Columnar analysis of several locations' forecasts in one pass.
+
+    Args:
+        series: One list of forecast entries per location
+
+    Returns:
+        Dict of (L x T) arrays; shorter series are padded and flagged False in 'valid'
+    """
+    lengths = [len(s) for s in series]
+    width = max(lengths, default=0)
+    flat = entries_to_arrays([entry for s in series for entry in s])
+    columns: Dict[str, np.ndarray] = {}
+    valid = np.zeros((len(series), width), dtype=bool)
+    for row, length in enumerate(lengths):
+        valid[row, :length] = True
+    for name, values in flat.items():
+        fill = False if values.dtype == bool else np.nan
+        grid = np.full((len(series), width), fill, dtype=values.dtype)
+        grid[valid] = values
+        columns[name] = grid
+    columns.update(analyze_arrays(
+        columns['temperature'], columns['humidity'], columns['cloud_cover'],
+        columns['has_snow'], columns['is_night']
+    ))
+    columns['valid'] = valid
+    return columns
+
+
+def columns_to_records(columns: Dict[str, np.ndarray], fields: List[str]) -> List[dict]:
+    """Turn 1-D result columns back into per-timestep dicts with plain Python values."""
+    lists = {name: columns[name].tolist() for name in fields}
+    return [dict(zip(fields, values)) for values in zip(*(lists[name] for name in fields))]
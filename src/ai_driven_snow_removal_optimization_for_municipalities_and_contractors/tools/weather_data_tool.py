@@ -1,11 +1,30 @@
 from crewai.tools import BaseTool
-from typing import Type, Dict, List, ClassVar
+from typing import Type, Dict, List, ClassVar, Optional, Tuple
 from pydantic import BaseModel, Field
 import requests
+from . import http_client
+from .artifact_store import get_artifact_store
+from .compaction import compact_weather
+from .response_cache import ResponseCache, make_key
+from .weather_analysis import analyze_entries, columns_to_records
+from .weather_grid import GridRequestError, sample_grid
 import json
 from datetime import datetime
 import os
 
+# Shared by every WeatherDataTool instance in the process. Set
+# OLAF_WEATHER_CACHE_PATH to a SQLite file to keep entries across restarts.
+weather_cache = ResponseCache(
+    max_entries=int(os.getenv('OLAF_WEATHER_CACHE_SIZE', '256')),
+    disk_path=os.getenv('OLAF_WEATHER_CACHE_PATH') or None
+)
+
+# Per-timestep fields reported for current conditions and each forecast entry
+CONDITION_FIELDS = [
+    'has_snow', 'snow_amount_mm', 'snow_risk', 'road_condition',
+    'temperature', 'wind_speed', 'road_surface_temp'
+]
+
 class WeatherDataToolInput(BaseModel):
     """Input schema for WeatherDataTool."""
     region: str = Field(
@@ -16,6 +35,10 @@ class WeatherDataToolInput(BaseModel):
         default=1,
         description="Number of days to forecast (1-5)"
     )
+    grid_resolution_km: Optional[float] = Field(
+        default=None,
+        description="Optional grid spacing in km; when set, also samples a grid over the whole region"
+    )
 
 class WeatherDataTool(BaseTool):
     name: str = "Weather Data Collection Tool"
@@ -31,8 +54,16 @@ class WeatherDataTool(BaseTool):
     - Road surface temperature estimates
     """
     args_schema: Type[BaseModel] = WeatherDataToolInput
-    api_key: str = None
+    api_key: Optional[str] = None
     base_url: str = "http://api.openweathermap.org/data/2.5"
+    # Cache lifetimes (seconds); OpenWeather refreshes forecasts every 3 hours
+    current_ttl: int = 600
+    forecast_ttl: int = 10800
+    # Gridded sampling limits: cells per grid (API quota guard) and concurrent requests
+    max_grid_cells: int = 64
+    grid_workers: int = 8
+    # Return a bounded summary plus an artifact handle instead of the full payload
+    compact_output: bool = os.getenv('OLAF_COMPACT_TOOL_OUTPUT', '1') != '0'
     
     # Region to coordinates mapping (matching TomTomTrafficTool)
     region_coordinates: ClassVar[Dict[str, List[float]]] = {
@@ -41,15 +72,34 @@ class WeatherDataTool(BaseTool):
         "Quebec": [46.8139, -71.2080]
     }
     
-    def __init__(self):
-        super().__init__()
-        api_key = os.getenv('OPENWEATHER_API_KEY')
-        if not api_key:
-            raise ValueError("OPENWEATHER_API_KEY environment variable is required")
-        self.api_key = api_key
+    # Approximate municipal bounding boxes (south, west, north, east) for gridded sampling
+    region_bounds: ClassVar[Dict[str, Tuple[float, float, float, float]]] = {
+        "Toronto": (43.581, -79.639, 43.855, -79.116),
+        "Montreal": (45.410, -73.974, 45.705, -73.475),
+        "Quebec": (46.733, -71.549, 46.980, -71.134)
+    }
+    
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None, **kwargs):
+        """
+        Args:
+            api_key: OpenWeather key; defaults to OPENWEATHER_API_KEY
+            base_url: API root; defaults to OLAF_OPENWEATHER_BASE_URL, else the public API
+                (point it at a stand-in server, see standin_api.py, to run offline)
+        """
+        super().__init__(**kwargs)
+        self.api_key = api_key or os.getenv('OPENWEATHER_API_KEY')
+        self.base_url = base_url or os.getenv('OLAF_OPENWEATHER_BASE_URL') or self.base_url
     
     def _get_current_weather(self, lat: float, lon: float) -> dict:
-        """Get current weather conditions."""
+        """Get current weather conditions (cached for `current_ttl` seconds)."""
+        # Keyed by URL so a stand-in server and the real API never share entries
+        key = make_key(f"{self.base_url}/weather", lat, lon)
+        return weather_cache.get_or_fetch(
+            key, self.current_ttl, lambda: self._fetch_current_weather(lat, lon)
+        )
+    
+    def _fetch_current_weather(self, lat: float, lon: float) -> dict:
+        """Fetch current weather conditions from the API."""
         endpoint = f"{self.base_url}/weather"
         params = {
             'lat': lat,
@@ -58,88 +108,79 @@ class WeatherDataTool(BaseTool):
             'units': 'metric'
         }
         
-        response = requests.get(endpoint, params=params)
+        response = http_client.get(endpoint, params=params)
         response.raise_for_status()
         return response.json()
     
     def _get_forecast(self, lat: float, lon: float, days: int) -> dict:
-        """Get weather forecast."""
+        """Get weather forecast (cached for `forecast_ttl` seconds)."""
+        count = min(days * 8, 40)  # 8 measurements per day, max 5 days
+        key = make_key(f"{self.base_url}/forecast", lat, lon, cnt=count)
+        return weather_cache.get_or_fetch(
+            key, self.forecast_ttl, lambda: self._fetch_forecast(lat, lon, count)
+        )
+    
+    def _fetch_forecast(self, lat: float, lon: float, count: int) -> dict:
+        """Fetch `count` 3-hour forecast entries from the API."""
         endpoint = f"{self.base_url}/forecast"
         params = {
             'lat': lat,
             'lon': lon,
             'appid': self.api_key,
             'units': 'metric',
-            'cnt': min(days * 8, 40)  # 8 measurements per day, max 5 days
+            'cnt': count
         }
         
-        response = requests.get(endpoint, params=params)
+        response = http_client.get(endpoint, params=params)
         response.raise_for_status()
         return response.json()
     
-    def _estimate_road_surface_temp(self, air_temp: float, cloud_cover: int, is_night: bool) -> float:
-        """
-        Estimate road surface temperature based on air temperature and conditions.
-        This is a simplified model - in production, you'd want a more sophisticated calculation.
+    @staticmethod
+    def cache_stats() -> dict:
+        """Hit/miss statistics of the shared weather response cache."""
+        return weather_cache.stats()
+    
+    def _sample_grid(self, region: str, resolution_km: float, forecast_days: int) -> dict:
         """
-        # Road surface is typically warmer than air during day and colder at night
-        if is_night:
-            # At night, road surface can be 2-4°C colder than air temperature
-            temp_diff = -3 * (cloud_cover / 100)  # More clouds = less cooling
-        else:
-            # During day, road surface can be 10-15°C warmer than air temperature
-            temp_diff = 12 * (1 - cloud_cover / 100)  # More clouds = less warming
+        Sample forecasts over a grid covering the region and summarize snow risk per cell.
+        
+        Args:
+            region: The region to sample
+            resolution_km: Grid spacing in kilometres
+            forecast_days: Number of days to forecast (1-5)
             
-        return air_temp + temp_diff
+        Returns:
+            Compact grid summary (see WeatherGrid.to_dict)
+        """
+        grid = sample_grid(
+            region,
+            self.region_bounds[region],
+            resolution_km,
+            lambda lat, lon: self._get_forecast(lat, lon, forecast_days),
+            max_cells=self.max_grid_cells,
+            max_workers=self.grid_workers
+        )
+        return grid.to_dict()
     
-    def _analyze_snow_conditions(self, weather_data: dict) -> dict:
-        """Analyze weather data for snow-related conditions."""
-        snow_conditions = {
-            'has_snow': False,
-            'snow_amount_mm': 0,
-            'snow_risk': 'low',
-            'road_condition': 'clear'
-        }
-        
-        # Check for snow in weather conditions
-        for weather in weather_data.get('weather', []):
-            if weather['id'] in [600, 601, 602]:  # Snow condition codes
-                snow_conditions['has_snow'] = True
-                break
-        
-        # Get snow amount if available
-        if 'snow' in weather_data:
-            snow_conditions['snow_amount_mm'] = weather_data['snow'].get('3h', 0)
-        
-        # Assess snow risk based on temperature and precipitation
-        temp = weather_data['main']['temp']
-        if temp <= 0 and weather_data['main'].get('humidity', 0) > 80:
-            snow_conditions['snow_risk'] = 'high'
-        elif temp <= 2:
-            snow_conditions['snow_risk'] = 'medium'
-        
-        # Assess road conditions
-        if snow_conditions['has_snow']:
-            if temp <= -5:
-                snow_conditions['road_condition'] = 'icy'
-            else:
-                snow_conditions['road_condition'] = 'snowy'
-        elif temp <= 0:
-            snow_conditions['road_condition'] = 'potential ice'
-        
-        return snow_conditions
-
-    def _run(self, region: str, forecast_days: int = 1) -> str:
+    def _run(self, region: str, forecast_days: int = 1, grid_resolution_km: Optional[float] = None) -> str:
         """
         Main execution method for the tool.
         
         Args:
             region: The region to analyze
             forecast_days: Number of days to forecast (1-5)
+            grid_resolution_km: Optional grid spacing for region-wide sampling
             
         Returns:
             JSON string containing weather data and analysis
         """
+        # A key is only needed for the public API, not for a stand-in or replayed fixtures
+        if not self.api_key and self.base_url == type(self).model_fields['base_url'].default \
+                and http_client.get_config().fixture_mode != 'replay':
+            return json.dumps({
+                "error": "Missing API key",
+                "details": "Set OPENWEATHER_API_KEY, or OLAF_OPENWEATHER_BASE_URL to use a stand-in server"
+            })
         try:
             # Validate and get coordinates
             coordinates = self.region_coordinates.get(region)
@@ -153,29 +194,12 @@ class WeatherDataTool(BaseTool):
             current = self._get_current_weather(lat, lon)
             forecast = self._get_forecast(lat, lon, forecast_days)
             
-            # Process current conditions
-            current_conditions = self._analyze_snow_conditions(current)
-            current_conditions['temperature'] = current['main']['temp']
-            current_conditions['wind_speed'] = current['wind']['speed']
-            current_conditions['road_surface_temp'] = self._estimate_road_surface_temp(
-                current['main']['temp'],
-                current['clouds']['all'],
-                'n' in current.get('sys', {}).get('pod', 'n')
-            )
+            # Current conditions and the whole forecast are analyzed in one vectorized pass each
+            current_conditions = columns_to_records(analyze_entries([current]), CONDITION_FIELDS)[0]
             
-            # Process forecast
-            forecast_conditions = []
-            for item in forecast['list']:
-                conditions = self._analyze_snow_conditions(item)
+            forecast_conditions = columns_to_records(analyze_entries(forecast['list']), CONDITION_FIELDS)
+            for conditions, item in zip(forecast_conditions, forecast['list']):
                 conditions['timestamp'] = item['dt_txt']
-                conditions['temperature'] = item['main']['temp']
-                conditions['wind_speed'] = item['wind']['speed']
-                conditions['road_surface_temp'] = self._estimate_road_surface_temp(
-                    item['main']['temp'],
-                    item['clouds']['all'],
-                    'n' in item.get('sys', {}).get('pod', 'n')
-                )
-                forecast_conditions.append(conditions)
             
             result = {
                 "timestamp": datetime.now().isoformat(),
@@ -190,7 +214,18 @@ class WeatherDataTool(BaseTool):
                     )
                 }
             }
-            
+            if grid_resolution_km:
+                try:
+                    result["grid"] = self._sample_grid(region, grid_resolution_km, forecast_days)
+                except GridRequestError as e:
+                    return json.dumps({
+                        "error": "Invalid grid request",
+                        "details": str(e)
+                    })
+
+            if self.compact_output:
+                handle = get_artifact_store().put('weather', result)
+                return json.dumps(compact_weather(result, handle), indent=2)
             return json.dumps(result, indent=2)
             
         except requests.exceptions.RequestException as e:
@@ -0,0 +1,241 @@
+"""
+Gridded weather sampling over a region's bounding box.
+
+A region is covered with cells of roughly `resolution_km` on a side; the
+forecast for every cell centre is fetched concurrently (cells that share a
+cache key are fetched once) and analyzed in one vectorized pass, giving
+(rows x cols x timesteps) arrays of snow risk and road surface temperature.
+"""
+import math
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .response_cache import make_key
+from .weather_analysis import SNOW_RISK_LEVELS, analyze_locations
+
+KM_PER_DEGREE_LAT = 111.32
+
+# (south, west, north, east)
+BoundingBox = Tuple[float, float, float, float]
+
+
+class GridRequestError(ValueError):
+    """Raised when a requested grid resolution is invalid or would exceed the cell limit."""
+
+
+def grid_axes(bbox: BoundingBox, resolution_km: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cell-centre latitudes and longitudes covering `bbox` at about `resolution_km` spacing.
+
+    Args:
+        bbox: (south, west, north, east) in degrees
+        resolution_km: Desired cell size in kilometres
+
+    Returns:
+        (latitudes, longitudes) arrays; latitudes run south to north
+
+    Raises:
+        GridRequestError: If resolution_km is not positive
+    """
+    if resolution_km <= 0:
+        raise GridRequestError("resolution_km must be positive")
+    south, west, north, east = bbox
+    mid_lat = math.radians((south + north) / 2)
+    height_km = (north - south) * KM_PER_DEGREE_LAT
+    width_km = (east - west) * KM_PER_DEGREE_LAT * math.cos(mid_lat)
+    rows = max(1, math.ceil(height_km / resolution_km))
+    cols = max(1, math.ceil(width_km / resolution_km))
+    latitudes = south + (np.arange(rows) + 0.5) * (north - south) / rows
+    longitudes = west + (np.arange(cols) + 0.5) * (east - west) / cols
+    return latitudes, longitudes
+
+
+@dataclass
+class WeatherGrid:
+    """Array-backed weather analysis for every cell of a regional grid."""
+    region: str
+    bbox: BoundingBox
+    resolution_km: float
+    latitudes: np.ndarray
+    longitudes: np.ndarray
+    timestamps: List[str]
+    # (rows, cols, timesteps); risk codes index into SNOW_RISK_LEVELS
+    snow_risk: np.ndarray
+    road_surface_temp: np.ndarray
+    has_snow: np.ndarray
+    snow_amount_mm: np.ndarray
+    # (rows, cols); False where the forecast could not be fetched
+    sampled: np.ndarray
+    requests: int = 0
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def peak_risk(self) -> np.ndarray:
+        """Highest snow risk code over the forecast horizon, -1 for unsampled cells."""
+        if self.snow_risk.shape[2] == 0:
+            return np.full(self.sampled.shape, -1, dtype=np.int8)
+        return np.where(self.sampled, self.snow_risk.max(axis=2), -1).astype(np.int8)
+
+    @property
+    def min_surface_temp(self) -> np.ndarray:
+        """Coldest estimated road surface temperature over the horizon (NaN if unsampled)."""
+        if self.road_surface_temp.shape[2] == 0:
+            return np.full(self.sampled.shape, np.nan)
+        with np.errstate(all='ignore'):
+            coldest = np.nanmin(np.where(self.sampled[..., None], self.road_surface_temp, np.nan), axis=2)
+        return coldest
+
+    @property
+    def total_snow_mm(self) -> np.ndarray:
+        return np.nansum(self.snow_amount_mm, axis=2)
+
+    def hotspots(self, limit: int = 10) -> List[dict]:
+        """
+        Cells most in need of crews: highest peak risk, then most snow, then coldest roads.
+
+        Args:
+            limit: Maximum number of cells to return
+
+        Returns:
+            List of cell dicts ordered by priority
+        """
+        peak = self.peak_risk
+        snow = self.total_snow_mm
+        coldest = np.nan_to_num(self.min_surface_temp, nan=np.inf)
+        rows, cols = np.nonzero(peak > 0)
+        order = np.lexsort((coldest[rows, cols], -snow[rows, cols], -peak[rows, cols]))[:limit]
+        return [
+            {
+                "row": int(rows[i]),
+                "col": int(cols[i]),
+                "latitude": round(float(self.latitudes[rows[i]]), 4),
+                "longitude": round(float(self.longitudes[cols[i]]), 4),
+                "peak_snow_risk": str(SNOW_RISK_LEVELS[peak[rows[i], cols[i]]]),
+                "snow_mm": round(float(snow[rows[i], cols[i]]), 1),
+                "min_road_surface_temp": round(float(self.min_surface_temp[rows[i], cols[i]]), 1)
+            }
+            for i in order
+        ]
+
+    def to_dict(self, hotspot_limit: int = 10) -> dict:
+        """
+        Compact JSON-friendly summary: one small matrix per metric instead of per-cell objects.
+
+        Matrices are row-major with row 0 at the southern edge.
+        """
+        def matrix(values: np.ndarray, digits: int) -> List[List[Optional[float]]]:
+            return [
+                [None if math.isnan(v) else round(v, digits) for v in row]
+                for row in values.astype(float).tolist()
+            ]
+
+        return {
+            "region": self.region,
+            "bbox": list(self.bbox),
+            "resolution_km": self.resolution_km,
+            "shape": list(self.sampled.shape),
+            "latitudes": [round(v, 4) for v in self.latitudes.tolist()],
+            "longitudes": [round(v, 4) for v in self.longitudes.tolist()],
+            "forecast_window": [self.timestamps[0], self.timestamps[-1]] if self.timestamps else [],
+            "snow_risk_levels": SNOW_RISK_LEVELS.tolist(),
+            "peak_snow_risk": self.peak_risk.tolist(),
+            "min_road_surface_temp": matrix(self.min_surface_temp, 1),
+            "snow_mm": matrix(np.where(self.sampled, self.total_snow_mm, np.nan), 1),
+            "hotspots": self.hotspots(hotspot_limit),
+            "requests": self.requests,
+            "errors": self.errors
+        }
+
+
+def sample_grid(
+    region: str,
+    bbox: BoundingBox,
+    resolution_km: float,
+    fetch_forecast: Callable[[float, float], dict],
+    max_cells: int = 64,
+    max_workers: int = 8
+) -> WeatherGrid:
+    """
+    Fetch and analyze forecasts for every cell of a grid over `bbox`.
+
+    Args:
+        region: Region name (for the result only)
+        bbox: (south, west, north, east) in degrees
+        resolution_km: Cell size in kilometres
+        fetch_forecast: Callable returning an OpenWeather forecast for (lat, lon)
+        max_cells: Refuse grids larger than this (API quota guard)
+        max_workers: Concurrent forecast requests
+
+    Returns:
+        WeatherGrid with (rows x cols x timesteps) arrays
+
+    Raises:
+        GridRequestError: If the resolution is invalid or the grid has more than `max_cells` cells
+    """
+    latitudes, longitudes = grid_axes(bbox, resolution_km)
+    rows, cols = len(latitudes), len(longitudes)
+    if rows * cols > max_cells:
+        raise GridRequestError(
+            f"Grid of {rows}x{cols} cells exceeds the limit of {max_cells}; "
+            f"use a coarser resolution than {resolution_km} km"
+        )
+
+    # Cells whose centres round to the same cache key share one request
+    cells_by_key: Dict[str, List[Tuple[int, int]]] = {}
+    for r, lat in enumerate(latitudes.tolist()):
+        for c, lon in enumerate(longitudes.tolist()):
+            cells_by_key.setdefault(make_key('forecast', lat, lon), []).append((r, c))
+
+    def fetch(cells: List[Tuple[int, int]]) -> dict:
+        r, c = cells[0]
+        return fetch_forecast(float(latitudes[r]), float(longitudes[c]))
+
+    forecasts: Dict[str, dict] = {}
+    errors: Dict[str, str] = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(cells_by_key))),
+                            thread_name_prefix="weather-grid") as executor:
+        futures = {key: executor.submit(fetch, cells) for key, cells in cells_by_key.items()}
+        for key, future in futures.items():
+            try:
+                forecasts[key] = future.result()
+            except Exception as e:
+                errors[key] = str(e)
+
+    # One forecast series per cell, in row-major order; failed cells get an empty series
+    series = []
+    sampled = np.zeros((rows, cols), dtype=bool)
+    cell_series: Dict[Tuple[int, int], list] = {}
+    for key, cells in cells_by_key.items():
+        entries = forecasts.get(key, {}).get('list', [])
+        for cell in cells:
+            cell_series[cell] = entries
+            sampled[cell] = bool(entries)
+    for r in range(rows):
+        for c in range(cols):
+            series.append(cell_series[(r, c)])
+
+    columns = analyze_locations(series)
+    steps = columns['valid'].shape[1]
+    timestamps = next(([e.get('dt_txt', '') for e in s] for s in series if len(s) == steps), [])
+
+    def cube(name: str) -> np.ndarray:
+        return columns[name].reshape(rows, cols, steps)
+
+    return WeatherGrid(
+        region=region,
+        bbox=tuple(bbox),
+        resolution_km=resolution_km,
+        latitudes=latitudes,
+        longitudes=longitudes,
+        timestamps=timestamps,
+        snow_risk=np.where(cube('valid'), cube('snow_risk_code'), 0).astype(np.int8),
+        road_surface_temp=np.where(cube('valid'), cube('road_surface_temp'), np.nan).astype(np.float32),
+        has_snow=cube('has_snow') & cube('valid'),
+        snow_amount_mm=np.where(cube('valid'), cube('snow_amount_mm'), np.nan).astype(np.float32),
+        sampled=sampled,
+        requests=len(cells_by_key),
+        errors=errors
+    )
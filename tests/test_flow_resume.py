@@ -0,0 +1,62 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+from ai_driven_snow_removal_optimization_for_municipalities_and_contractors.tools.standin_api import (
+    StandInConfig,
+    StandInServer,
+)
+
+FLOW_PY = Path(__file__).resolve().parent.parent / "flow.py"
+
+
+@pytest.fixture
+def offline_flow(tmp_path, monkeypatch):
+    """flow.py loaded against a stand-in server, with every store under tmp_path."""
+    with StandInServer() as server:
+        for name, value in {
+            "OLAF_OPENWEATHER_BASE_URL": server.openweather_url,
+            "OLAF_TOMTOM_BASE_URL": server.tomtom_url,
+            "OPENWEATHER_API_KEY": "test",
+            "TOMTOM_API_KEY": "test",
+            "OLAF_HTTP_RETRIES": "0",
+            "OLAF_FAST_PATH_LLM": "0",
+            "OLAF_FLOW_DB": str(tmp_path / "flow_state.sqlite3"),
+            "OLAF_REPORTS_DIR": str(tmp_path / "reports"),
+            "OLAF_ARTIFACT_DIR": str(tmp_path / "artifacts"),
+            "OLAF_MATRIX_CACHE_DIR": str(tmp_path / "matrices"),
+            "OLAF_INVENTORY_DB": str(tmp_path / "inventory.sqlite3"),
+        }.items():
+            monkeypatch.setenv(name, value)
+        # FLOW_DB and the persistence are bound when flow.py is imported
+        spec = importlib.util.spec_from_file_location("olaf_flow_under_test", FLOW_PY)
+        flow = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(flow)
+        yield flow, server
+
+
+def test_failed_run_is_checkpointed_and_resumes(offline_flow):
+    flow, server = offline_flow
+    server.config = StandInConfig(error_rate=1.0, error_endpoints=frozenset({"incidents", "route", "flow"}))
+    failed = flow.run("Montreal")
+    assert failed.steps["collect_weather"].status == "done"
+    assert failed.steps["monitor_resources"].status == "done"
+    assert failed.steps["integrate_traffic"].status == "failed"
+    assert failed.report is None
+
+    server.config = StandInConfig()
+    server.reset_stats()
+    resumed = flow.run(resume=failed.id)
+    assert resumed.id == failed.id
+    assert resumed.region == "Montreal"
+    assert resumed.steps["collect_weather"].status == "skipped"
+    assert resumed.steps["monitor_resources"].status == "skipped"
+    assert resumed.steps["integrate_traffic"].status == "done"
+    assert resumed.steps["send_notifications"].status == "done"
+    assert resumed.report
+    # The weather branch came from the checkpoint, not the API
+    assert not server.stats()["requests"].get("weather")
+
+    with pytest.raises(ValueError, match="Montreal"):
+        flow.run("Quebec", resume=failed.id)
@@ -0,0 +1,31 @@
+from crewai import LLM
+
+from ai_driven_snow_removal_optimization_for_municipalities_and_contractors.llm_cache import (
+    CachedLLM,
+    CompletionCache,
+)
+
+
+def test_second_identical_call_is_a_cache_hit(tmp_path, monkeypatch):
+    calls = []
+
+    def provider_call(self, messages, tools=None, callbacks=None, available_functions=None):
+        calls.append(messages)
+        return "Clear Boulevard Rene-Levesque first."
+
+    monkeypatch.setattr(LLM, "call", provider_call)
+    cache = CompletionCache(tmp_path / "llm_cache.sqlite3")
+    llm = CachedLLM(model="openai/gpt-4o", cache=cache)
+    assert type(llm) is CachedLLM
+
+    messages = [
+        {"role": "system", "content": "You plan snow removal."},
+        {"role": "user", "content": "Which roads first?"},
+    ]
+    first = llm.call(messages)
+    second = llm.call(messages)
+
+    assert first == second == "Clear Boulevard Rene-Levesque first."
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from ai_driven_snow_removal_optimization_for_municipalities_and_contractors.tools.route_geometry import (
+    RouteGeometry,
+    decode_polyline,
+    encode_polyline,
+)
+
+# Example from Google's encoded polyline algorithm format documentation
+GOOGLE_POINTS = [(38.5, -120.2), (40.7, -120.95), (43.252, -126.453)]
+GOOGLE_POLYLINE = "_p~iF~ps|U_ulLnnqC_mqNvxq`@"
+
+
+def test_encodes_google_reference_vector():
+    assert encode_polyline(np.array(GOOGLE_POINTS)) == GOOGLE_POLYLINE
+    np.testing.assert_allclose(decode_polyline(GOOGLE_POLYLINE), GOOGLE_POINTS, atol=1e-9)
+
+
+@pytest.mark.parametrize("point, encoded", [
+    ((0.0, 0.0), "??"),
+    # Single coordinates from the same documentation: -179.9832104 encodes to "`~oia@"
+    ((-179.98321, 0.0), "`~oia@?"),
+    ((0.00001, -0.00001), "A@"),
+])
+def test_encodes_single_points(point, encoded):
+    assert encode_polyline(np.array([point])) == encoded
+    np.testing.assert_allclose(decode_polyline(encoded), [point], atol=1e-9)
+
+
+def test_round_trips_negative_coordinates_at_precision_5():
+    rng = np.random.default_rng(11)
+    # Every sign combination, with deltas that change sign along the way
+    coords = np.round(np.column_stack([rng.uniform(-89.9, 89.9, 200), rng.uniform(-179.9, 179.9, 200)]), 5)
+    decoded = decode_polyline(encode_polyline(coords, precision=5), precision=5)
+    assert decoded.shape == coords.shape
+    np.testing.assert_allclose(decoded, coords, atol=5e-6)
+
+    # Unrounded input lands on the nearest 1e-5 degree
+    noisy = coords + rng.uniform(-4e-6, 4e-6, coords.shape)
+    np.testing.assert_allclose(decode_polyline(encode_polyline(noisy)), coords, atol=1e-9)
+
+
+def test_decode_rejects_truncated_polyline():
+    with pytest.raises(ValueError):
+        decode_polyline(GOOGLE_POLYLINE[:5])
+    assert decode_polyline("").shape == (0, 2)
+
+
+def _three_legs():
+    t = np.linspace(0.0, 1.0, 400)
+    coords = np.column_stack([45.42 - 0.05 * t, -75.69 - 0.2 * t])
+    return RouteGeometry(coords, [0, 150, 152, 400])
+
+
+def test_dict_round_trip_keeps_leg_offsets():
+    geometry = _three_legs()
+    restored = RouteGeometry.from_dict(geometry.to_dict())
+    assert restored.leg_offsets.tolist() == [0, 150, 152, 400]
+    np.testing.assert_allclose(restored.coords, geometry.coords, atol=5e-6)
+
+
+def test_downsample_keeps_leg_boundaries_and_end_points():
+    geometry = _three_legs()
+    sampled = geometry.downsample(50)
+
+    assert sampled.legs == geometry.legs
+    assert sampled.leg_offsets[0] == 0 and sampled.leg_offsets[-1] == len(sampled)
+    assert len(sampled) < len(geometry)
+    for index in range(geometry.legs):
+        leg, original = sampled.leg(index), geometry.leg(index)
+        np.testing.assert_array_equal(leg[0], original[0])
+        np.testing.assert_array_equal(leg[-1], original[-1])
+        # Every kept point is a point of the same leg, in order
+        positions = [int(np.flatnonzero((original == row).all(axis=1))[0]) for row in leg]
+        assert positions == sorted(positions)
+    # The two-point leg is kept whole
+    assert len(sampled.leg(1)) == 2
+
+    restored = RouteGeometry.from_dict(sampled.to_dict())
+    assert restored.leg_offsets.tolist() == sampled.leg_offsets.tolist()
+    np.testing.assert_allclose(restored.coords, sampled.coords, atol=5e-6)
+
+
+def test_downsample_is_a_no_op_below_the_limit():
+    geometry = _three_legs()
+    assert geometry.downsample(400) is geometry
@@ -0,0 +1,43 @@
+from crewai import Agent, Task
+
+from ai_driven_snow_removal_optimization_for_municipalities_and_contractors.scheduling import (
+    plan_background_tasks,
+    schedule_tasks,
+)
+
+
+def _crew_tasks():
+    agents = {name: Agent(role=name, goal="g", backstory="b", llm="openai/gpt-4o")
+              for name in ("planner", "weather", "router", "stock", "notifier")}
+
+    def task(name, agent, context):
+        return Task(name=name, description=name, expected_output="x", agent=agents[agent], context=context)
+
+    planning = task("global_planning", "planner", None)
+    weather = task("weather_data_collection", "weather", [planning])
+    traffic = task("traffic_data_integration", "router", [weather])
+    resources = task("resource_monitoring", "stock", [planning])
+    routes = task("route_optimization", "router", [planning, weather, traffic])
+    report = task("stakeholder_communication", "notifier", [planning, resources, routes])
+    return [planning, weather, traffic, resources, routes, report]
+
+
+def test_only_tasks_needing_resources_wait_for_them(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    tasks = _crew_tasks()
+    # resource_monitoring overlaps the whole weather -> traffic -> routing chain
+    assert plan_background_tasks(tasks) == {3: 5}
+
+    ordered = schedule_tasks(tasks)
+    assert [t.name for t in ordered] == [
+        "global_planning", "weather_data_collection", "traffic_data_integration",
+        "route_optimization", "resource_monitoring", "stakeholder_communication",
+    ]
+    assert not any(t.async_execution for t in ordered)
+
+
+def test_sequential_when_disabled(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setenv("OLAF_PARALLEL_TASKS", "0")
+    tasks = _crew_tasks()
+    assert schedule_tasks(tasks) == tasks
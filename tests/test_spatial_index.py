@@ -0,0 +1,150 @@
+import math
+
+import numpy as np
+
+from ai_driven_snow_removal_optimization_for_municipalities_and_contractors.tools.spatial_index import (
+    IncidentIndex,
+    annotate_route,
+    segment_distances,
+)
+from ai_driven_snow_removal_optimization_for_municipalities_and_contractors.tools.traffic_flow import (
+    EARTH_RADIUS_M,
+    segment_route,
+)
+
+
+def _point(lat, lon):
+    return {"geometry": {"type": "Point", "coordinates": [lon, lat]}}
+
+
+def _line(points):
+    return {"geometry": {"type": "LineString", "coordinates": [[lon, lat] for lat, lon in points]}}
+
+
+def _haversine_m(a, b):
+    lat1, lon1, lat2, lon2 = map(math.radians, (*a, *b))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(h))
+
+
+def _brute_force(index, a, b, radius_m):
+    """Nearest distance to every incident within radius_m, checking every edge."""
+    distance = segment_distances(a, b, index._starts, index._ends)
+    nearest = {}
+    for owner, gap in zip(index._owners.tolist(), distance.tolist()):
+        if gap <= radius_m and gap < nearest.get(owner, math.inf):
+            nearest[owner] = gap
+    return nearest
+
+
+def _cell_aligned_incidents(rng, origin_lat, cell_size_m, n):
+    """Points and lines whose vertices fall on (or within float error of) cell boundaries."""
+    scale_x = EARTH_RADIUS_M * math.cos(math.radians(origin_lat))
+    # Projected y is measured from the equator; start from the cell row holding origin_lat
+    base_y = math.radians(origin_lat) * EARTH_RADIUS_M // cell_size_m * cell_size_m
+
+    def vertex():
+        x, y = rng.integers(-8, 8, size=2) * cell_size_m
+        return math.degrees((base_y + y) / EARTH_RADIUS_M), math.degrees(x / scale_x)
+
+    incidents = []
+    for k in range(n):
+        if k % 3 == 0:
+            incidents.append(_point(*vertex()))
+        else:
+            incidents.append(_line([vertex() for _ in range(rng.integers(2, 5))]))
+    return incidents
+
+
+def test_grid_matches_brute_force_on_cell_boundaries():
+    rng = np.random.default_rng(5)
+    for origin_lat, cell_size_m in ((0.0, 100.0), (45.42, 250.0)):
+        incidents = _cell_aligned_incidents(rng, origin_lat, cell_size_m, 60)
+        index = IncidentIndex(incidents, cell_size_m=cell_size_m, origin_lat=origin_lat)
+        assert len(index) == 60
+        anchor = index._starts[0]
+        for _ in range(300):
+            # Query ends on cell corners too, with radii that are whole cells or fractions of one
+            a = anchor + rng.integers(-8, 8, size=2) * cell_size_m * rng.choice([1.0, 0.5, 0.37])
+            b = a + rng.integers(-3, 3, size=2) * cell_size_m
+            for radius_m in (0.0, cell_size_m / 2, cell_size_m, 2 * cell_size_m, 333.0):
+                found = dict(index.near_projected(a, b, radius_m))
+                assert found == _brute_force(index, a, b, radius_m)
+
+
+def test_exact_boundary_and_radius_cutoff():
+    # At the equator the origin projects to (0, 0): a corner of four cells
+    incidents = [
+        _point(0.0, 0.0),
+        _line([(0.0, 0.0), (0.0, math.degrees(1000.0 / EARTH_RADIUS_M))]),
+    ]
+    index = IncidentIndex(incidents, cell_size_m=100.0, origin_lat=0.0)
+    assert index._starts[0].tolist() == [0.0, 0.0]
+
+    for a in ([100.0, 0.0], [-100.0, 0.0], [0.0, 100.0], [0.0, -100.0]):
+        a = np.array(a)
+        # The search box edge lands exactly on the incident's cell boundary
+        assert dict(index.near_projected(a, a, 100.0)).get(0) == 100.0
+        assert 0 not in dict(index.near_projected(a, a, 99.999))
+
+    # Straight below the line, exactly one radius away
+    a, b = np.array([400.0, -100.0]), np.array([600.0, -100.0])
+    assert dict(index.near_projected(a, b, 100.0)) == {1: 100.0}
+    assert index.near_projected(a, b, 99.999) == []
+
+
+def test_distances_agree_with_haversine():
+    rng = np.random.default_rng(9)
+    origin = (45.42, -75.69)
+    points = [(origin[0] + rng.uniform(-0.03, 0.03), origin[1] + rng.uniform(-0.04, 0.04)) for _ in range(200)]
+    index = IncidentIndex([_point(*p) for p in points], cell_size_m=250.0)
+    for _ in range(50):
+        query = (origin[0] + rng.uniform(-0.03, 0.03), origin[1] + rng.uniform(-0.04, 0.04))
+        radius_m = float(rng.uniform(100, 1500))
+        found = dict(index.near_segment(query, query, radius_m))
+        for incident_id, p in enumerate(points):
+            exact = _haversine_m(query, p)
+            # The local projection is well under 1% off at city scale
+            if exact < radius_m * 0.99:
+                assert incident_id in found
+                assert math.isclose(found[incident_id], exact, rel_tol=0.01)
+            elif exact > radius_m * 1.01:
+                assert incident_id not in found
+
+
+def test_annotate_route_matches_brute_force_and_cutoff():
+    lat = 45.42
+    points = [(lat, -75.75 + 0.005 * k) for k in range(25)]
+    segments = segment_route(points, 500.0, 20)
+    radius_m = 50.0
+    offset = math.degrees(1.0 / EARTH_RADIUS_M)
+    incidents = [
+        _point(lat + (radius_m - 5) * offset, -75.7025),   # just inside, north of the route
+        _point(lat - (radius_m + 5) * offset, -75.6825),   # just outside, south of it
+        _line([(lat + 0.01, -75.6625), (lat - 0.01, -75.6625)]),  # crosses the route
+        _point(lat + 0.02, -75.65),                        # far away
+        {"geometry": None},                                # no geometry at all
+    ]
+    result = annotate_route(points, segments, incidents, radius_m=radius_m)
+
+    index = IncidentIndex(incidents, origin_lat=points[0][0])
+    xy = index.project(points)
+    expected = set()
+    for edge in range(len(points) - 1):
+        expected |= set(_brute_force(index, xy[edge], xy[edge + 1], radius_m))
+    assert expected == {0, 2}
+    assert set(result["incidents"]) == {str(i) for i in expected}
+    assert result["off_route_incidents"] == len(incidents) - len(expected)
+
+    distances = {m["incident"]: m["distance_m"] for s in result["segments"] for m in s["incidents"]}
+    assert math.isclose(distances["0"], radius_m - 5, abs_tol=0.5)
+    assert distances["2"] == 0.0
+    # Each incident is reported on the segment holding the midpoint of the route edge it is near
+    for segment in result["segments"]:
+        for match in segment["incidents"]:
+            incident = incidents[int(match["incident"])]
+            lon = np.ravel(incident["geometry"]["coordinates"])[0]
+            edge = int((lon - points[0][1]) // 0.005)
+            midpoint = (lat, (points[edge][1] + points[edge + 1][1]) / 2)
+            along_km = _haversine_m(points[0], midpoint) / 1000
+            assert segment["from_km"] - 0.01 <= along_km <= segment["to_km"] + 0.01
@@ -0,0 +1,29 @@
+from crewai import LLM, Agent, Crew, Process, Task
+
+from ai_driven_snow_removal_optimization_for_municipalities_and_contractors.tools.tracing import (
+    instrument_crew,
+    tracer,
+)
+
+
+def test_crew_tasks_and_llm_calls_are_spans(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(tracer, "enabled", True)
+    tracer.reset()
+    instrument_crew()
+
+    # litellm answers mock_response itself, so LLM.call runs without a network call
+    llm = LLM(model="gpt-4o", mock_response="Thought: I now know the final answer\nFinal Answer: Plow Main St")
+    agent = Agent(role="route_optimizer", goal="g", backstory="b", llm=llm)
+    task = Task(name="route_optimization", description="Plan routes", expected_output="Routes", agent=agent)
+    Crew(agents=[agent], tasks=[task], process=Process.sequential).kickoff()
+
+    spans = tracer.spans()
+    tracer.reset()
+    task_spans = [s for s in spans if s.category == "task"]
+    llm_spans = [s for s in spans if s.category == "llm"]
+    assert [s.name for s in task_spans] == ["route_optimization"]
+    assert task_spans[0].args["agent"] == "route_optimizer"
+    assert task_spans[0].args["total_tokens"] > 0
+    assert llm_spans and all(s.args["task"] == "route_optimization" for s in llm_spans)
+    assert llm_spans[0].args["input_bytes"] > 0
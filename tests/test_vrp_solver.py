@@ -0,0 +1,118 @@
+import math
+import time
+
+import numpy as np
+
+from ai_driven_snow_removal_optimization_for_municipalities_and_contractors.tools.vrp_solver import (
+    Depot,
+    Stop,
+    Vehicle,
+    _DepotProblem,
+    solve,
+)
+
+
+def _grid_stops(n, seed=7, salt=(0.5, 3.0)):
+    rng = np.random.default_rng(seed)
+    return [Stop(id=f"s{k}",
+                 latitude=45.40 + rng.uniform(-0.08, 0.08),
+                 longitude=-75.70 + rng.uniform(-0.12, 0.12),
+                 salt_tons=float(rng.uniform(*salt)))
+            for k in range(n)]
+
+
+def _depots():
+    return [Depot(name="north", latitude=45.46, longitude=-75.70),
+            Depot(name="south", latitude=45.34, longitude=-75.68)]
+
+
+def _fleet():
+    return [Vehicle(id="n1", depot="north", salt_capacity_tons=8.0),
+            Vehicle(id="n2", depot="north", salt_capacity_tons=8.0),
+            Vehicle(id="s1", depot="south", salt_capacity_tons=6.0)]
+
+
+def test_trips_respect_salt_capacity_and_fuel_range():
+    stops = _grid_stops(40)
+    fleet = {v.id: v for v in _fleet()}
+    solution = solve(_depots(), list(fleet.values()), stops, time_budget_s=0.5)
+
+    salt = {s.id: s.salt_tons for s in stops}
+    for trip in solution.trips:
+        vehicle = fleet[trip.vehicle_id]
+        assert vehicle.depot == trip.depot
+        assert math.isclose(trip.salt_tons, sum(salt[s] for s in trip.stops))
+        # Capacity is the smallest truck's at the depot, so every truck there can run the trip
+        assert trip.salt_tons <= min(v.salt_capacity_tons for v in fleet.values() if v.depot == trip.depot) + 1e-9
+        assert trip.fuel_liters <= vehicle.fuel_capacity_liters + 1e-9
+
+
+def test_every_stop_is_served_once_or_reported_unassigned():
+    stops = _grid_stops(30)
+    # A stop heavier than any truck's capacity and one beyond the fuel range
+    stops.append(Stop(id="heavy", latitude=45.40, longitude=-75.70, salt_tons=50.0))
+    stops.append(Stop(id="far", latitude=49.0, longitude=-79.0, salt_tons=1.0))
+    depots = _depots()
+    depots[1].salt_tons = 5.0
+    solution = solve(depots, _fleet(), stops, time_budget_s=0.5)
+
+    served = [s for trip in solution.trips for s in trip.stops]
+    assert len(served) == len(set(served))
+    assert set(served).isdisjoint(solution.unassigned)
+    assert set(served) | set(solution.unassigned) == {s.id for s in stops}
+    assert {"heavy", "far"} <= set(solution.unassigned)
+    # The south depot never plans more salt than it holds
+    assert solution.depot_usage["south"]["salt_planned_tons"] <= 5.0
+
+
+def test_stops_without_a_depot_fleet_are_unassigned():
+    depots = [Depot(name="north", latitude=45.46, longitude=-75.70)]
+    solution = solve(depots, [], _grid_stops(3), time_budget_s=0.1)
+    assert solution.trips == []
+    assert solution.unassigned == ["s0", "s1", "s2"]
+
+
+def _problem(n, symmetric, seed):
+    rng = np.random.default_rng(seed)
+    coords = rng.uniform(0, 20, size=(n + 1, 2))
+    distance = np.linalg.norm(coords[:, None] - coords[None, :], axis=-1)
+    if not symmetric:
+        # Routed matrices are directional (one-way streets, turn restrictions)
+        distance = distance * rng.uniform(1.0, 1.4, size=distance.shape)
+        np.fill_diagonal(distance, 0.0)
+    demand = np.concatenate([[0.0], rng.uniform(0.5, 2.0, size=n)])
+    return _DepotProblem(depot=0, stops=list(range(1, n + 1)), demand=demand,
+                         service_s=np.zeros(n + 1), distance=distance, duration=distance * 60,
+                         capacity=6.0, max_km=120.0)
+
+
+def test_local_search_never_worse_than_savings_construction():
+    for symmetric in (True, False):
+        for seed in range(10):
+            problem = _problem(25, symmetric, seed)
+            trips = problem.savings()
+            constructed = sum(problem.trip_km(t) for t in trips)
+
+            deadline = time.perf_counter() + 5.0
+            for trip in trips:
+                problem.two_opt(trip, deadline)
+            problem.relocate(trips, deadline)
+            improved = sum(problem.trip_km(t) for t in trips)
+
+            assert improved <= constructed + 1e-9
+            assert sorted(s for t in trips for s in t) == problem.stops
+            for trip in trips:
+                assert problem.load(trip) <= problem.capacity + 1e-9
+                assert problem.trip_km(trip) <= problem.max_km + 1e-9
+
+
+def test_solve_improves_on_construction_within_budget():
+    stops = _grid_stops(40, seed=3)
+    depots = _depots()
+    without_search = solve(depots, _fleet(), stops, time_budget_s=0.0)
+    with_search = solve(depots, _fleet(), stops, time_budget_s=1.0)
+
+    assert without_search.improvement_passes == 0
+    assert with_search.improvement_passes >= 1
+    assert with_search.total_distance_km <= without_search.total_distance_km + 1e-9
+    assert math.isclose(with_search.total_distance_km, sum(t.distance_km for t in with_search.trips))